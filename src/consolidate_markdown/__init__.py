@@ -1,62 +1,94 @@
 """Initialize consolidate_markdown package."""
 
+import importlib
 import logging
 import warnings
-from typing import Dict, Type
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type, Union
 
-from consolidate_markdown.processors.base import SourceProcessor
-from consolidate_markdown.processors.bear import BearProcessor
-from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor
-from consolidate_markdown.runner import Runner
+if TYPE_CHECKING:
+    from consolidate_markdown.processors.base import SourceProcessor
+    from consolidate_markdown.processors.bear import BearProcessor
+    from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor
+    from consolidate_markdown.runner import Runner
 
 # Configure warning filters for SWIG-related deprecation warnings
-# These warnings come from importlib during module loading and are related to SWIG's limited API usage
-# We need to filter them in multiple places since they can appear in different contexts
+# These warnings come from importlib during module loading and are related to SWIG's limited API usage.
+# The message argument is a regex, so a single filter without a module restriction covers
+# every SWIG type and every context (importlib._bootstrap, sys, ...) they are raised from.
 warnings.filterwarnings(
     "ignore",
-    message=".*builtin type SwigPyPacked has no __module__ attribute",
-    category=DeprecationWarning,
-)
-warnings.filterwarnings(
-    "ignore",
-    message=".*builtin type SwigPyObject has no __module__ attribute",
-    category=DeprecationWarning,
-)
-warnings.filterwarnings(
-    "ignore",
-    message=".*builtin type swigvarlink has no __module__ attribute",
+    message=r".*builtin type (SwigPyPacked|SwigPyObject|swigvarlink) has no __module__ attribute",
     category=DeprecationWarning,
 )
 
-# Filter the same warnings when they come from specific modules
-warnings.filterwarnings(
-    "ignore",
-    message=".*builtin type swigvarlink has no __module__ attribute",
-    category=DeprecationWarning,
-    module="importlib._bootstrap",
-)
-warnings.filterwarnings(
-    "ignore",
-    message=".*builtin type swigvarlink has no __module__ attribute",
-    category=DeprecationWarning,
-    module="sys",
-)
-
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Public names that are imported on first access (PEP 562) so that importing the
+# package does not pull in the processor graph and its heavy dependencies.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "SourceProcessor": "consolidate_markdown.processors.base",
+    "BearProcessor": "consolidate_markdown.processors.bear",
+    "XBookmarksProcessor": "consolidate_markdown.processors.xbookmarks",
+    "Runner": "consolidate_markdown.runner",
+}
+
 # Define processor types
-PROCESSOR_TYPES: Dict[str, Type[SourceProcessor]] = {}
+PROCESSOR_TYPES: Dict[str, Type["SourceProcessor"]] = {}
+
+# Processors registered by import path, resolved by get_processor() on first use
+_PROCESSOR_PATHS: Dict[str, str] = {}
+
+
+def register_processor(
+    name: str, processor_class: Union[Type["SourceProcessor"], str]
+) -> None:
+    """Register a processor type.
 
+    Args:
+        name: The source type handled by the processor
+        processor_class: The processor class, or a ``"module:ClassName"`` import
+            path that is only imported when the processor is first looked up
+    """
+    if isinstance(processor_class, str):
+        _PROCESSOR_PATHS[name] = processor_class
+        PROCESSOR_TYPES.pop(name, None)
+    else:
+        PROCESSOR_TYPES[name] = processor_class
 
-def register_processor(name: str, processor_class: Type[SourceProcessor]) -> None:
-    """Register a processor type."""
-    PROCESSOR_TYPES[name] = processor_class
+
+def get_processor(name: str) -> Optional[Type["SourceProcessor"]]:
+    """Get a registered processor class, importing its module if needed.
+
+    Args:
+        name: The source type handled by the processor
+
+    Returns:
+        The processor class, or None if no processor is registered for the name
+    """
+    if name not in PROCESSOR_TYPES and name in _PROCESSOR_PATHS:
+        module_name, _, class_name = _PROCESSOR_PATHS[name].partition(":")
+        module = importlib.import_module(module_name)
+        PROCESSOR_TYPES[name] = getattr(module, class_name)
+    return PROCESSOR_TYPES.get(name)
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported attributes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
 
 
 # Register processors
-register_processor("bear", BearProcessor)
-register_processor("xbookmarks", XBookmarksProcessor)
+register_processor("bear", "consolidate_markdown.processors.bear:BearProcessor")
+register_processor(
+    "xbookmarks", "consolidate_markdown.processors.xbookmarks:XBookmarksProcessor"
+)
+register_processor("claude", "consolidate_markdown.processors.claude:ClaudeProcessor")
 
 __all__ = [
     "SourceProcessor",
@@ -64,5 +96,6 @@ __all__ = [
     "XBookmarksProcessor",
     "Runner",
     "PROCESSOR_TYPES",
+    "get_processor",
     "register_processor",
 ]
@@ -4,27 +4,19 @@ import argparse
 import logging
 import shutil
 import sys
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import List
 
-from consolidate_markdown.config import load_config
+from consolidate_markdown.config import VALID_SOURCE_TYPES, load_config
 from consolidate_markdown.exceptions import ConfigurationError, DependencyError
-from consolidate_markdown.log_setup import setup_logging
-from consolidate_markdown.output import (
-    print_compact_summary,
-    print_deletion_message,
-    print_summary,
-)
-from consolidate_markdown.processors.bear import BearProcessor
-from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor
-from consolidate_markdown.runner import Runner
 from consolidate_markdown.utils import validate_api_keys, validate_external_dependencies
 
 logger = logging.getLogger(__name__)
 
-# Register processors
-Runner.PROCESSORS["bear"] = BearProcessor
-Runner.PROCESSORS["xbookmarks"] = XBookmarksProcessor
-
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments.
@@ -72,7 +64,7 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument(
         "--processor",
-        choices=list(Runner.PROCESSORS.keys()),
+        choices=VALID_SOURCE_TYPES,
         help="Only run a specific processor",
     )
     parser.add_argument(
@@ -88,10 +80,41 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+def _remove_trees(paths: List[Path], ignore_errors: bool = False) -> None:
+    """Remove directory trees concurrently.
+
+    rmtree is bound by unlink/rmdir syscalls, which release the GIL, so the
+    trees are removed from a thread pool.
+
+    Args:
+        paths: Directories to remove
+        ignore_errors: Whether to ignore errors raised while removing
+    """
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as executor:
+        list(
+            executor.map(
+                partial(shutil.rmtree, ignore_errors=ignore_errors),
+                paths,
+            )
+        )
+
+
 def main() -> None:
     """Main entry point."""
     args = parse_args()
 
+    # Imported after argument parsing so --help and usage errors skip loading
+    # rich and the processor modules
+    from consolidate_markdown.log_setup import setup_logging
+    from consolidate_markdown.output import (
+        print_compact_summary,
+        print_deletion_message,
+        print_summary,
+    )
+    from consolidate_markdown.runner import Runner
+
     # Load configuration
     try:
         config = load_config(args.config)
@@ -132,18 +155,36 @@ def main() -> None:
 
     # Delete existing files if requested
     if args.delete:
-        # Delete .cm directory
-        if config.global_config.cm_dir.exists():
-            print_deletion_message(str(config.global_config.cm_dir))
-            shutil.rmtree(config.global_config.cm_dir)
-            config.global_config.cm_dir.mkdir(parents=True, exist_ok=True)
-
-        # Delete output directories
-        for source in config.sources:
-            if source.dest_dir.exists():
-                print_deletion_message(str(source.dest_dir))
-                shutil.rmtree(source.dest_dir)
-                source.dest_dir.mkdir(parents=True, exist_ok=True)
+        # Delete the .cm directory and output directories
+        delete_dirs = [config.global_config.cm_dir] + [
+            source.dest_dir for source in config.sources
+        ]
+        delete_dirs = [path for path in delete_dirs if path.exists()]
+        trash_dirs: List[Path] = []
+        locked_dirs: List[Path] = []
+        for path in delete_dirs:
+            print_deletion_message(str(path))
+            # Move the tree aside with a single rename, however large it is
+            trash = path.with_name(f".trash-{uuid.uuid4().hex}")
+            try:
+                path.rename(trash)
+                trash_dirs.append(trash)
+            except OSError:
+                locked_dirs.append(path)
+
+        # Trees that could not be moved aside must be gone before the run starts
+        _remove_trees(locked_dirs)
+        for path in delete_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+
+        # The moved trees are removed while processing runs. The thread is not a
+        # daemon, so the interpreter finishes the deletion before exiting.
+        if trash_dirs:
+            threading.Thread(
+                target=_remove_trees,
+                args=(trash_dirs, True),
+                name="delete-old-output",
+            ).start()
 
     # Update config with verbosity level
     config.global_config.verbosity = args.verbosity
@@ -1,7 +1,37 @@
-from .document import ConversionError, MarkItDown
-from .gpt import GPTProcessor
-from .image import ImageProcessingError, ImageProcessor
-from .processor import AttachmentMetadata, AttachmentProcessor
+"""Attachment processing package."""
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .document import ConversionError, MarkItDown
+    from .gpt import GPTProcessor
+    from .image import ImageProcessingError, ImageProcessor
+    from .processor import AttachmentMetadata, AttachmentProcessor
+
+# Public names imported on first access (PEP 562), so that importing one
+# submodule such as attachments.document or attachments.logging does not load
+# openai, Pillow and PyMuPDF through the others.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "AttachmentMetadata": ".processor",
+    "AttachmentProcessor": ".processor",
+    "ConversionError": ".document",
+    "GPTProcessor": ".gpt",
+    "ImageProcessingError": ".image",
+    "ImageProcessor": ".image",
+    "MarkItDown": ".document",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported attributes on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AttachmentProcessor",
@@ -8,24 +8,505 @@ We use PyMuPDF (fitz) instead of Microsoft's MarkItDown for PDF processing becau
 4. Active maintenance and comprehensive documentation
 """
 
+import atexit  # Standard library
+import codecs  # Standard library
+import contextlib  # Standard library
 import csv  # Standard library
+import functools  # Standard library
+import itertools  # Standard library
 import json  # Standard library
 import logging  # Standard library
+import mmap  # Standard library
+import multiprocessing  # Standard library
+import os  # Standard library
 import re  # Standard library
-from pathlib import Path  # Standard library
-from typing import cast  # Standard library
-
-import fitz  # External dependency: pymupdf
-import pandas as pd  # External dependency: pandas
-from markitdown import (
-    MarkItDown as MicrosoftMarkItDown,  # External dependency: markitdown
+import shutil  # Standard library
+import threading  # Standard library
+import zipfile  # Standard library
+from concurrent.futures import (  # Standard library
+    Future,
+    ProcessPoolExecutor,
+    as_completed,
 )
-from markitdown._markitdown import (
-    UnsupportedFormatException,  # External dependency: markitdown
+from pathlib import Path  # Standard library
+from types import ModuleType  # Standard library
+from typing import (  # Standard library
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
 )
 
+try:
+    import orjson  # Optional dependency: orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+from ..cache import CacheManager, file_hash
+
+if TYPE_CHECKING:
+    import fitz  # External dependency: pymupdf
+    from markitdown import (
+        MarkItDown as MicrosoftMarkItDown,  # External dependency: markitdown
+    )
+    from markitdown._markitdown import DocumentConverter
+
 logger = logging.getLogger(__name__)
 
+# (size, mtime, content hash) of a converted document
+_Fingerprint = Tuple[int, float, str]
+
+# Whitespace clean-up applied to converted output
+_RE_LINE_BREAK = re.compile(r"\r?\n")
+_RE_EXCESS_NEWLINES = re.compile(r"\n{3,}")
+
+# JSON files at least this large are memory-mapped for orjson instead of read
+_MMAP_JSON_MIN_BYTES = 10_000_000
+
+# CSV files at least this large are parsed with pyarrow when it is installed
+_ARROW_CSV_MIN_BYTES = 1_000_000
+
+# Encodings tried, in order, for CSV files, and the number of leading bytes
+# used to sniff a file's encoding before it is parsed. latin1 decodes any
+# byte sequence, so it is the last resort and nothing after it is ever tried.
+_CSV_ENCODINGS = ("utf-8", "cp1252", "latin1")
+_CSV_SNIFF_BYTES = 65536
+
+# PDFs with at least this many pages are split across worker processes
+_PARALLEL_PDF_MIN_PAGES = 64
+_MAX_PDF_WORKERS = 8
+
+# Worker processes shared by every batch and large-PDF conversion in the run,
+# created on first use by _get_process_pool()
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+# Media files that are linked rather than converted
+_MEDIA_EXTENSIONS = frozenset({".mov", ".mp4", ".avi", ".wmv", ".flv", ".mkv"})
+
+# System and partial-download files that are never converted, including the
+# "._name" AppleDouble files macOS leaves on non-Apple file systems
+_SKIP_NAMES = frozenset({".DS_Store", "Thumbs.db", "desktop.ini"})
+_SKIP_PREFIX = "._"
+_SKIP_SUFFIXES = frozenset({".tmp", ".part"})
+
+# Shared Microsoft MarkItDown converter, created on first use by _get_converter()
+_converter: Optional["MicrosoftMarkItDown"] = None
+_converter_lock = threading.Lock()
+
+# markitdown converters that accept a file purely by its extension. Files with
+# these suffixes are handed straight to the matching converter, skipping
+# MarkItDown's content sniffing and its loop over every registered converter.
+_DIRECT_CONVERTER_NAMES = {
+    ".docx": "DocxConverter",
+    ".xlsx": "XlsxConverter",
+    ".pptx": "PptxConverter",
+    ".html": "HtmlConverter",
+    ".htm": "HtmlConverter",
+}
+_direct_converters: Optional[Dict[str, "DocumentConverter"]] = None
+
+# Extensions MarkItDown has rejected in this process. Later files with these
+# suffixes fail straight away instead of being opened and sniffed by every
+# registered converter again. Adding to and testing a set is atomic, so batch
+# threads share it without a lock.
+_unsupported_suffixes: Set[str] = set()
+
+
+def _get_converter() -> "MicrosoftMarkItDown":
+    """Get the shared Microsoft MarkItDown converter, creating it on first use.
+
+    Constructing a converter registers handlers for every format markitdown
+    supports, so one instance is shared by all MarkItDown objects instead of
+    being rebuilt for every attachment processor.
+    """
+    global _converter
+    if _converter is None:
+        with _converter_lock:
+            if _converter is None:
+                # Imported here rather than at module level: markitdown pulls in
+                # pdfminer, mammoth, openpyxl, BeautifulSoup, etc., which runs that
+                # never convert a document should not pay for.
+                from markitdown import MarkItDown as MicrosoftMarkItDown
+
+                _converter = MicrosoftMarkItDown()
+    return _converter
+
+
+def _get_direct_converter(suffix: str) -> Optional["DocumentConverter"]:
+    """Get the shared converter's handler for a file extension, if it has one.
+
+    Args:
+        suffix: Lowercase file extension, including the dot
+
+    Returns:
+        The registered markitdown converter, or None if the extension must go
+        through MarkItDown's full dispatch
+    """
+    global _direct_converters
+    if _direct_converters is None:
+        converter = _get_converter()
+        with _converter_lock:
+            if _direct_converters is None:
+                # Older markitdown releases keep their converters in
+                # _page_converters; without it every file takes the full
+                # dispatch path
+                registered = getattr(converter, "_page_converters", [])
+                by_name = {type(c).__name__: c for c in registered}
+                _direct_converters = {
+                    ext: by_name[name]
+                    for ext, name in _DIRECT_CONVERTER_NAMES.items()
+                    if name in by_name
+                }
+    return _direct_converters.get(suffix)
+
+
+def _is_skipped(name: str) -> bool:
+    """Check whether a file name is a system or partial file that is never converted."""
+    return (
+        name in _SKIP_NAMES
+        or name.startswith(_SKIP_PREFIX)
+        or os.path.splitext(name)[1].lower() in _SKIP_SUFFIXES
+    )
+
+
+def iter_convertible(root: Path) -> Iterator[Path]:
+    """Iterate over the files in a directory that are worth converting.
+
+    System files such as ``.DS_Store`` and partial downloads are filtered out
+    while scanning, so callers never submit them for conversion.
+
+    Args:
+        root: Directory to scan (not recursive)
+
+    Yields:
+        Paths of the regular files in the directory
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_file() and not _is_skipped(entry.name):
+                yield Path(entry.path)
+
+
+def _markdown_table_row(cells: Sequence[str]) -> str:
+    """Format CSV cells as a markdown table row."""
+    return (
+        "| "
+        + " | ".join(
+            cell.strip().replace("|", "\\|").replace("\n", " ") for cell in cells
+        )
+        + " |"
+    )
+
+
+def _markdown_table_separator(columns: int) -> str:
+    """Format the markdown table row separating the header from the body."""
+    return "|" + "|".join("---" for _ in range(columns)) + "|"
+
+
+def _markdown_table(rows: Iterable[Sequence[str]]) -> str:
+    """Format CSV rows as a markdown table, using the first row as the header.
+
+    Rows are formatted as they are taken from the iterable, so they never need
+    to be collected into a list first.
+    """
+    row_iter = iter(rows)
+    header = next(row_iter)
+    return "\n".join(
+        itertools.chain(
+            (_markdown_table_row(header), _markdown_table_separator(len(header))),
+            map(_markdown_table_row, row_iter),
+        )
+    )
+
+
+def _read_csv_rows_arrow(
+    file_path: Path, encoding: str = "utf-8"
+) -> Optional[Iterator[Tuple[str, ...]]]:
+    """Parse a CSV file with pyarrow's multithreaded reader.
+
+    pyarrow is optional; it parses large files several times faster than the
+    csv module and does so outside the GIL.
+
+    Args:
+        file_path: Path to the CSV file
+        encoding: Encoding of the file; pyarrow transcodes anything but UTF-8
+
+    Returns:
+        An iterator over all rows, header first, with every cell as text, read
+        straight from the parsed columns one record batch at a time; or None if
+        pyarrow is not installed or cannot parse the file (the csv module is
+        used instead, which also reports any errors)
+    """
+    try:
+        import pyarrow as pa  # Optional dependency: pyarrow
+        from pyarrow import csv as pa_csv  # Optional dependency: pyarrow
+    except ImportError:
+        return None
+
+    try:
+        # Name the columns up front so the header is read as a row of text
+        # instead of being used for column names and type inference
+        with open(file_path, "r", encoding=encoding, newline="") as f:
+            header = next(csv.reader(f), None)
+        if not header:
+            return None
+        column_names = [f"f{i}" for i in range(len(header))]
+        table = pa_csv.read_csv(
+            file_path,
+            read_options=pa_csv.ReadOptions(
+                column_names=column_names, encoding=encoding
+            ),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in column_names},
+                strings_can_be_null=False,
+            ),
+        )
+    except Exception as e:
+        logger.debug(f"pyarrow could not parse {file_path.name}: {str(e)}")
+        return None
+
+    # Only one batch's cells exist as Python strings at a time
+    return itertools.chain.from_iterable(
+        zip(*(column.to_pylist() for column in batch.columns))
+        for batch in table.to_batches()
+    )
+
+
+def _csv_encodings(file_path: Path) -> List[str]:
+    """Get the encodings to parse a CSV file with, most likely first.
+
+    A sample from the start of the file is checked so that the whole file is
+    only parsed once in the common cases. UTF-8 input keeps the default order.
+    Otherwise UTF-8 is dropped, since it is known to fail, and charset-normalizer
+    (optional) picks which of the remaining encodings to try first, e.g. cp1252
+    rather than latin1 for files containing Windows smart quotes.
+
+    Args:
+        file_path: Path to the CSV file
+
+    Returns:
+        Codec names to try in order
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(_CSV_SNIFF_BYTES)
+
+    try:
+        # Incremental so a character cut off at the end of the sample is not
+        # mistaken for invalid UTF-8
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return list(_CSV_ENCODINGS)
+    except UnicodeDecodeError:
+        pass
+
+    encodings = list(_CSV_ENCODINGS[1:])
+    try:
+        from charset_normalizer import (  # Optional dependency: charset-normalizer
+            from_bytes,
+        )
+    except ImportError:
+        return encodings
+
+    best = from_bytes(sample, cp_isolation=encodings).best()
+    if best is None:
+        return encodings
+    detected = codecs.lookup(best.encoding).name
+    logger.debug(f"Detected {detected} encoding for {file_path.name}")
+    return [detected] + [
+        encoding for encoding in encodings if codecs.lookup(encoding).name != detected
+    ]
+
+
+def _read_fenced_text(file_path: Path, size: int) -> str:
+    """Read a UTF-8 text file wrapped in a markdown code fence.
+
+    The file is read straight into a buffer that already holds the fence, so
+    its text is decoded once and never copied again to wrap it. Line endings
+    are normalized to "\\n" as in text mode.
+
+    Args:
+        file_path: Path to the text file
+        size: Expected size of the file, from a recent stat()
+
+    Returns:
+        The fenced text
+
+    Raises:
+        UnicodeDecodeError: If the file is not valid UTF-8
+    """
+    opening, closing = b"```\n", b"\n```"
+    start = len(opening)
+    buffer = bytearray(start + size + len(closing))
+    buffer[:start] = opening
+    buffer[start + size :] = closing
+    with open(file_path, "rb") as f:
+        with memoryview(buffer) as view, view[start : start + size] as body:
+            read = f.readinto(body)
+        # Fit the buffer to the file if it changed size since it was stat'ed
+        buffer[start + read : start + size] = f.read()
+    text = buffer.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _pretty_json(raw: Union[bytes, memoryview]) -> str:
+    """Pretty-print a JSON document with two-space indentation.
+
+    orjson is used when installed; input it rejects (NaN, integers wider than
+    64 bits) is handed to the json module, which also reports malformed JSON.
+
+    Args:
+        raw: The JSON document, or a view of a memory-mapped one
+
+    Returns:
+        The indented JSON text
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONDecodeError:
+            pass
+    return json.dumps(json.loads(bytes(raw)), indent=2)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_fitz() -> ModuleType:
+    """Import PyMuPDF on first use and configure it once per process.
+
+    Imported lazily so runs without PDFs never load MuPDF.
+    """
+    import fitz  # External dependency: pymupdf
+
+    # Failures are raised as exceptions; MuPDF also printing every error to
+    # stderr only adds noise and write calls to large batches
+    fitz.TOOLS.mupdf_display_errors(False)
+    return cast(ModuleType, fitz)
+
+
+@contextlib.contextmanager
+def _open_pdf(file_path: Union[str, Path]) -> Iterator["fitz.Document"]:
+    """Open a PDF and release MuPDF's per-process state once it is closed.
+
+    MuPDF appends warnings to a process-wide list and keeps fonts and images in
+    a shared resource store. Neither is reused by the next document, so both
+    are cleared after each one to keep long-running workers from growing.
+
+    The document is opened by path: MuPDF then seeks and reads only the parts
+    of the file it needs. Opening from a stream would first copy the whole
+    file into memory (PyMuPDF does not accept an mmap as a stream).
+
+    Args:
+        file_path: Path to the PDF file
+
+    Yields:
+        The open document, closed on exit even if extraction fails
+    """
+    fitz = _get_fitz()
+    try:
+        with fitz.open(file_path) as doc:
+            yield doc
+    finally:
+        warnings = fitz.TOOLS.mupdf_warnings(reset=True)
+        if warnings:
+            logger.debug(f"MuPDF warnings for {file_path}: {warnings}")
+        fitz.TOOLS.store_shrink(100)
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Get the worker process pool shared by document conversions.
+
+    The pool is started once per run instead of once per bookmark or PDF.
+    Its workers are started by a fork server (or spawned where there is none)
+    rather than forked from this process: the progress display and tree
+    removal run threads here, and a forked child could inherit a lock one of
+    them was holding.
+
+    Returns:
+        The pool, with one worker per CPU
+    """
+    global _process_pool
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                method = "forkserver" if "forkserver" in methods else "spawn"
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context(method),
+                )
+                atexit.register(_shutdown_process_pool)
+    return _process_pool
+
+
+def _shutdown_process_pool() -> None:
+    """Stop the shared worker process pool, if it was started."""
+    global _process_pool
+    with _process_pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+def _pdf_workers(page_count: int) -> int:
+    """Get the number of worker processes to extract a PDF's text with.
+
+    Args:
+        page_count: Number of pages in the PDF
+
+    Returns:
+        1 for small PDFs, or when already running inside a worker process
+    """
+    if page_count < _PARALLEL_PDF_MIN_PAGES or multiprocessing.parent_process():
+        return 1
+    return min(os.cpu_count() or 1, _MAX_PDF_WORKERS, page_count)
+
+
+def _pdf_page_lines(doc: "fitz.Document", start: int, stop: int) -> List[str]:
+    """Extract the text of a range of PDF pages.
+
+    Each page's text comes from one call into MuPDF and is kept as its
+    non-empty, stripped lines. Blank and image-only pages are skipped as
+    soon as their text is found to be whitespace.
+
+    Args:
+        doc: The open PDF
+        start: Index of the first page
+        stop: Index after the last page
+
+    Returns:
+        The lines of text, in page order
+    """
+    lines: List[str] = []
+    for page_num in range(start, stop):
+        text = doc[page_num].get_text("text")
+        if not text or text.isspace():
+            continue
+        lines.extend(line for line in map(str.strip, text.splitlines()) if line)
+    return lines
+
+
+def _pdf_file_page_lines(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of a range of PDF pages in a worker process.
+
+    PyMuPDF documents cannot be shared between threads or processes, so each
+    worker opens its own copy of the file.
+    """
+    with _open_pdf(file_path) as doc:
+        return _pdf_page_lines(doc, start, stop)
+
 
 class ConversionError(Exception):
     """Error during document conversion."""
@@ -33,6 +514,40 @@ class ConversionError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=1)
+def _worker_markitdown(cm_dir: str) -> "MarkItDown":
+    """Get the MarkItDown used by batch conversions in this process.
+
+    Built once per worker process instead of once per document.
+
+    Args:
+        cm_dir: The .cm directory for temporary files
+    """
+    return MarkItDown(Path(cm_dir))
+
+
+def _convert_one_path(args: Tuple[str, str, bool]) -> Tuple[str, str, Optional[str]]:
+    """Convert a single document in a worker process.
+
+    Defined at module level so it can be pickled by ProcessPoolExecutor.
+
+    Args:
+        args: Tuple of (cm_dir, file_path, force)
+
+    Returns:
+        Tuple of (file_path, markdown, error message or None)
+    """
+    cm_dir, file_path, force = args
+    try:
+        markdown = _worker_markitdown(cm_dir).convert_to_markdown(
+            Path(file_path), force
+        )
+        return file_path, markdown, None
+    except Exception as e:
+        # One failing document must not abort the rest of the batch
+        return file_path, "", str(e)
+
+
 class MarkItDown:
     """Convert various document formats to markdown.
 
@@ -51,12 +566,34 @@ class MarkItDown:
         ".pdf": "pdf",  # Custom PDF conversion using PyMuPDF
     }
 
-    def __init__(self, cm_dir: Path):
-        """Initialize with Microsoft's MarkItDown converter."""
+    def __init__(self, cm_dir: Path, cache_manager: Optional[CacheManager] = None):
+        """Initialize the converter.
+
+        Args:
+            cm_dir: The .cm directory for temporary files
+            cache_manager: Optional cache manager for converted documents
+        """
         self.cm_dir = cm_dir
+        self.cache_manager = cache_manager
         self.temp_dir = cm_dir / "markitdown"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
-        self.converter = MicrosoftMarkItDown()
+        # Suffix -> custom handler, so picking a handler is a single dict lookup.
+        # Handlers take the file's stat result when the caller already has one.
+        self._handlers: Dict[str, Callable[[Path, Optional[os.stat_result]], str]] = {
+            ".csv": self._convert_csv,
+            ".txt": self._convert_text,
+            ".json": self._convert_json,
+            ".pdf": self._convert_pdf,
+        }
+
+    @property
+    def converter(self) -> "MicrosoftMarkItDown":
+        """The shared Microsoft MarkItDown converter.
+
+        Only formats without a custom handler need it, so PDF, CSV, text and
+        JSON conversions never import markitdown (and pdfminer, pandas, ...).
+        """
+        return _get_converter()
 
     def convert_to_markdown(self, file_path: Path, force: bool = False) -> str:
         """Convert a document to markdown format.
@@ -72,128 +609,449 @@ class MarkItDown:
             ConversionError: If conversion fails
             FileNotFoundError: If file not found
         """
-        if not file_path.exists():
-            raise FileNotFoundError(f"Document not found: {file_path}")
-
-        if file_path.name == ".DS_Store":
-            logger.debug("Skipping system file: .DS_Store")
+        # System files are recognized by name alone, before touching the disk
+        if _is_skipped(file_path.name):
+            logger.debug(f"Skipping system file: {file_path.name}")
             return ""  # Return empty string instead of raising error
 
+        # One stat() serves the existence check, the cache lookup and the handlers
+        try:
+            stat = file_path.stat()
+        except (FileNotFoundError, NotADirectoryError) as e:
+            raise FileNotFoundError(f"Document not found: {file_path}") from e
+
+        cached, fingerprint = self._check_cache(file_path, force, stat)
+        if cached is not None:
+            return cached
+
+        markdown = self._convert(file_path, stat)
+        self._update_cache(file_path, fingerprint, markdown)
+        return markdown
+
+    def convert_many(
+        self,
+        paths: Iterable[Path],
+        force: bool = False,
+        max_workers: Optional[int] = None,
+        chunksize: int = 4,
+    ) -> Iterator[Tuple[Path, str, Optional[str]]]:
+        """Convert a batch of documents to markdown in parallel.
+
+        Conversion is CPU-bound work (PyMuPDF, markitdown's parsers), so the
+        batch is spread over worker processes rather than threads. A failing file
+        does not abort the batch; its error is reported alongside the path instead.
+
+        Args:
+            paths: Paths of the documents to convert
+            force: If True, force reconversion even if cached
+            max_workers: 1 converts the batch in this process; otherwise the
+                shared pool of one worker process per CPU is used
+            chunksize: Number of files handed to a worker at a time
+
+        Yields:
+            Tuples of (path, markdown, error message or None), in input order
+        """
+        plan = self._plan_batch(paths, force)
+        jobs = [
+            (os.fspath(self.cm_dir), os.fspath(path), force)
+            for path, cached, _ in plan
+            if cached is None
+        ]
+
+        results: Iterator[Tuple[str, str, Optional[str]]]
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            results = _get_process_pool().map(
+                _convert_one_path, jobs, chunksize=chunksize
+            )
+        else:
+            # Not worth handing to worker processes
+            results = map(_convert_one_path, jobs)
+
+        try:
+            for path, cached, fingerprint in plan:
+                if cached is not None:
+                    yield path, cached, None
+                    continue
+                yield self._finish_batch_item(path, fingerprint, next(results))
+        finally:
+            # Cancels the batch's queued jobs if the caller stopped early
+            close = getattr(results, "close", None)
+            if close is not None:
+                close()
+
+    def iter_convert_many(
+        self,
+        paths: Iterable[Path],
+        force: bool = False,
+        max_workers: Optional[int] = None,
+    ) -> Iterator[Tuple[Path, str, Optional[str]]]:
+        """Convert a batch of documents, yielding each one as soon as it is ready.
+
+        Unlike convert_many, results are produced in completion order: a slow
+        document does not hold back finished ones, so callers can write each
+        result out and drop it instead of buffering the whole batch.
+
+        Args:
+            paths: Paths of the documents to convert
+            force: If True, force reconversion even if cached
+            max_workers: 1 converts the batch in this process; otherwise the
+                shared pool of one worker process per CPU is used
+
+        Yields:
+            Tuples of (path, markdown, error message or None), in completion order
+        """
+        pending: List[Tuple[Path, Optional[_Fingerprint]]] = []
+        for path, cached, fingerprint in self._plan_batch(paths, force):
+            if cached is not None:
+                yield path, cached, None
+            else:
+                pending.append((path, fingerprint))
+
+        cm_dir = os.fspath(self.cm_dir)
+        workers = min(max_workers or os.cpu_count() or 1, len(pending))
+        if workers <= 1:
+            for path, fingerprint in pending:
+                result = _convert_one_path((cm_dir, os.fspath(path), force))
+                yield self._finish_batch_item(path, fingerprint, result)
+            return
+
+        executor = _get_process_pool()
+        futures: Dict[
+            "Future[Tuple[str, str, Optional[str]]]",
+            Tuple[Path, Optional[_Fingerprint]],
+        ] = {
+            executor.submit(_convert_one_path, (cm_dir, os.fspath(path), force)): (
+                path,
+                fingerprint,
+            )
+            for path, fingerprint in pending
+        }
+        try:
+            for future in as_completed(futures):
+                path, fingerprint = futures.pop(future)
+                yield self._finish_batch_item(path, fingerprint, future.result())
+        finally:
+            # Cancels the batch's queued jobs if the caller stopped early
+            for future in futures:
+                future.cancel()
+
+    def _plan_batch(
+        self, paths: Iterable[Path], force: bool
+    ) -> List[Tuple[Path, Optional[str], Optional[_Fingerprint]]]:
+        """Resolve system files and cache hits before a batch conversion.
+
+        These are answered in the parent process so they never reach a worker.
+
+        Args:
+            paths: Paths of the documents to convert
+            force: If True, skip the cache lookup
+
+        Returns:
+            List of (path, markdown or None if it must be converted, fingerprint)
+        """
+        plan: List[Tuple[Path, Optional[str], Optional[_Fingerprint]]] = []
+        for path in paths:
+            if _is_skipped(path.name):
+                plan.append((path, "", None))
+                continue
+            try:
+                cached, fingerprint = self._check_cache(path, force)
+            except OSError:
+                # Missing or unreadable; let the worker report it
+                cached, fingerprint = None, None
+            plan.append((path, cached, fingerprint))
+        return plan
+
+    def _finish_batch_item(
+        self,
+        path: Path,
+        fingerprint: Optional[_Fingerprint],
+        result: Tuple[str, str, Optional[str]],
+    ) -> Tuple[Path, str, Optional[str]]:
+        """Cache a successful worker result, or log its error.
+
+        Args:
+            path: Path of the converted document
+            fingerprint: Fingerprint computed when the batch was planned
+            result: Tuple returned by _convert_one_path
+
+        Returns:
+            Tuple of (path, markdown, error message or None)
+        """
+        _, markdown, error = result
+        if error:
+            logger.debug(f"Batch conversion failed for {path}: {error}")
+        else:
+            self._update_cache(path, fingerprint, markdown)
+        return path, markdown, error
+
+    def _check_cache(
+        self,
+        file_path: Path,
+        force: bool,
+        stat: Optional[os.stat_result] = None,
+    ) -> Tuple[Optional[str], Optional[_Fingerprint]]:
+        """Look up a previous conversion of an unchanged file.
+
+        A file whose size and modification time match the cache entry is a hit
+        without being read; the content hash is only computed when they differ.
+
+        Args:
+            file_path: Path to the document file
+            force: If True, skip the lookup (the fingerprint is still computed
+                so the fresh conversion can be cached)
+            stat: The file's stat result, if the caller already has it
+
+        Returns:
+            Tuple of (cached markdown or None, file fingerprint or None when
+            caching is disabled)
+        """
+        if self.cache_manager is None:
+            return None, None
+
+        if stat is None:
+            stat = file_path.stat()
+        cached = (
+            None if force else self.cache_manager.get_conversion_cache(str(file_path))
+        )
+        if not cached or cached.get("size") != stat.st_size:
+            return None, (stat.st_size, stat.st_mtime, file_hash(file_path))
+
+        # Same size and modification time: trust the entry without reading the file
+        if cached.get("mtime") == stat.st_mtime:
+            logger.debug(f"Using cached conversion of {file_path.name}")
+            return cast(str, cached["markdown"]), (
+                stat.st_size,
+                stat.st_mtime,
+                cached["hash"],
+            )
+
+        # Modified time changed: only the content hash can tell if it was edited
+        fingerprint = (stat.st_size, stat.st_mtime, file_hash(file_path))
+        if cached.get("hash") != fingerprint[2]:
+            return None, fingerprint
+
+        logger.debug(f"Using cached conversion of {file_path.name}")
+        markdown = cast(str, cached["markdown"])
+        # Record the new mtime so the next lookup takes the stat-only path
+        self._update_cache(file_path, fingerprint, markdown)
+        return markdown, fingerprint
+
+    def _update_cache(
+        self, file_path: Path, fingerprint: Optional[_Fingerprint], markdown: str
+    ) -> None:
+        """Store a conversion result keyed by the file's fingerprint."""
+        if self.cache_manager is None or fingerprint is None:
+            return
+        size, mtime, content_hash = fingerprint
+        self.cache_manager.update_conversion_cache(
+            str(file_path), content_hash, size, mtime, markdown
+        )
+
+    def _convert(self, file_path: Path, stat: Optional[os.stat_result] = None) -> str:
+        """Convert a document to markdown without consulting the cache."""
         # Try custom handlers first for known formats
         suffix = file_path.suffix.lower()
-        if suffix in self.CUSTOM_FORMATS:
+        if suffix in self._handlers:
             logger.debug(f"Using custom handler for {suffix}")
             try:
-                return self._convert_with_custom_handler(file_path, suffix)
+                return self._convert_with_custom_handler(file_path, suffix, stat)
             except Exception as e:
                 logger.debug(f"Custom handler failed: {str(e)}", exc_info=True)
-                raise ConversionError(f"Failed to convert {file_path}: {str(e)}")
+                raise ConversionError(f"Failed to convert {file_path}: {str(e)}") from e
+
+        if suffix in _unsupported_suffixes:
+            raise ConversionError(f"Format not supported: {suffix}")
+
+        direct_converter = _get_direct_converter(suffix)
+        if direct_converter is not None:
+            markdown = self._convert_direct(direct_converter, file_path, suffix)
+            if markdown is not None:
+                return markdown
+
+        # Already loaded by _get_direct_converter(), so this is a sys.modules lookup
+        from markitdown._markitdown import (
+            FileConversionException,
+            UnsupportedFormatException,
+        )
 
         try:
             # Try Microsoft's MarkItDown for other formats
             logger.debug(f"Attempting to convert {file_path}")
-            result = self.converter.convert(str(file_path))
-            logger.debug(f"MarkItDown result: {result}")
-            if result and hasattr(result, "text_content"):
+            result = self.converter.convert(os.fspath(file_path))
+        except UnsupportedFormatException as e:
+            # Extensionless files are sniffed by content, so only remember real
+            # extensions as unsupported
+            if suffix:
+                _unsupported_suffixes.add(suffix)
+            raise ConversionError(f"Format not supported: {suffix}") from e
+        except (
+            FileConversionException,
+            OSError,
+            zipfile.BadZipFile,
+            ValueError,
+        ) as e:
+            # Parsers raise BadZipFile or ValueError for corrupt documents
+            logger.debug(f"Conversion failed: {str(e)}", exc_info=True)
+            raise ConversionError(f"Failed to convert {file_path}: {str(e)}") from e
+
+        if result and hasattr(result, "text_content"):
+            # Only format the document into the log message when it will be shown
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Text content: {result.text_content}")
-                # Cast to str to satisfy mypy
-                return cast(str, result.text_content)
+            # Cast to str to satisfy mypy
+            return cast(str, result.text_content)
 
-            # For media files, just return a link
-            media_extensions = [".mov", ".mp4", ".avi", ".wmv", ".flv", ".mkv"]
-            if suffix in media_extensions:
-                logger.debug(f"Creating link for media file: {file_path.name}")
-                return f"[Media: {file_path.name}](attachments/{file_path.name})"
+        # For media files, just return a link
+        if suffix in _MEDIA_EXTENSIONS:
+            logger.debug(f"Creating link for media file: {file_path.name}")
+            return f"[Media: {file_path.name}](attachments/{file_path.name})"
 
-            # If we get here, no handler could process it
-            raise ConversionError(f"Format not supported: {suffix}")
-        except UnsupportedFormatException:
-            raise ConversionError(f"Format not supported: {suffix}")
+        # If we get here, no handler could process it
+        raise ConversionError(f"Format not supported: {suffix}")
+
+    def _convert_direct(
+        self, converter: "DocumentConverter", file_path: Path, suffix: str
+    ) -> Optional[str]:
+        """Convert with the markitdown converter registered for the extension.
+
+        Args:
+            converter: The markitdown converter for the extension
+            file_path: Path to the document file
+            suffix: Lowercase file extension, including the dot
+
+        Returns:
+            Markdown formatted string, or None if the converter declined the
+            file and MarkItDown's full dispatch should be used instead
+
+        Raises:
+            ConversionError: If the converter failed on the file
+        """
+        try:
+            result = converter.convert(
+                os.fspath(file_path),
+                file_extension=suffix,
+                _parent_converters=getattr(self.converter, "_page_converters", []),
+            )
         except Exception as e:
-            logger.debug(f"Conversion failed: {str(e)}", exc_info=True)
-            raise ConversionError(f"Failed to convert {file_path}: {str(e)}")
+            # Full dispatch would hand the file to this same converter again and
+            # report its error as a FileConversionException, so report it now
+            logger.debug(f"Direct {suffix} conversion failed: {str(e)}", exc_info=True)
+            raise ConversionError(f"Failed to convert {file_path}: {str(e)}") from e
+        if result is None or result.text_content is None:
+            return None
 
-    def _convert_with_custom_handler(self, file_path: Path, suffix: str) -> str:
+        # Apply the same normalization MarkItDown applies to converter results
+        text = "\n".join(
+            line.rstrip() for line in _RE_LINE_BREAK.split(result.text_content)
+        )
+        return _RE_EXCESS_NEWLINES.sub("\n\n", text)
+
+    def _convert_with_custom_handler(
+        self, file_path: Path, suffix: str, stat: Optional[os.stat_result] = None
+    ) -> str:
         """Convert using custom handlers for specific formats."""
+        handler = self._handlers.get(suffix)
+        if handler is None:
+            raise ConversionError(f"No custom handler for: {suffix}")
         try:
-            if suffix == ".csv":
-                return self._convert_csv(file_path)
-            elif suffix == ".txt":
-                return self._convert_text(file_path)
-            elif suffix == ".json":
-                return self._convert_json(file_path)
-            elif suffix == ".pdf":
-                return self._convert_pdf(file_path)
-            else:
-                raise ConversionError(f"No custom handler for: {suffix}")
+            return handler(file_path, stat)
         except Exception as e:
-            raise ConversionError(f"Custom handler failed for {suffix}: {str(e)}")
+            raise ConversionError(
+                f"Custom handler failed for {suffix}: {str(e)}"
+            ) from e
 
-    def _convert_csv(self, file_path: Path) -> str:
+    def _convert_csv(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> str:
         """Convert CSV to markdown table."""
-        encodings = ["utf-8", "latin1", "cp1252", "iso-8859-1"]
+        if stat is None:
+            stat = file_path.stat()
+        encodings = _csv_encodings(file_path)
+        if stat.st_size >= _ARROW_CSV_MIN_BYTES:
+            arrow_rows = _read_csv_rows_arrow(file_path, encodings[0])
+            if arrow_rows:
+                return _markdown_table(arrow_rows)
+
         last_error = None
 
         for encoding in encodings:
             try:
-                # First validate CSV structure using csv module
-                with open(file_path, "r", encoding=encoding) as f:
+                # Read, validate and format the CSV in a single pass. Each row is
+                # formatted as soon as it is read, so only the table lines are
+                # kept rather than a list of cells for every row.
+                with open(file_path, "r", encoding=encoding, newline="") as f:
                     reader = csv.reader(f)
-                    header = next(reader)
-                    expected_cols = len(header)
-                    for i, row in enumerate(reader, start=2):
-                        if len(row) != expected_cols:
+                    lines: List[str] = []
+                    columns = 0
+                    for row in reader:
+                        if not row:
+                            continue  # Skip blank lines
+                        if not lines:
+                            columns = len(row)
+                            lines.append(_markdown_table_row(row))
+                            lines.append(_markdown_table_separator(columns))
+                        elif len(row) != columns:
                             raise ConversionError(
-                                f"CSV file is malformed: Line {i} has {len(row)} columns, expected {expected_cols}"
+                                f"CSV file is malformed: Line {reader.line_num} has {len(row)} columns, expected {columns}"
                             )
-
-                # If validation passes, read with pandas
-                df = pd.read_csv(
-                    file_path, encoding=encoding, engine="python", skip_blank_lines=True
-                )
-
-                # Use github format to ensure proper header separator
-                table = df.to_markdown(index=False, tablefmt="github")
-                table = re.sub(r"\s+\|\s+", " | ", table)
-                table = re.sub(r"\n\s*\n+", "\n\n", table)
-                # Cast to str to satisfy mypy
-                return cast(str, table)
-            except pd.errors.ParserError as e:
-                raise ConversionError(f"CSV file is malformed: {str(e)}")
-            except pd.errors.EmptyDataError as e:
-                raise ConversionError(f"CSV file is empty: {str(e)}")
+                        else:
+                            lines.append(_markdown_table_row(row))
             except UnicodeDecodeError as e:
                 last_error = e
                 continue
+            except ConversionError:
+                raise
             except Exception as e:
                 raise ConversionError(f"Failed to convert CSV: {str(e)}")
 
+            if not lines:
+                raise ConversionError("CSV file is empty: no header row")
+            return "\n".join(lines)
+
         raise ConversionError(
             f"Failed to decode CSV with any encoding: {str(last_error)}"
         )
 
-    def _convert_text(self, file_path: Path) -> str:
+    def _convert_text(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> str:
         """Convert text file to markdown."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            return f"```\n{content}\n```"
+            if stat is None:
+                stat = file_path.stat()
+            return _read_fenced_text(file_path, stat.st_size)
         except Exception as e:
             raise ConversionError(f"Failed to read text file: {str(e)}")
 
-    def _convert_json(self, file_path: Path) -> str:
+    def _convert_json(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> str:
         """Convert JSON file to pretty-printed markdown."""
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            pretty = json.dumps(data, indent=2)
+            if stat is None:
+                stat = file_path.stat()
+            if orjson is not None and stat.st_size >= _MMAP_JSON_MIN_BYTES:
+                # orjson parses straight from the mapped pages, so a large file
+                # is never copied into a bytes object first
+                with (
+                    open(file_path, "rb") as f,
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+                    memoryview(mapped) as view,
+                ):
+                    pretty = _pretty_json(view)
+            else:
+                pretty = _pretty_json(file_path.read_bytes())
             return f"```json\n{pretty}\n```"
         except json.JSONDecodeError as e:
             raise ConversionError(f"Failed to parse JSON file: {str(e)}")
         except Exception as e:
             raise ConversionError(f"Failed to process JSON file: {str(e)}")
 
-    def _convert_pdf(self, file_path: Path) -> str:
+    def _convert_pdf(
+        self, file_path: Path, stat: Optional[os.stat_result] = None
+    ) -> str:
         """Convert PDF to markdown using PyMuPDF.
 
         PyMuPDF provides superior PDF handling compared to Microsoft's MarkItDown:
@@ -202,42 +1060,25 @@ class MarkItDown:
         - More reliable handling of complex PDF structures
         """
         try:
-            # Open the PDF
-            doc = fitz.open(file_path)
-
-            # Extract text with layout preservation
-            content = []
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                # Get text blocks with their layout information
-                blocks = page.get_text("dict")["blocks"]
-
-                # Process each text block
-                for block in blocks:
-                    if block.get("type") == 0:  # Text block
-                        for line in block.get("lines", []):
-                            for span in line.get("spans", []):
-                                text = span.get("text", "").strip()
-                                if text:
-                                    content.append(text)
-
-            # Join content with proper spacing
-            text = "\n".join(content)
-
-            # If no content was extracted, try a simpler approach
-            if not text.strip():
-                text = ""
-                for page_num in range(len(doc)):
-                    page = doc[page_num]
-                    text += page.get_text() + "\n\n"
-
-            # Format as markdown with metadata
-            # Note: Removed unused variables page_count and size_kb
-            # Close the document
-            doc.close()
-
-            # Only include text content if we have some
-            text = text.strip()
+            with _open_pdf(file_path) as doc:
+                page_count = len(doc)
+                workers = _pdf_workers(page_count)
+                if workers <= 1:
+                    lines = _pdf_page_lines(doc, 0, page_count)
+
+            if workers > 1:
+                # Large PDF: split the pages into one contiguous range per worker
+                step = -(-page_count // workers)
+                starts = range(0, page_count, step)
+                chunks = _get_process_pool().map(
+                    _pdf_file_page_lines,
+                    [os.fspath(file_path)] * len(starts),
+                    starts,
+                    [min(start + step, page_count) for start in starts],
+                )
+                lines = [line for chunk in chunks for line in chunk]
+
+            text = "\n".join(lines)
             return f"""```pdf
 {text}
 ```"""
@@ -246,10 +1087,9 @@ class MarkItDown:
 
     def cleanup(self) -> None:
         """Clean up temporary files."""
-        import shutil
-
         try:
-            if self.temp_dir.exists():
-                shutil.rmtree(self.temp_dir)
+            shutil.rmtree(self.temp_dir)
+        except FileNotFoundError:
+            pass  # Already removed
         except Exception as e:
             logger.warning(f"Failed to clean up temp directory: {str(e)}")
@@ -1,20 +1,215 @@
 """GPT-4 Vision processor for image analysis."""
 
-import base64  # Standard library
+import atexit  # Standard library
+import contextlib  # Standard library
+import hashlib  # Standard library
+import importlib.util  # Standard library
 import logging  # Standard library
+import os  # Standard library
 import subprocess  # Standard library
+import threading  # Standard library
+from concurrent.futures import ThreadPoolExecutor  # Standard library
 from pathlib import Path  # Standard library
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import (  # Standard library
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    cast,
+)
+
+try:
+    from pybase64 import b64encode  # Optional dependency: pybase64
+except ImportError:  # pragma: no cover
+    from base64 import b64encode  # Standard library
+
+from ..cache import CacheManager, bytes_hash, quick_hash
+from ..config import VALID_MODELS, GlobalConfig
 
-from openai import OpenAI  # External dependency: openai
-from openai.types.chat import ChatCompletionMessageParam  # External dependency: openai
+if TYPE_CHECKING:
+    import httpx  # External dependency: openai
+    from openai import OpenAI  # External dependency: openai
+    from openai.types.chat import (  # External dependency: openai
+        ChatCompletionMessageParam,
+    )
 
-from ..cache import CacheManager, quick_hash
-from ..config import VALID_MODELS, GlobalConfig
-from ..processors.result import ProcessingResult
+    from ..processors.result import ProcessingResult
 
 logger = logging.getLogger(__name__)
 
+# Default number of image descriptions requested from the API at once
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Content types of the image formats sent to the API; anything else is JPEG
+_MIME_TYPES = {".png": "image/png", ".gif": "image/gif", ".webp": "image/webp"}
+
+# Longest side, in pixels, of the images sent to the API; the vision models
+# scale anything larger down to this themselves
+_MAX_IMAGE_SIDE = 2048
+
+# Image bytes base64-encoded at a time (a multiple of 3, so chunks join cleanly)
+_BASE64_CHUNK_BYTES = 3 * 2**16
+
+# Connection pool shared by every OpenAI client, created by _get_http_client()
+_http_client: Optional["httpx.Client"] = None
+_http_client_lock = threading.Lock()
+
+# OpenAI clients shared by processors with the same settings, created by
+# _get_client()
+_clients: Dict[Tuple[Type["OpenAI"], str, str], "OpenAI"] = {}
+_clients_lock = threading.Lock()
+
+
+def _image_data_url(image_path: Path, image_data: bytes) -> str:
+    """Build the data URL an image is sent to the API as.
+
+    The base64 text is encoded a chunk at a time into one buffer after the URL
+    prefix and decoded once, instead of being copied into a base64 string and
+    then again into the URL.
+
+    Args:
+        image_path: Path of the image, whose suffix gives the content type
+        image_data: The image file's content
+
+    Returns:
+        The data URL
+    """
+    mime_type = _MIME_TYPES.get(image_path.suffix.lower(), "image/jpeg")
+    url = bytearray(f"data:{mime_type};base64,".encode("ascii"))
+    with memoryview(image_data) as view:
+        for start in range(0, len(view), _BASE64_CHUNK_BYTES):
+            url += b64encode(view[start : start + _BASE64_CHUNK_BYTES])
+    return url.decode("ascii")
+
+
+def _vision_data_url(image_path: Path, image_data: bytes) -> str:
+    """Build the data URL an image is sent to the API as, shrinking it first.
+
+    Images larger than _MAX_IMAGE_SIDE are downscaled and recompressed as
+    JPEG, so that less is encoded and uploaded.
+
+    Args:
+        image_path: Path of the image, whose suffix gives the content type
+        image_data: The image file's content
+
+    Returns:
+        The data URL
+    """
+    # Imported here: the image module loads Pillow
+    from .image import shrink_image
+
+    shrunk = shrink_image(image_data, _MAX_IMAGE_SIDE)
+    if shrunk is not None:
+        logger.debug(
+            f"Shrunk {image_path.name} from {len(image_data)} to {len(shrunk)} bytes"
+        )
+        return _image_data_url(image_path.with_suffix(".jpg"), shrunk)
+    return _image_data_url(image_path, image_data)
+
+
+def _prefetch_images(image_paths: Iterable[Path]) -> None:
+    """Ask the kernel to start reading image files into the page cache.
+
+    posix_fadvise(WILLNEED) queues the reads and returns at once, so the disk
+    reads of a whole batch overlap each other and the API requests in flight,
+    and each description's hash and read are then served from memory. It is a
+    hint only; platforms without it (macOS, Windows) skip the prefetch.
+
+    Args:
+        image_paths: Paths to the image files
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for image_path in image_paths:
+        try:
+            fd = os.open(image_path, os.O_RDONLY)
+        except OSError:
+            continue  # describe_image reports unreadable files
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the OpenAI client class on first access (PEP 562).
+
+    openai is slow to import and only needed once a GPTProcessor is created,
+    so loading the processors does not pay for it.
+    """
+    if name != "OpenAI":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from openai import OpenAI  # External dependency: openai
+
+    globals()["OpenAI"] = OpenAI
+    return OpenAI
+
+
+def _get_http_client() -> "httpx.Client":
+    """Get the HTTP client shared by all GPT processors, creating it on first use.
+
+    Every processor's OpenAI client sends its requests through this one
+    connection pool, so keep-alive connections are reused across processors
+    and images instead of each client paying for its own TCP and TLS
+    handshakes. HTTP/2 is used when h2 is installed, letting concurrent
+    requests share a connection.
+    """
+    global _http_client
+    if _http_client is None:
+        with _http_client_lock:
+            if _http_client is None:
+                import httpx  # External dependency: openai
+                from openai import DefaultHttpxClient  # External dependency: openai
+
+                _http_client = DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=64, max_keepalive_connections=32
+                    ),
+                    # Optional dependency: h2
+                    http2=importlib.util.find_spec("h2") is not None,
+                )
+                atexit.register(_http_client.close)
+    return _http_client
+
+
+def _get_client(client_class: Type["OpenAI"], api_key: str, base_url: str) -> "OpenAI":
+    """Get the client for an API key and base URL, creating it on first use.
+
+    Processors are created per source and per formatted image, so they share
+    their clients rather than each building its own.
+
+    Args:
+        client_class: The OpenAI client class
+        api_key: The provider's API key
+        base_url: The provider's API base URL
+
+    Returns:
+        The shared client
+    """
+    key = (client_class, api_key, base_url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            # Note: Proxies should be configured via environment variables
+            # (HTTP_PROXY, HTTPS_PROXY); OpenAI v1.0+ takes no 'proxies' parameter
+            client = client_class(
+                api_key=api_key, base_url=base_url, http_client=_get_http_client()
+            )
+            _clients[key] = client
+    return client
+
+
+def _openai_class() -> Type["OpenAI"]:
+    """Get the OpenAI client class, importing openai if needed."""
+    return cast(Type["OpenAI"], globals().get("OpenAI") or __getattr__("OpenAI"))
+
 
 class GPTError(Exception):
     """Error during GPT processing."""
@@ -41,7 +236,10 @@ class GPTProcessor:
         self.cache_manager = cache_manager
         self.provider = config.api_provider
         self.current_model = config.models.default_model
-        self.client: Optional[OpenAI] = None
+        self.client: Optional["OpenAI"] = None
+        # Locks of the image contents being described, with their user counts
+        self._in_flight: Dict[str, Tuple[threading.Lock, int]] = {}
+        self._in_flight_lock = threading.Lock()
 
         # Set OpenAI logging to INFO level before creating client
         logging.getLogger("openai").setLevel(logging.INFO)
@@ -50,34 +248,23 @@ class GPTProcessor:
 
         # Initialize client based on provider
         try:
+            client_class = _openai_class()
             if self.provider == "openai":
                 if not config.openai_key:
                     raise GPTError(
                         "OpenAI API key is required when using OpenAI provider"
                     )
-                # Note: Proxies should be configured via environment variables (HTTP_PROXY, HTTPS_PROXY)
-                # instead of passing a 'proxies' parameter to the OpenAI client
-                client_params: Dict[str, Any] = {
-                    "api_key": config.openai_key,
-                    "base_url": config.openai_base_url,
-                }
-                # Remove proxies if present (not supported in OpenAI v1.0+)
-                client_params.pop("proxies", None)
-                self.client = OpenAI(**client_params)
+                self.client = _get_client(
+                    client_class, config.openai_key, config.openai_base_url
+                )
             elif self.provider == "openrouter":
                 if not config.openrouter_key:
                     raise GPTError(
                         "OpenRouter API key is required when using OpenRouter provider"
                     )
-                # Note: Proxies should be configured via environment variables (HTTP_PROXY, HTTPS_PROXY)
-                # instead of passing a 'proxies' parameter to the OpenAI client
-                router_client_params: Dict[str, Any] = {
-                    "api_key": config.openrouter_key,
-                    "base_url": config.openrouter_base_url,
-                }
-                # Remove proxies if present (not supported in OpenAI v1.0+)
-                router_client_params.pop("proxies", None)
-                self.client = OpenAI(**router_client_params)
+                self.client = _get_client(
+                    client_class, config.openrouter_key, config.openrouter_base_url
+                )
             else:
                 raise GPTError(f"Unsupported API provider: {self.provider}")
         except TypeError as e:
@@ -147,9 +334,7 @@ class GPTProcessor:
 
         try:
             # Prepare image data
-            with open(image_path, "rb") as f:
-                image_data = f.read()
-                image_b64 = base64.b64encode(image_data).decode("utf-8")
+            image_url = _vision_data_url(image_path, image_path.read_bytes())
 
             # Default prompt if none provided
             if not prompt:
@@ -157,9 +342,9 @@ class GPTProcessor:
 
             # Prepare API call based on provider
             if self.provider == "openai":
-                response = self._call_openai_api(image_b64, prompt)
+                response = self._call_openai_api(image_url, prompt)
             else:  # openrouter
-                response = self._call_openrouter_api(image_b64, prompt)
+                response = self._call_openrouter_api(image_url, prompt)
 
             if response is None:
                 raise GPTError("API returned no response")
@@ -173,11 +358,11 @@ class GPTProcessor:
         except Exception as e:
             raise GPTError(f"Error analyzing image with {self.current_model}: {str(e)}")
 
-    def _call_openai_api(self, image_b64: str, prompt: str) -> str:
+    def _call_openai_api(self, image_url: str, prompt: str) -> str:
         """Call OpenAI API for image analysis.
 
         Args:
-            image_b64: Base64 encoded image data
+            image_url: Data URL of the image
             prompt: Analysis prompt
 
         Returns:
@@ -198,14 +383,14 @@ class GPTProcessor:
                         {"type": "text", "text": prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"},
+                            "image_url": {"url": image_url},
                         },
                     ],
                 }
             ]
 
             # Cast the messages to the expected type
-            typed_messages = cast(List[ChatCompletionMessageParam], messages)
+            typed_messages = cast("List[ChatCompletionMessageParam]", messages)
 
             response = self.client.chat.completions.create(
                 model="gpt-4-vision-preview",
@@ -223,11 +408,11 @@ class GPTProcessor:
         except Exception as e:
             raise GPTError(f"OpenAI API error: {str(e)}")
 
-    def _call_openrouter_api(self, image_b64: str, prompt: str) -> str:
+    def _call_openrouter_api(self, image_url: str, prompt: str) -> str:
         """Call OpenRouter API for image analysis.
 
         Args:
-            image_b64: Base64 encoded image data
+            image_url: Data URL of the image
             prompt: Analysis prompt
 
         Returns:
@@ -248,14 +433,14 @@ class GPTProcessor:
                         {"type": "text", "text": prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"},
+                            "image_url": {"url": image_url},
                         },
                     ],
                 }
             ]
 
             # Cast the messages to the expected type
-            typed_messages = cast(List[ChatCompletionMessageParam], messages)
+            typed_messages = cast("List[ChatCompletionMessageParam]", messages)
 
             response = self.client.chat.completions.create(
                 model=self.current_model,
@@ -277,10 +462,31 @@ class GPTProcessor:
                 f"OpenRouter API error with model {self.current_model}: {str(e)}"
             )
 
+    @contextlib.contextmanager
+    def _single_flight(self, image_hash: str) -> Iterator[None]:
+        """Hold a lock for an image's content while it is being described.
+
+        Args:
+            image_hash: Content hash of the image
+        """
+        with self._in_flight_lock:
+            lock, users = self._in_flight.get(image_hash, (threading.Lock(), 0))
+            self._in_flight[image_hash] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._in_flight_lock:
+                lock, users = self._in_flight[image_hash]
+                if users == 1:
+                    del self._in_flight[image_hash]
+                else:
+                    self._in_flight[image_hash] = (lock, users - 1)
+
     def describe_image(
         self,
         image_path: Path,
-        result: ProcessingResult,
+        result: "ProcessingResult",
         processor_type: str,
     ) -> str:
         """Get GPT description of image.
@@ -290,91 +496,186 @@ class GPTProcessor:
             result: The processing result to update
             processor_type: The type of processor requesting the analysis
         """
+        # Images whose conversion failed recently are not converted again until
+        # they change
+        source_stat = None
+        if (
+            self.cache_manager
+            and image_path.suffix.lower() not in self.SUPPORTED_FORMATS
+        ):
+            try:
+                source_stat = image_path.stat()
+            except OSError:
+                pass  # Left to the conversion, which reports the error
+            if source_stat is not None and self.cache_manager.is_unsupported(
+                str(image_path), source_stat.st_size, source_stat.st_mtime_ns
+            ):
+                logger.debug(f"Skipping {image_path}: its conversion failed before")
+                result.add_gpt_skipped(processor_type)
+                return "[Error: Unsupported image format]"
+
         # Convert image to supported format if needed
         converted_path, needs_cleanup = self._convert_to_supported_format(image_path)
         if converted_path is None:
             logger.error(f"Could not convert {image_path} to a supported format")
+            if self.cache_manager and source_stat is not None:
+                self.cache_manager.mark_unsupported(
+                    str(image_path), source_stat.st_size, source_stat.st_mtime_ns
+                )
             result.add_gpt_skipped(processor_type)
             return "[Error: Unsupported image format]"
 
         try:
-            # Generate cache key from image content
-            image_hash = quick_hash(str(converted_path.read_bytes()))
-
-            # Check cache first
-            if self.cache_manager:
-                cached = self.cache_manager.get_gpt_cache(image_hash)
-                if cached:
-                    logger.debug(f"Cache hit for GPT analysis: {image_hash}")
-                    result.add_gpt_from_cache(processor_type)
-                    return str(cached)
-
-            logger.debug(f"Cache miss for GPT analysis: {image_hash}")
-
-            # Convert image to base64
-            with open(converted_path, "rb") as img_file:
-                img_base64 = base64.b64encode(img_file.read()).decode()
+            # An image whose size and modification time are unchanged since it
+            # was last hashed is looked up by that hash without being read.
+            # Converted copies are new files on every run, so they are skipped.
+            stat = converted_path.stat()
+            known = None
+            if self.cache_manager and not needs_cleanup:
+                known = self.cache_manager.get_image_hash_cache(str(converted_path))
+                if (
+                    known is not None
+                    and known.get("size") == stat.st_size
+                    and known.get("mtime_ns") == stat.st_mtime_ns
+                ):
+                    cached = self.cache_manager.get_gpt_cache(known["hash"])
+                    if cached:
+                        logger.debug(f"Cache hit for GPT analysis: {known['hash']}")
+                        result.add_gpt_from_cache(processor_type)
+                        return str(cached)
+
+            # The image is read once; the same bytes give the cache key, the
+            # legacy cache lookups and the base64 payload
+            image_data = converted_path.read_bytes()
+            image_hash = bytes_hash(image_data)
+            if (
+                self.cache_manager
+                and not needs_cleanup
+                and (known is None or known.get("hash") != image_hash)
+            ):
+                self.cache_manager.update_image_hash_cache(
+                    str(converted_path), image_hash, stat.st_size, stat.st_mtime_ns
+                )
 
-            # Create API request with proper type annotation
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "What's in this image? Describe it in detail.",
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{img_base64}"
+            # A duplicate of an image that is being described concurrently
+            # waits for that description and then finds it in the cache
+            with self._single_flight(image_hash):
+                # Check cache first
+                if self.cache_manager:
+                    cached = self.cache_manager.get_gpt_cache(image_hash)
+                    if cached:
+                        logger.debug(f"Cache hit for GPT analysis: {image_hash}")
+                        result.add_gpt_from_cache(processor_type)
+                        return str(cached)
+
+                if (
+                    self.cache_manager
+                    and self.cache_manager.gpt_key_migration_pending()
+                ):
+                    # Until the cache has been migrated, descriptions may be cached
+                    # under a BLAKE2b key (from before BLAKE3 was installed) or,
+                    # from before keys were content digests, a hash of the bytes'
+                    # repr; move them to the new key
+                    for legacy_hash in (
+                        hashlib.blake2b(image_data, digest_size=16).hexdigest(),
+                        quick_hash(str(image_data)),
+                    ):
+                        if legacy_hash == image_hash:
+                            continue
+                        cached = self.cache_manager.get_gpt_cache(legacy_hash)
+                        if cached:
+                            logger.debug(
+                                f"Legacy cache hit for GPT analysis: {image_hash}"
+                            )
+                            self.cache_manager.update_gpt_cache(image_hash, cached)
+                            result.add_gpt_from_cache(processor_type)
+                            return str(cached)
+
+                # Optionally reuse the description of an image that looks the same,
+                # such as a resized or recompressed copy
+                similar_hash = None
+                if self.cache_manager and self.config.similar_image_distance > 0:
+                    # Imported here: the image module loads Pillow
+                    from .image import difference_hash
+
+                    similar_hash = difference_hash(image_data)
+                    if similar_hash is not None:
+                        cached = self.cache_manager.get_gpt_semantic_cache(
+                            similar_hash, self.config.similar_image_distance
+                        )
+                        if cached:
+                            logger.debug(f"Similar image cache hit for: {image_hash}")
+                            self.cache_manager.update_gpt_cache(image_hash, cached)
+                            result.add_gpt_from_cache(processor_type)
+                            return str(cached)
+
+                logger.debug(f"Cache miss for GPT analysis: {image_hash}")
+
+                # Convert image to a base64 data URL
+                image_url = _vision_data_url(converted_path, image_data)
+
+                # Create API request with proper type annotation
+                messages = [
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": "What's in this image? Describe it in detail.",
                             },
-                        },
-                    ],
-                }
-            ]
-
-            # Cast the messages to the expected type
-            typed_messages = cast(List[ChatCompletionMessageParam], messages)
-
-            # Log request without base64 data for debugging
-            logger.debug(
-                f"Sending GPT request to {self.provider} for image analysis (base64 data omitted)"
-            )
+                            {
+                                "type": "image_url",
+                                "image_url": {"url": image_url},
+                            },
+                        ],
+                    }
+                ]
 
-            # Check if client is available
-            if not self.client:
-                logger.error("GPT client is not initialized")
-                result.add_gpt_skipped(processor_type)
-                return "[Error: GPT client not available]"
+                # Cast the messages to the expected type
+                typed_messages = cast("List[ChatCompletionMessageParam]", messages)
 
-            response = self.client.chat.completions.create(
-                model=self.current_model,
-                messages=typed_messages,
-                max_tokens=300,
-            )
-            # Log API request at debug level
-            logger.debug(f"GPT API request to {self.provider} completed")
-
-            content = response.choices[0].message.content
-            if content is None:
-                logger.error(f"GPT API returned no content ({self.provider})")
-                result.add_gpt_skipped(processor_type)
-                return "[Error: No content returned]"
+                # Log request without base64 data for debugging
+                logger.debug(
+                    f"Sending GPT request to {self.provider} for image analysis (base64 data omitted)"
+                )
 
-            description = str(content)
-            result.add_gpt_generated(processor_type)
+                # Check if client is available
+                if not self.client:
+                    logger.error("GPT client is not initialized")
+                    result.add_gpt_skipped(processor_type)
+                    return "[Error: GPT client not available]"
 
-            # Cache the result
-            if self.cache_manager:
-                self.cache_manager.update_gpt_cache(image_hash, description)
-
-            # Log the description at debug level instead of info
-            logger.debug(
-                f"Generated description for {image_path.name}: {description[:100]}..."
-            )
+                response = self.client.chat.completions.create(
+                    model=self.current_model,
+                    messages=typed_messages,
+                    max_tokens=300,
+                )
+                # Log API request at debug level
+                logger.debug(f"GPT API request to {self.provider} completed")
+
+                content = response.choices[0].message.content
+                if content is None:
+                    logger.error(f"GPT API returned no content ({self.provider})")
+                    result.add_gpt_skipped(processor_type)
+                    return "[Error: No content returned]"
+
+                description = str(content)
+                result.add_gpt_generated(processor_type)
+
+                # Cache the result
+                if self.cache_manager:
+                    self.cache_manager.update_gpt_cache(image_hash, description)
+                    if similar_hash is not None:
+                        self.cache_manager.update_gpt_semantic_cache(
+                            similar_hash, image_hash
+                        )
+
+                # Log the description at debug level instead of info
+                logger.debug(
+                    f"Generated description for {image_path.name}: {description[:100]}..."
+                )
 
-            return description
+                return description
 
         except Exception as e:
             logger.error(f"GPT API error ({self.provider}): {str(e)}")
@@ -390,10 +691,65 @@ class GPTProcessor:
                         f"Failed to clean up temporary file {converted_path}: {e}"
                     )
 
+    def describe_images(
+        self,
+        image_paths: Iterable[Path],
+        result: "ProcessingResult",
+        processor_type: str,
+        max_workers: int = _MAX_CONCURRENT_REQUESTS,
+    ) -> List[str]:
+        """Get GPT descriptions of several images concurrently.
+
+        Each description waits seconds on a network round trip, so up to
+        max_workers requests are in flight at once, sharing this processor's
+        client and cache.
+
+        Args:
+            image_paths: Paths to the image files
+            result: The processing result to update
+            processor_type: The type of processor requesting the analysis
+            max_workers: Maximum number of concurrent API requests
+
+        Returns:
+            The descriptions, in the order of image_paths
+        """
+        paths = list(image_paths)
+        if len(paths) <= 1 or max_workers <= 1:
+            return [self.describe_image(path, result, processor_type) for path in paths]
+
+        # Start reading the images that are sent as they are; the others are
+        # converted first
+        _prefetch_images(
+            path for path in paths if path.suffix.lower() in self.SUPPORTED_FORMATS
+        )
+
+        # Each request records its outcome in its own result; they are tallied
+        # into the shared result afterwards, on this thread
+        image_results = [type(result)() for _ in paths]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            descriptions = list(
+                executor.map(
+                    lambda path, image_result: self.describe_image(
+                        path, image_result, processor_type
+                    ),
+                    paths,
+                    image_results,
+                )
+            )
+
+        for image_result in image_results:
+            for _ in range(image_result.gpt_new_analyses):
+                result.add_gpt_generated(processor_type)
+            for _ in range(image_result.gpt_cache_hits):
+                result.add_gpt_from_cache(processor_type)
+            for _ in range(image_result.gpt_skipped):
+                result.add_gpt_skipped(processor_type)
+        return descriptions
+
     def get_placeholder(
         self,
         image_path: Path,
-        result: ProcessingResult,
+        result: "ProcessingResult",
         processor_type: str,
     ) -> str:
         """Get a placeholder description for an image.
@@ -427,7 +783,8 @@ class GPTProcessor:
                 subprocess.run(
                     ["rsvg-convert", "-o", str(output_path), str(image_path)],
                     check=True,
-                    capture_output=True,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                 )
                 logger.debug(f"Converted {image_path.name} to PNG for GPT analysis")
                 return output_path, True
@@ -435,23 +792,30 @@ class GPTProcessor:
                 logger.error(f"Failed to convert SVG to PNG: {e}")
                 return None, False
 
-        # Convert HEIC to JPEG using sips on macOS
+        # Convert HEIC to JPEG in-process with pillow-heif, or using sips on macOS
         if suffix == ".heic":
+            # Imported here: the image module loads Pillow
+            from .image import heif_supported, save_as_jpeg
+
             try:
                 output_path = image_path.with_suffix(".jpg")
-                subprocess.run(
-                    [
-                        "sips",
-                        "-s",
-                        "format",
-                        "jpeg",
-                        str(image_path),
-                        "--out",
-                        str(output_path),
-                    ],
-                    check=True,
-                    capture_output=True,
-                )
+                if heif_supported():
+                    save_as_jpeg(image_path, output_path)
+                else:
+                    subprocess.run(
+                        [
+                            "sips",
+                            "-s",
+                            "format",
+                            "jpeg",
+                            str(image_path),
+                            "--out",
+                            str(output_path),
+                        ],
+                        check=True,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
                 logger.debug(f"Converted {image_path.name} to JPEG for GPT analysis")
                 return output_path, True
             except Exception as e:
@@ -1,15 +1,64 @@
 """Image processing utilities."""
 
+import functools  # Standard library
+import io  # Standard library
 import logging  # Standard library
+import os  # Standard library
 import platform  # Standard library
+import re  # Standard library
 import shutil  # Standard library
+import struct  # Standard library
 import subprocess  # Standard library
+from concurrent.futures import ThreadPoolExecutor  # Standard library
 from pathlib import Path  # Standard library
-from typing import Any, Dict, List, Tuple  # Standard library
+from typing import (  # Standard library
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from xml.etree import ElementTree as ET  # Standard library
 
 from PIL import Image  # External dependency: pillow
 
 from ..log_setup import logger
+from ..utils import link_or_copy, read_text_file
+
+# SVG size attributes: a length in user units or pixels, and the separators
+# between the viewBox numbers
+_RE_SVG_LENGTH = re.compile(r"\s*([0-9.]+)(?:px)?\s*")
+_RE_SVG_VIEWBOX_SEP = re.compile(r"[\s,]+")
+
+# Characters of an SVG document fed to the parser at a time while looking for
+# its root element
+_SVG_PARSE_CHUNK = 4096
+
+# Formats converted to JPEG when processed
+_JPEG_CONVERTED_FORMATS = frozenset({".heic", ".webp"})
+
+# Formats used in place, without a copy in the temp directory
+_IN_PLACE_FORMATS = frozenset({".jpg", ".jpeg", ".png"})
+
+# PNG signature followed by the IHDR chunk's length and type
+_PNG_HEADER = b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"
+
+# JPEG start-of-frame markers, which carry the image size: 0xC0-0xCF except
+# DHT (0xC4), JPG (0xC8) and DAC (0xCC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# JPEG markers without a length field: TEM, RST0-RST7 and SOI
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD9)})
+
+# Default cap on the threads ImageProcessor.process_images() uses
+_MAX_IMAGE_WORKERS = 32
+
+# HEIC images converted per ImageMagick run by ImageProcessor.prepare_images()
+_HEIC_BATCH_SIZE = 64
 
 # Suppress PIL debug logging
 pil_logger = logging.getLogger("PIL")
@@ -22,35 +71,254 @@ class ImageProcessingError(Exception):
     pass
 
 
+def difference_hash(image_data: bytes) -> Optional[int]:
+    """Compute a 64-bit perceptual difference hash (dHash) of an image.
+
+    The image is reduced to 9x8 grey pixels and each bit records whether a
+    pixel is brighter than its right-hand neighbour, so resized or
+    recompressed copies of an image hash to the same or nearby values.
+
+    Args:
+        image_data: The image file's content
+
+    Returns:
+        The hash, or None if Pillow cannot read the image
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as img:
+            img.draft("L", (9, 8))
+            pixels = list(
+                img.convert("L").resize((9, 8), Image.Resampling.BILINEAR).getdata()
+            )
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not hash image: {str(e)}")
+        return None
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            value = (value << 1) | (left > pixels[row * 9 + col + 1])
+    return value
+
+
+@functools.lru_cache(maxsize=1)
+def heif_supported() -> bool:
+    """Register pillow-heif's HEIC support with Pillow, if it is installed.
+
+    Returns:
+        True if HEIC images can be decoded in-process with Pillow
+    """
+    try:
+        from pillow_heif import register_heif_opener  # Optional dependency: pillow-heif
+    except ImportError:
+        return False
+    register_heif_opener()
+    return True
+
+
+def _to_rgb(img: Image.Image) -> Image.Image:
+    """Convert an image to RGB for saving as JPEG.
+
+    Transparent areas are flattened onto a white background.
+    """
+    if img.mode in ("RGBA", "LA"):
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != "RGB":
+        return img.convert("RGB")
+    return img
+
+
+def save_as_jpeg(image_path: Path, output_path: Path) -> None:
+    """Convert an image to JPEG with Pillow.
+
+    Transparent areas are flattened onto a white background.
+
+    Args:
+        image_path: The image to convert
+        output_path: Where to write the JPEG
+    """
+    with Image.open(image_path) as img:
+        _to_rgb(img).save(output_path, "JPEG", quality=95)
+
+
+def shrink_image(image_data: bytes, max_side: int) -> Optional[bytes]:
+    """Downscale an image that is larger than needed, as a JPEG.
+
+    Only the image header is read for images that already fit; JPEGs are
+    decoded at a reduced scale when they are shrunk.
+
+    Args:
+        image_data: The image file's content
+        max_side: Length in pixels the image's longest side is fitted within
+
+    Returns:
+        The image fitted within max_side and saved as JPEG, or None if it
+        already fits or Pillow cannot read it
+    """
+    try:
+        with Image.open(io.BytesIO(image_data)) as img:
+            if max(img.size) <= max_side:
+                return None
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            _to_rgb(img).save(buffer, "JPEG", quality=85)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not shrink image: {str(e)}")
+        return None
+    return buffer.getvalue()
+
+
+def _header_dimensions(image_path: Path, suffix: str) -> Optional[Tuple[int, int]]:
+    """Read a PNG's or JPEG's dimensions from its header.
+
+    Only the PNG IHDR chunk, or the JPEG segments up to the start-of-frame
+    marker, are read, instead of Pillow parsing the whole header.
+
+    Args:
+        image_path: Path to the image
+        suffix: The image's lowercased suffix
+
+    Returns:
+        The (width, height), or None if the header could not be read
+    """
+    try:
+        with open(image_path, "rb") as f:
+            if suffix == ".png":
+                header = f.read(24)
+                if len(header) < 24 or not header.startswith(_PNG_HEADER):
+                    return None
+                width, height = struct.unpack(">II", header[16:24])
+                return (width, height)
+            if suffix not in (".jpg", ".jpeg") or f.read(2) != b"\xff\xd8":
+                return None
+            while True:
+                byte = f.read(1)
+                if byte != b"\xff":
+                    return None
+                marker = f.read(1)
+                while marker == b"\xff":  # Fill bytes
+                    marker = f.read(1)
+                if not marker:
+                    return None
+                if marker[0] in _JPEG_STANDALONE_MARKERS:
+                    continue
+                segment = f.read(2)
+                if len(segment) < 2:
+                    return None
+                (length,) = struct.unpack(">H", segment)
+                if length < 2:
+                    return None
+                if marker[0] in _JPEG_SOF_MARKERS:
+                    frame = f.read(5)
+                    if len(frame) < 5:
+                        return None
+                    _, height, width = struct.unpack(">BHH", frame)
+                    # A zero height is defined later in the scan (DNL marker)
+                    return (width, height) if width and height else None
+                f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+
+
+def _svg_root_attributes(svg_content: str) -> Dict[str, str]:
+    """Read the attributes of an SVG document's root element.
+
+    The document is fed to the parser a chunk at a time and parsing stops at
+    the first start tag.
+
+    Args:
+        svg_content: The SVG document
+
+    Returns:
+        The root element's attributes, or an empty dict if it is not <svg>
+
+    Raises:
+        xml.etree.ElementTree.ParseError: If the document is not XML
+    """
+    parser = ET.XMLPullParser(events=("start",))
+    for start in range(0, len(svg_content), _SVG_PARSE_CHUNK):
+        parser.feed(svg_content[start : start + _SVG_PARSE_CHUNK])
+        for _, element in parser.read_events():
+            if element.tag.rpartition("}")[2] != "svg":
+                return {}
+            return dict(element.attrib)
+    return {}
+
+
+def _up_to_date_stat(
+    temp_path: Path, image_stat: os.stat_result
+) -> Optional[os.stat_result]:
+    """Stat an image's processed copy if it is at least as new as the image.
+
+    Args:
+        temp_path: Path of the processed copy
+        image_stat: The image's stat result
+
+    Returns:
+        The copy's stat result, or None if it is missing or out of date
+    """
+    try:
+        temp_stat = temp_path.stat()
+    except FileNotFoundError:
+        return None
+    return temp_stat if temp_stat.st_mtime_ns >= image_stat.st_mtime_ns else None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_pyvips() -> Any:
+    """Import pyvips, if it and libvips are installed, once.
+
+    Returns:
+        The pyvips module, or None if it cannot be loaded
+    """
+    try:
+        import pyvips  # Optional dependency: pyvips
+    except (ImportError, OSError):  # OSError: libvips itself is missing
+        return None
+    return pyvips
+
+
+@functools.lru_cache(maxsize=1)
 def _get_heic_converter() -> Tuple[List[str], str]:
-    """Get the appropriate HEIC converter command for the current platform."""
+    """Get the appropriate HEIC converter command for the current platform.
+
+    Converters are looked up on PATH rather than run, and only once per
+    process rather than once per image or per ImageProcessor.
+    """
     system = platform.system().lower()
 
     # Try ImageMagick first as it's available on all platforms
-    try:
-        subprocess.run(["magick", "--version"], capture_output=True, check=True)
+    if shutil.which("magick"):
         return ["magick", "convert"], "imagemagick"
-    except (subprocess.SubprocessError, FileNotFoundError):
-        pass
 
     if system == "darwin":
         # macOS: Use built-in sips
         return ["sips", "-s", "format", "jpeg"], "sips"
     elif system == "linux":
         # Linux: Try heif-convert from libheif-tools
-        try:
-            subprocess.run(
-                ["heif-convert", "--version"], capture_output=True, check=True
-            )
+        if shutil.which("heif-convert"):
             return ["heif-convert"], "libheif"
-        except (subprocess.SubprocessError, FileNotFoundError):
-            pass
 
     raise ImageProcessingError(
         "No HEIC converter found. Please install ImageMagick or platform-specific tools."
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _get_svg_converter() -> str:
+    """Get the SVG to PNG converter found on PATH, looked up once."""
+    # Try rsvg-convert first, then inkscape as fallback
+    for converter in ("rsvg-convert", "inkscape"):
+        if shutil.which(converter):
+            return converter
+
+    raise ImageProcessingError(
+        "SVG converter not found. Please install librsvg (rsvg-convert) or inkscape."
+    )
+
+
 class ImageProcessor:
     """Handle image format conversions and metadata extraction."""
 
@@ -59,180 +327,403 @@ class ImageProcessor:
     def __init__(self, cm_dir: Path):
         self.cm_dir = cm_dir
         self.temp_dir = cm_dir / "temp"
+        # Created here, and again only when first needed after cleanup(), rather
+        # than before each image is written into it
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._temp_dir_exists = True
+        # Suffix -> converter for the formats that are not used in place, so
+        # picking a converter is a single dict lookup
+        self._handlers: Dict[
+            str, Callable[[Path, Path, os.stat_result], Tuple[Path, Dict]]
+        ] = {
+            ".svg": self._convert_svg,
+            ".heic": self._convert_heic,
+            ".webp": self._convert_to_jpeg,
+        }
+        # Results of prepare_images(), used by process_image()
+        self._prepared: Dict[Path, Union[Tuple[Path, Dict], Exception]] = {}
+        # Metadata extracted during this run, by path, mtime_ns and size
+        self._meta_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
 
     def _convert_svg_to_png(self, svg_path: Path, png_path: Path) -> None:
-        """Convert SVG to PNG for GPT analysis."""
+        """Convert SVG to PNG for GPT analysis.
+
+        libvips renders the SVG in-process when pyvips is installed; otherwise,
+        or if libvips was built without SVG support, rsvg-convert or Inkscape
+        is run.
+        """
+        pyvips = _get_pyvips()
+        if pyvips is not None:
+            try:
+                pyvips.Image.new_from_file(str(svg_path)).write_to_file(str(png_path))
+                return
+            except pyvips.Error as e:
+                logger.debug(f"libvips could not render {svg_path.name}: {str(e)}")
+
+        if _get_svg_converter() == "rsvg-convert":
+            cmd = ["rsvg-convert", "-f", "png", str(svg_path), "-o", str(png_path)]
+        else:
+            cmd = [
+                "inkscape",
+                "--export-type=png",
+                "--export-filename=" + str(png_path),
+                str(svg_path),
+            ]
+
         try:
-            # Try rsvg-convert first
             subprocess.run(
-                ["rsvg-convert", "--version"], capture_output=True, check=True
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
             )
-            cmd = ["rsvg-convert", "-f", "png", str(svg_path), "-o", str(png_path)]
-        except (subprocess.SubprocessError, FileNotFoundError):
+        except subprocess.CalledProcessError as e:
+            raise ImageProcessingError(f"SVG conversion failed: {e.stderr}")
+
+    def prepare_images(self, image_paths: Iterable[Path], force: bool = False) -> None:
+        """Convert a batch of images ahead of process_image().
+
+        HEIC images are converted by ImageMagick in a few runs instead of one
+        per image, and the images that need converting are then processed in
+        parallel threads: the work is done by converter subprocesses and by
+        Pillow, which release the GIL. process_image() returns each prepared
+        result instead of processing the image itself.
+
+        Args:
+            image_paths: Paths of the images that are about to be processed
+            force: Whether to convert images whose converted copy is up to date
+        """
+        images: List[Path] = []
+        # Images whose converted copies would have the same path are left to
+        # process_image(), one after another, rather than written concurrently
+        temp_paths: Set[Path] = set()
+        for path in dict.fromkeys(image_paths):
+            suffix = path.suffix.lower()
+            if suffix not in self._handlers or not path.exists():
+                continue
+            temp_path = self._temp_path(path, suffix)
+            if temp_path not in temp_paths:
+                temp_paths.add(temp_path)
+                images.append(path)
+        if len(images) < 2:
+            return  # Nothing to gain over converting in process_image()
+        converted = self._convert_heic_batch(images, force)
+        for image_path, prepared in zip(
+            images,
+            self.process_images(
+                images, [force and path not in converted for path in images]
+            ),
+        ):
+            self._prepared[image_path] = prepared
+
+    def _temp_path(self, image_path: Path, suffix: str) -> Path:
+        """Get the path of an image's converted copy in the temp directory.
+
+        HEIC and WebP images are stored converted to JPEG.
+
+        Args:
+            image_path: Path to the image file
+            suffix: The image's lowercased file extension
+
+        Returns:
+            Path of the converted copy
+        """
+        temp_path = self.temp_dir / image_path.name
+        if suffix in _JPEG_CONVERTED_FORMATS:
+            temp_path = temp_path.with_suffix(".jpg")
+        return temp_path
+
+    def process_images(
+        self,
+        image_paths: List[Path],
+        force: Union[bool, List[bool]] = False,
+        max_workers: Optional[int] = None,
+    ) -> List[Union[Tuple[Path, Dict], Exception]]:
+        """Process several images concurrently with process_image().
+
+        Args:
+            image_paths: Paths to the image files
+            force: Whether to force processing, for all images or for each one
+            max_workers: Maximum number of worker threads (default: twice the
+                CPU count, up to _MAX_IMAGE_WORKERS)
+
+        Returns:
+            Each image's temporary path and metadata, or the exception raised
+            while processing it, in the order of image_paths
+        """
+        forces = force if isinstance(force, list) else [force] * len(image_paths)
+
+        def process(
+            image_path: Path, image_force: bool
+        ) -> Union[Tuple[Path, Dict], Exception]:
+            try:
+                return self.process_image(image_path, image_force)
+            except Exception as e:
+                return e
+
+        workers = min(
+            max_workers or min(_MAX_IMAGE_WORKERS, 2 * (os.cpu_count() or 1)),
+            len(image_paths),
+        )
+        if workers <= 1:
+            return [process(path, f) for path, f in zip(image_paths, forces)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(process, image_paths, forces))
+
+    def _convert_heic_batch(self, image_paths: List[Path], force: bool) -> Set[Path]:
+        """Convert HEIC images to JPEG copies in a few ImageMagick runs.
+
+        The other converters take one image per run, so with them, or with
+        pillow-heif converting in-process, nothing is done here.
+
+        Args:
+            image_paths: Paths of the images to convert; others are ignored
+            force: Whether to convert images whose converted copy is up to date
+
+        Returns:
+            The images that were converted
+        """
+        pending: Dict[Path, Path] = {}
+        for image_path in image_paths:
+            if image_path.suffix.lower() != ".heic":
+                continue
+            temp_path = self._temp_path(image_path, ".heic")
+            # Same-named images would be written to the same copy
+            if temp_path not in pending and (
+                force or _up_to_date_stat(temp_path, image_path.stat()) is None
+            ):
+                pending[temp_path] = image_path
+        if len(pending) < 2 or heif_supported():
+            return set()
+        try:
+            converter_cmd, converter_type = _get_heic_converter()
+        except ImageProcessingError:
+            return set()
+        if converter_type != "imagemagick":
+            return set()
+
+        self._ensure_temp_dir()
+        batch = list(pending.values())
+        converted: Set[Path] = set()
+        for start in range(0, len(batch), _HEIC_BATCH_SIZE):
+            group = batch[start : start + _HEIC_BATCH_SIZE]
+            cmd = [
+                converter_cmd[0],
+                "mogrify",
+                "-format",
+                "jpg",
+                "-path",
+                str(self.temp_dir),
+                *map(str, group),
+            ]
             try:
-                # Try inkscape as fallback
                 subprocess.run(
-                    ["inkscape", "--version"], capture_output=True, check=True
-                )
-                cmd = [
-                    "inkscape",
-                    "--export-type=png",
-                    "--export-filename=" + str(png_path),
-                    str(svg_path),
-                ]
-            except (subprocess.SubprocessError, FileNotFoundError):
-                raise ImageProcessingError(
-                    "SVG converter not found. Please install librsvg (rsvg-convert) or inkscape."
+                    cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
                 )
-
-        try:
-            subprocess.run(cmd, check=True, capture_output=True)
-        except subprocess.CalledProcessError as e:
-            raise ImageProcessingError(f"SVG conversion failed: {e.stderr.decode()}")
+                converted.update(group)
+            except (subprocess.SubprocessError, OSError) as e:
+                # process_image() converts the images one at a time instead
+                logger.warning(f"Batch HEIC conversion failed: {str(e)}")
+        return converted
 
     def process_image(self, image_path: Path, force: bool = False) -> Tuple[Path, Dict]:
-        """Process an image file and return its temporary path and metadata."""
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
+        """Process an image file and return its temporary path and metadata.
 
-        # Create temp path preserving directory structure
-        temp_path = self.temp_dir / image_path.name
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        JPEG and PNG images need no conversion and are never modified, so their
+        own path is returned instead of a copy's.
+        """
+        prepared = self._prepared.pop(image_path, None)
+        if isinstance(prepared, Exception):
+            raise prepared
+        if prepared is not None:
+            return prepared
 
-        # Check if we need to process
-        if not force and temp_path.exists():
-            if temp_path.stat().st_mtime >= image_path.stat().st_mtime:
-                return temp_path, self._extract_metadata(temp_path)
+        try:
+            image_stat = image_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Image not found: {image_path}") from None
 
-        # Process based on file type
         suffix = image_path.suffix.lower()
-        if suffix not in self.SUPPORTED_FORMATS:
+        if suffix in _IN_PLACE_FORMATS:
+            try:
+                return image_path, self._extract_metadata(
+                    image_path, image_stat, suffix
+                )
+            except Exception as e:
+                raise ImageProcessingError(f"Image processing failed: {str(e)}")
+
+        self._ensure_temp_dir()
+        temp_path = self._temp_path(image_path, suffix)
+
+        # Check if we need to process
+        if not force:
+            temp_stat = _up_to_date_stat(temp_path, image_stat)
+            if temp_stat is not None:
+                return temp_path, self._extract_metadata(temp_path, temp_stat)
+
+        # Convert the image with the handler for its format
+        handler = self._handlers.get(suffix)
+        if handler is None:
             raise ImageProcessingError(f"Unsupported image format: {suffix}")
 
         try:
-            # Handle SVG files - convert to PNG for GPT analysis
-            if suffix == ".svg":
-                with open(image_path, "r", encoding="utf-8") as f:
-                    svg_content = f.read()
-
-                # Extract dimensions from SVG content
-                dimensions = self._extract_svg_dimensions(svg_content)
-
-                # Convert SVG to PNG for GPT analysis
-                png_path = temp_path.with_suffix(".png")
-                self._convert_svg_to_png(image_path, png_path)
-
-                # Create metadata with both SVG content and PNG path
-                metadata = {
-                    "size_bytes": image_path.stat().st_size,
-                    "dimensions": dimensions,
-                    "inlined_content": svg_content,
-                    "png_path": png_path,
-                    "is_image": True,
-                }
-
-                # Copy original SVG for reference
-                shutil.copy2(image_path, temp_path)
-                return temp_path, metadata
-
-            # Handle HEIC files - convert to JPEG
-            if suffix == ".heic":
-                converter_cmd, converter_type = _get_heic_converter()
-                temp_path = temp_path.with_suffix(".jpg")
-
-                if converter_type == "sips":
-                    # sips requires output path without extension
-                    output_path = temp_path.with_suffix("")
-                    cmd = [*converter_cmd, str(image_path), "-o", str(output_path)]
-                elif converter_type == "libheif":
-                    cmd = [*converter_cmd, str(image_path), str(temp_path)]
-                else:  # imagemagick
-                    cmd = [*converter_cmd, str(image_path), str(temp_path)]
+            return handler(image_path, temp_path, image_stat)
+        except Exception as e:
+            if temp_path.exists():
+                temp_path.unlink()
+            raise ImageProcessingError(f"Image processing failed: {str(e)}")
 
-                try:
-                    subprocess.run(cmd, check=True, capture_output=True)
-                except subprocess.CalledProcessError as e:
-                    raise ImageProcessingError(
-                        f"HEIC conversion failed: {e.stderr.decode()}"
-                    )
-
-            # Handle WebP files - convert to JPEG using Pillow
-            elif suffix == ".webp":
-                temp_path = temp_path.with_suffix(".jpg")
-                try:
-                    with Image.open(image_path) as img:
-                        # Convert to RGB mode if necessary (in case of RGBA WebP)
-                        if img.mode in ("RGBA", "LA"):
-                            background = Image.new("RGB", img.size, (255, 255, 255))
-                            background.paste(img, mask=img.split()[-1])
-                            img = background
-                        img.save(temp_path, "JPEG", quality=95)
-                except Exception as e:
-                    raise ImageProcessingError(f"WebP conversion failed: {str(e)}")
+    def _convert_svg(
+        self, image_path: Path, temp_path: Path, image_stat: os.stat_result
+    ) -> Tuple[Path, Dict]:
+        """Render an SVG to PNG for GPT analysis and keep a copy of the SVG."""
+        svg_content = read_text_file(image_path)
+
+        # Extract dimensions from SVG content
+        dimensions = self._extract_svg_dimensions(svg_content)
+
+        # Convert SVG to PNG for GPT analysis
+        png_path = temp_path.with_suffix(".png")
+        self._convert_svg_to_png(image_path, png_path)
+
+        # Create metadata with both SVG content and PNG path
+        metadata = {
+            "size_bytes": image_stat.st_size,
+            "dimensions": dimensions,
+            "inlined_content": svg_content,
+            "png_path": png_path,
+            "is_image": True,
+        }
+
+        # Copy original SVG for reference
+        link_or_copy(image_path, temp_path)
+        return temp_path, metadata
+
+    def _convert_heic(
+        self, image_path: Path, temp_path: Path, image_stat: os.stat_result
+    ) -> Tuple[Path, Dict]:
+        """Convert a HEIC image to JPEG with an external tool.
+
+        Pillow converts it in-process instead when pillow-heif is installed.
+        """
+        if heif_supported():
+            return self._convert_to_jpeg(image_path, temp_path, image_stat)
 
-            # Handle other image formats - copy with metadata
-            else:
-                shutil.copy2(image_path, temp_path)
+        converter_cmd, converter_type = _get_heic_converter()
 
-            return temp_path, self._extract_metadata(temp_path)
+        if converter_type == "sips":
+            # sips requires output path without extension
+            output_path = temp_path.with_suffix("")
+            cmd = [*converter_cmd, str(image_path), "-o", str(output_path)]
+        elif converter_type == "libheif":
+            cmd = [*converter_cmd, str(image_path), str(temp_path)]
+        else:  # imagemagick
+            cmd = [*converter_cmd, str(image_path), str(temp_path)]
 
+        try:
+            subprocess.run(
+                cmd,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise ImageProcessingError(f"HEIC conversion failed: {e.stderr}")
+        return temp_path, self._extract_metadata(temp_path)
+
+    def _convert_to_jpeg(
+        self, image_path: Path, temp_path: Path, image_stat: os.stat_result
+    ) -> Tuple[Path, Dict]:
+        """Convert a WebP (or, with pillow-heif, HEIC) image to JPEG with Pillow."""
+        try:
+            save_as_jpeg(image_path, temp_path)
         except Exception as e:
-            if temp_path.exists():
-                temp_path.unlink()
-            raise ImageProcessingError(f"Image processing failed: {str(e)}")
+            label = "WebP" if image_path.suffix.lower() == ".webp" else "HEIC"
+            raise ImageProcessingError(f"{label} conversion failed: {str(e)}")
+        return temp_path, self._extract_metadata(temp_path)
 
     def _extract_svg_dimensions(self, svg_content: str) -> Tuple[int, int]:
-        """Extract width and height from SVG content."""
+        """Extract width and height from SVG content.
+
+        Only the root element's start tag is parsed, however large the rest of
+        the document (such as embedded raster images) is.
+        """
         try:
-            import re
-
-            # Try to find width and height in SVG tag
-            width = height = None
-            svg_tag = re.search(r"<svg[^>]*>", svg_content)
-            if svg_tag:
-                tag = svg_tag.group(0)
-                # Try explicit width/height attributes
-                width_match = re.search(r'width="([0-9.]+)(?:px)?"', tag)
-                height_match = re.search(r'height="([0-9.]+)(?:px)?"', tag)
-                if width_match and height_match:
-                    width = int(float(width_match.group(1)))
-                    height = int(float(height_match.group(1)))
-                else:
-                    # Try viewBox attribute
-                    viewbox_match = re.search(
-                        r'viewBox="[0-9.]+ [0-9.]+ ([0-9.]+) ([0-9.]+)"', tag
-                    )
-                    if viewbox_match:
-                        width = int(float(viewbox_match.group(1)))
-                        height = int(float(viewbox_match.group(2)))
-            return (width or 0, height or 0)
+            attributes = _svg_root_attributes(svg_content)
+            width_match = _RE_SVG_LENGTH.fullmatch(attributes.get("width", ""))
+            height_match = _RE_SVG_LENGTH.fullmatch(attributes.get("height", ""))
+            if width_match and height_match:
+                return (
+                    int(float(width_match.group(1))),
+                    int(float(height_match.group(1))),
+                )
+            viewbox = _RE_SVG_VIEWBOX_SEP.split(attributes.get("viewBox", "").strip())
+            if len(viewbox) == 4:
+                return (int(float(viewbox[2])), int(float(viewbox[3])))
+            return (0, 0)
         except Exception as e:
             logger.warning(f"Failed to extract SVG dimensions: {str(e)}")
             return (0, 0)
 
-    def _extract_metadata(self, image_path: Path) -> Dict:
-        """Extract metadata from an image file."""
+    def _extract_metadata(
+        self,
+        image_path: Path,
+        stat: Optional[os.stat_result] = None,
+        suffix: Optional[str] = None,
+    ) -> Dict:
+        """Extract metadata from an image file.
+
+        The result is kept for the rest of the run, so an image that is looked
+        at again while its size and mtime_ns are unchanged is not reopened.
+
+        Args:
+            image_path: Path to the image file
+            stat: The image's stat result, if the caller already has it
+            suffix: The image's lowercased suffix, if the caller already has it
+        """
+        if stat is None:
+            stat = image_path.stat()
+        key = (str(image_path), stat.st_mtime_ns, stat.st_size)
+        cached = self._meta_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        if suffix is None:
+            suffix = image_path.suffix.lower()
         metadata: Dict[str, Any] = {
-            "size_bytes": image_path.stat().st_size,
+            "size_bytes": stat.st_size,
             "dimensions": None,
         }
 
         # For SVG files, don't try to get dimensions with PIL
-        if image_path.suffix.lower() == ".svg":
-            return metadata
+        if suffix != ".svg":
+            # PNG and JPEG sizes are read from their headers; Pillow handles the
+            # rest, and headers that could not be read
+            dimensions = _header_dimensions(image_path, suffix)
+            if dimensions is None:
+                try:
+                    with Image.open(image_path) as img:
+                        width, height = img.size
+                    dimensions = (int(width), int(height))
+                except Exception as e:
+                    logger.warning(f"Failed to extract image dimensions: {str(e)}")
+            metadata["dimensions"] = dimensions
 
-        try:
-            with Image.open(image_path) as img:
-                metadata["dimensions"] = tuple(
-                    int(x) for x in img.size
-                )  # Convert to tuple of ints
-        except Exception as e:
-            logger.warning(f"Failed to extract image dimensions: {str(e)}")
+        self._meta_cache[key] = metadata
+        return dict(metadata)
 
-        return metadata
+    def _ensure_temp_dir(self) -> None:
+        """Create the temp directory again if cleanup() removed it."""
+        if not self._temp_dir_exists:
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
+            self._temp_dir_exists = True
 
     def cleanup(self) -> None:
         """Clean up temporary files."""
-        if self.temp_dir.exists():
+        self._temp_dir_exists = False
+        try:
             shutil.rmtree(self.temp_dir)
+        except FileNotFoundError:
+            pass  # Already removed, e.g. by AttachmentProcessor.cleanup()
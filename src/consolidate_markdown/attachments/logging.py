@@ -32,6 +32,11 @@ def log_file_search(file_id: str, search_dir: Path, matches: list[Path]) -> None
         search_dir: The directory being searched
         matches: The list of matching files found
     """
+    # Skip building the messages, and the exists() check, when they would
+    # be discarded
+    if not attachment_logger.isEnabledFor(logging.DEBUG):
+        return
+
     attachment_logger.debug(f"Searching for file ID: {file_id} in {search_dir}")
     attachment_logger.debug(f"Directory exists: {search_dir.exists()}")
 
@@ -50,8 +55,9 @@ def log_file_processing(file_path: Path, file_type: str, exists: bool = True) ->
         file_type: The type of file (e.g., 'image', 'audio', 'document')
         exists: Whether the file exists
     """
-    attachment_logger.debug(f"Processing {file_type} file: {file_path}")
-    attachment_logger.debug(f"File exists: {exists}")
+    if attachment_logger.isEnabledFor(logging.DEBUG):
+        attachment_logger.debug(f"Processing {file_type} file: {file_path}")
+        attachment_logger.debug(f"File exists: {exists}")
 
     if not exists:
         attachment_logger.warning(
@@ -80,6 +86,9 @@ def log_dalle_processing(file_id: str, dalle_dir: Path, matches: list[Path]) ->
         dalle_dir: The DALL-E directory being searched
         matches: The list of matching files found
     """
+    if not attachment_logger.isEnabledFor(logging.DEBUG):
+        return
+
     attachment_logger.debug(f"Processing DALL-E image with ID: {file_id}")
     attachment_logger.debug(f"DALL-E directory: {dalle_dir}")
     attachment_logger.debug(f"DALL-E directory exists: {dalle_dir.exists()}")
@@ -101,10 +110,13 @@ def log_wav_processing(
         success: Whether processing was successful
         error_msg: Optional error message if processing failed
     """
-    attachment_logger.debug(f"Processing WAV file: {file_path}")
+    debug_enabled = attachment_logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        attachment_logger.debug(f"Processing WAV file: {file_path}")
 
     if success:
-        attachment_logger.debug(f"Successfully processed WAV file: {file_path}")
+        if debug_enabled:
+            attachment_logger.debug(f"Successfully processed WAV file: {file_path}")
     else:
         attachment_logger.error(
             f"Failed to process WAV file {file_path}: {error_msg}", exc_info=True
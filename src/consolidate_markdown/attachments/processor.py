@@ -3,23 +3,33 @@ import mimetypes
 import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Iterable, Optional, Tuple
 
-from ..processors.result import ProcessingResult
-from .document import MarkItDown
+from ..cache import CacheManager
+from ..utils import link_or_copy
+from .document import ConversionError, MarkItDown
 from .image import ImageProcessor
 from .logging import attachment_logger, log_media_processing_error
 
+if TYPE_CHECKING:
+    from ..processors.result import ProcessingResult
+
 logger = logging.getLogger(__name__)
 
+# Media formats that are not handed to MarkItDown for conversion
+_UNCONVERTIBLE_EXTENSIONS = frozenset({".mov", ".3gp", ".qtvr"})
+
 
-@dataclass
+@dataclass(slots=True)
 class AttachmentMetadata:
     """Metadata for an attachment.
 
     This class stores metadata about an attachment file, including its path, size,
     type, dimensions (for images), and content (for documents). This metadata is used
     to generate comment-based representations of attachments in markdown files.
+
+    Instances use ``__slots__`` rather than a per-instance ``__dict__``, as one is
+    created for every attachment processed.
     """
 
     path: Path
@@ -33,6 +43,8 @@ class AttachmentMetadata:
     modified_time: Optional[float] = None
     file_hash: Optional[str] = None
     error: Optional[str] = None
+    png_path: Optional[str] = None  # PNG rendering of an SVG, used for GPT analysis
+    inlined_content: Optional[str] = None  # Raw SVG markup
 
 
 class AttachmentProcessor:
@@ -43,25 +55,78 @@ class AttachmentProcessor:
     temporary files.
     """
 
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, cache_manager: Optional[CacheManager] = None):
         """Initialize the processor.
 
         Args:
             output_dir: The output directory for processed files
+            cache_manager: Optional cache manager for converted documents
         """
         self.output_dir = output_dir
         self.temp_dir = output_dir / ".cm" / "temp"
+        # Created here, and again only when first needed after cleanup()
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._temp_dir_exists = True
 
         # Initialize processors for specific file types
         self.image_processor = ImageProcessor(self.temp_dir.parent)
-        self.markitdown = MarkItDown(self.temp_dir.parent)
+        self.markitdown = MarkItDown(self.temp_dir.parent, cache_manager)
+
+        # Results of prepare_documents(): path -> (markdown, error message)
+        self._prepared: Dict[Path, Tuple[str, Optional[str]]] = {}
+
+    @staticmethod
+    def _is_convertible_document(file_path: Path) -> bool:
+        """Check whether process_file() would convert a file with MarkItDown."""
+        suffix = file_path.suffix.lower()
+        if suffix in (".svg", ".wav") or suffix in _UNCONVERTIBLE_EXTENSIONS:
+            return False
+        mime_type, _ = mimetypes.guess_type(str(file_path))
+        return not (mime_type and mime_type.startswith("image/"))
+
+    def prepare_documents(self, paths: Iterable[Path], force: bool = False) -> None:
+        """Convert a batch of document attachments ahead of process_file().
+
+        The documents are converted in parallel worker processes; process_file()
+        then uses each prepared result instead of converting the file itself.
+        Images and other files that are not converted are ignored.
+
+        Args:
+            paths: Paths of the attachments that are about to be processed
+            force: Whether to force conversion even if the result is cached
+        """
+        documents = [path for path in paths if self._is_convertible_document(path)]
+        if len(documents) < 2:
+            return  # Nothing to gain over converting in process_file()
+        for path, markdown, error in self.markitdown.convert_many(documents, force):
+            self._prepared[path] = (markdown, error)
+
+    def prepare_images(self, paths: Iterable[Path], force: bool = False) -> None:
+        """Convert a batch of image attachments ahead of process_file().
+
+        See ImageProcessor.prepare_images().
+
+        Args:
+            paths: Paths of the images that are about to be processed
+            force: Whether to force conversion even if the result is up to date
+        """
+        self.image_processor.prepare_images(paths, force)
+
+    def _convert_document(self, file_path: Path, force: bool) -> str:
+        """Convert a document, using the result of prepare_documents() if any."""
+        prepared = self._prepared.pop(file_path, None)
+        if prepared is None:
+            return self.markitdown.convert_to_markdown(file_path, force)
+        markdown, error = prepared
+        if error is not None:
+            raise ConversionError(error)
+        return markdown
 
     def process_file(
         self,
         file_path: Path,
         force: bool = False,
-        result: Optional[ProcessingResult] = None,
+        result: Optional["ProcessingResult"] = None,
     ) -> Tuple[Path, AttachmentMetadata]:
         """Process a file and return its temporary path and metadata.
 
@@ -94,8 +159,9 @@ class AttachmentProcessor:
         mime_type, _ = mimetypes.guess_type(str(file_path))
         size_bytes = file_path.stat().st_size
         is_image = bool(mime_type and mime_type.startswith("image/"))
-        is_svg = file_path.suffix.lower() == ".svg"
-        is_wav = file_path.suffix.lower() == ".wav"
+        suffix = file_path.suffix.lower()
+        is_svg = suffix == ".svg"
+        is_wav = suffix == ".wav"
 
         # SVGs are always treated as images
         if is_svg:
@@ -121,8 +187,10 @@ class AttachmentProcessor:
         )
 
         # Create temporary path
+        if not self._temp_dir_exists:
+            self.temp_dir.mkdir(parents=True, exist_ok=True)
+            self._temp_dir_exists = True
         temp_path = self.temp_dir / file_path.name
-        temp_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Process based on file type
         error_msg_doc = None
@@ -134,9 +202,9 @@ class AttachmentProcessor:
             if is_wav:
                 attachment_logger.debug(f"Processing WAV file: {file_path}")
                 # Special handling for WAV files
-                shutil.copy2(file_path, temp_path)
+                link_or_copy(file_path, temp_path)
                 metadata.markdown_content = f"[Audio file: {file_path.name}]"
-                attachment_logger.debug(f"WAV file copied to: {temp_path}")
+                attachment_logger.debug(f"WAV file linked to: {temp_path}")
             elif is_image:
                 # Process image files
                 attachment_logger.debug(f"Processing image file: {file_path}")
@@ -148,6 +216,10 @@ class AttachmentProcessor:
                 metadata.dimensions = image_metadata.get("dimensions")
                 if "inlined_content" in image_metadata:
                     metadata.markdown_content = image_metadata["inlined_content"]
+                # An SVG's PNG rendering is described by GPT, instead of GPT
+                # rendering the SVG again
+                if "png_path" in image_metadata:
+                    metadata.png_path = str(image_metadata["png_path"])
 
                 attachment_logger.debug(
                     f"Image processed: dimensions={metadata.dimensions}"
@@ -156,19 +228,16 @@ class AttachmentProcessor:
                 # Process document files
                 attachment_logger.debug(f"Processing document file: {file_path}")
                 temp_path = self.temp_dir / file_path.name
-                temp_path.parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(file_path, temp_path)
+                link_or_copy(file_path, temp_path)
 
                 # Handle PDF files
-                if file_path.suffix.lower() == ".pdf":
+                if suffix == ".pdf":
                     try:
                         # PDF handling is now done in the MarkItDown class using PyMuPDF
                         attachment_logger.debug(
                             f"Converting PDF to markdown: {file_path}"
                         )
-                        markdown_content = self.markitdown.convert_to_markdown(
-                            file_path, force
-                        )
+                        markdown_content = self._convert_document(file_path, force)
                         if not markdown_content:
                             error_msg_doc = "PDF conversion produced no content"
                             attachment_logger.error(error_msg_doc)
@@ -183,13 +252,12 @@ class AttachmentProcessor:
                 else:
                     # Try to convert other document types to markdown
                     try:
-                        unsupported_extensions = [".mov", ".3gp", ".qtvr"]
-                        if file_path.suffix.lower() not in unsupported_extensions:
+                        if suffix not in _UNCONVERTIBLE_EXTENSIONS:
                             attachment_logger.debug(
                                 f"Converting document to markdown: {file_path}"
                             )
-                            metadata.markdown_content = (
-                                self.markitdown.convert_to_markdown(file_path, force)
+                            metadata.markdown_content = self._convert_document(
+                                file_path, force
                             )
                             attachment_logger.debug(
                                 f"Document converted successfully, content length: {len(metadata.markdown_content)}"
@@ -215,15 +283,23 @@ class AttachmentProcessor:
                 f"{error_msg} for {file_path.name}, using basic copy"
             )
             temp_path = self.temp_dir / file_path.name
-            temp_path.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(file_path, temp_path)
+            # Copied, not linked: temp/pic.jpg may later be the target of
+            # converting pic.heic or pic.webp, which must not write through a
+            # link into the user's pic.jpg
+            temp_path.unlink(missing_ok=True)
+            shutil.copyfile(file_path, temp_path)
 
         metadata.error = error_msg_doc
         return temp_path, metadata
 
     def cleanup(self) -> None:
         """Clean up temporary files."""
-        if self.temp_dir.exists():
+        # rmtree reports a missing directory itself, which saves the stat() an
+        # exists() check would make before every removal
+        self._temp_dir_exists = False
+        try:
             shutil.rmtree(self.temp_dir)
+        except FileNotFoundError:
+            pass
         self.markitdown.cleanup()
         self.image_processor.cleanup()
@@ -3,18 +3,57 @@
 import hashlib
 import json
 import logging
+import os
+import shutil
+import tempfile
 import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional, cast
 
+try:
+    from blake3 import blake3  # Optional dependency: blake3
+except ImportError:  # pragma: no cover
+    blake3 = None
+
 logger = logging.getLogger(__name__)
 
+# Seconds a failed image conversion is remembered for; converters may have
+# been installed by the time it is retried
+UNSUPPORTED_TTL = 24 * 60 * 60
+
+# The hash GPT analyses are cached under; a cache that was keyed by another
+# hash is migrated during the next run
+GPT_KEY_HASH = "blake3" if blake3 is not None else "blake2b"
+
 
 def quick_hash(content: str) -> str:
     """Fast MD5 hash of content."""
     return hashlib.md5(content.encode()).hexdigest()
 
 
+def bytes_hash(data: bytes) -> str:
+    """128-bit hash of content in memory, the same as file_hash() of its file."""
+    if blake3 is not None:
+        return cast(str, blake3(data, max_threads=blake3.AUTO).hexdigest(length=16))
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_hash(file_path: Path) -> str:
+    """128-bit hash of a file's content, read in chunks rather than all at once.
+
+    BLAKE3 is used when installed, hashing the memory-mapped file on all cores;
+    otherwise the file is hashed with BLAKE2b.
+    """
+    if blake3 is not None:
+        hasher = blake3(max_threads=blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return cast(str, hasher.hexdigest(length=16))
+    with open(file_path, "rb") as f:
+        digest = hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16))
+    return digest.hexdigest()
+
+
 class CacheManager:
     """Manages caching of processed files and GPT analyses."""
 
@@ -23,19 +62,51 @@ class CacheManager:
         self.cache_dir = cm_dir / "cache"
         self.notes_file = self.cache_dir / "notes.json"
         self.gpt_file = self.cache_dir / "gpt.json"
+        self.gpt_keys_file = self.cache_dir / "gpt_keys.json"
+        self.conversions_file = self.cache_dir / "conversions.json"
+        self.conversions_dir = self.cache_dir / "conversions"
+        self.images_file = self.cache_dir / "images.json"
+        self.gpt_similar_file = self.cache_dir / "gpt_similar.json"
+        self.unsupported_file = self.cache_dir / "unsupported.json"
         self.notes_lock = threading.Lock()
         self.gpt_lock = threading.Lock()
+        self.conversions_lock = threading.Lock()
+        self.images_lock = threading.Lock()
+        self.gpt_similar_lock = threading.Lock()
+        self.unsupported_lock = threading.Lock()
+        # The image hash and conversion indexes are read on first use and
+        # written by flush()
+        self._images: Optional[Dict[str, Any]] = None
+        self._images_dirty = False
+        self._conversions: Optional[Dict[str, Any]] = None
+        self._conversions_dirty = False
         self._init_cache()
 
     def _init_cache(self) -> None:
         """Create cache directory and files if they don't exist."""
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.conversions_dir.mkdir(exist_ok=True)
 
         # Initialize empty cache files if they don't exist
         if not self.notes_file.exists():
             self.notes_file.write_text("{}")
         if not self.gpt_file.exists():
             self.gpt_file.write_text("{}")
+            # A new cache holds no analyses under an older key
+            self.gpt_keys_file.write_text(json.dumps({"hash": GPT_KEY_HASH}))
+        if not self.conversions_file.exists():
+            self.conversions_file.write_text("{}")
+        if not self.images_file.exists():
+            self.images_file.write_text("{}")
+        if not self.gpt_similar_file.exists():
+            self.gpt_similar_file.write_text("{}")
+        if not self.unsupported_file.exists():
+            self.unsupported_file.write_text("{}")
+
+        gpt_keys = (
+            self._load_cache(self.gpt_keys_file) if self.gpt_keys_file.exists() else {}
+        )
+        self._gpt_key_migration = gpt_keys.get("hash") != GPT_KEY_HASH
 
     def _load_cache(self, cache_file: Path) -> Dict[str, Any]:
         """Load a cache file, handling errors."""
@@ -52,13 +123,42 @@ class CacheManager:
             return {}
 
     def _save_cache(self, cache_file: Path, data: Dict) -> None:
-        """Save cache data, handling errors."""
+        """Save cache data, handling errors.
+
+        The data is written to a temporary file in the cache directory and then
+        renamed over the cache file, so an interrupted save never leaves a
+        truncated cache behind and readers always see a complete file.
+        """
         try:
-            cache_file.write_text(json.dumps(data, indent=2))
+            self._write_atomic(cache_file, json.dumps(data, indent=2))
             logger.debug(f"Saved cache to {cache_file.name} ({len(data)} entries)")
         except Exception as e:
             logger.error(f"Failed to save cache {cache_file.name}: {e}")
 
+    @staticmethod
+    def _write_atomic(target: Path, text: str) -> None:
+        """Write text to a temporary file next to target, then rename it over target."""
+        temp_name: Optional[str] = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=target.parent,
+                prefix=f".{target.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                temp_name = f.name
+                f.write(text)
+            os.replace(temp_name, target)
+            temp_name = None
+        finally:
+            if temp_name is not None:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+
     def _normalize_path(self, path: str) -> str:
         """Normalize a path by converting to forward slashes and handling newlines.
 
@@ -134,6 +234,192 @@ class CacheManager:
             cache[image_hash] = analysis
             self._save_cache(self.gpt_file, cache)
 
+    def gpt_key_migration_pending(self) -> bool:
+        """Check whether GPT analyses may still be cached under an older key.
+
+        While this is the case, analyses missing from the cache are also looked
+        up under the keys they had before, and moved to their current key.
+        """
+        return self._gpt_key_migration
+
+    def finish_gpt_key_migration(self) -> None:
+        """Record that GPT analyses are cached under the current key.
+
+        Called at the end of a run that processed every source with images
+        enabled and without errors; older keys are not looked up after that.
+        """
+        with self.gpt_lock:
+            if self._gpt_key_migration:
+                logger.debug(f"GPT analysis cache is now keyed by {GPT_KEY_HASH}")
+                self._save_cache(self.gpt_keys_file, {"hash": GPT_KEY_HASH})
+                self._gpt_key_migration = False
+
+    def get_gpt_semantic_cache(
+        self, perceptual_hash: int, max_distance: int
+    ) -> Optional[str]:
+        """Get the cached analysis of an image that looks like the given one.
+
+        The recorded perceptual hashes are compared in a linear scan, which
+        takes well under a millisecond for tens of thousands of images.
+
+        Args:
+            perceptual_hash: The 64-bit perceptual hash of the image
+            max_distance: The most bits in which a recorded hash may differ
+
+        Returns:
+            The analysis cached for the closest matching image, if any
+        """
+        with self.gpt_similar_lock:
+            cache = self._load_cache(self.gpt_similar_file)
+        best_hash = None
+        best_distance = max_distance + 1
+        for key, image_hash in cache.items():
+            distance = (int(key, 16) ^ perceptual_hash).bit_count()
+            if distance < best_distance:
+                best_hash, best_distance = image_hash, distance
+        if best_hash is None:
+            return None
+        return self.get_gpt_cache(best_hash)
+
+    def update_gpt_semantic_cache(self, perceptual_hash: int, image_hash: str) -> None:
+        """Record an image's perceptual hash with the key of its analysis."""
+        with self.gpt_similar_lock:
+            cache = self._load_cache(self.gpt_similar_file)
+            cache[f"{perceptual_hash:016x}"] = image_hash
+            self._save_cache(self.gpt_similar_file, cache)
+
+    def _image_hashes(self) -> Dict[str, Any]:
+        """Get the image hash index, loading it on first use (images_lock held)."""
+        if self._images is None:
+            self._images = self._load_cache(self.images_file)
+        return self._images
+
+    def get_image_hash_cache(self, image_path: str) -> Optional[dict]:
+        """Get the content hash an image had when it was last read, if known.
+
+        The entry also holds the image's size and mtime_ns at that time; while
+        they still match, the hash can be used without reading the image.
+        """
+        with self.images_lock:
+            cache = self._image_hashes()
+            return cast(Optional[dict], cache.get(self._normalize_path(image_path)))
+
+    def update_image_hash_cache(
+        self, image_path: str, content_hash: str, size: int, mtime_ns: int
+    ) -> None:
+        """Record an image's content hash along with its size and mtime_ns.
+
+        The entry is kept in memory until flush() is called.
+        """
+        with self.images_lock:
+            cache = self._image_hashes()
+            cache[self._normalize_path(image_path)] = {
+                "hash": content_hash,
+                "size": size,
+                "mtime_ns": mtime_ns,
+            }
+            self._images_dirty = True
+
+    def flush(self) -> None:
+        """Write the entries kept in memory since the last flush to disk."""
+        with self.images_lock:
+            if self._images_dirty and self._images is not None:
+                self._save_cache(self.images_file, self._images)
+                self._images_dirty = False
+        with self.conversions_lock:
+            if self._conversions_dirty and self._conversions is not None:
+                self._save_cache(self.conversions_file, self._conversions)
+                self._conversions_dirty = False
+
+    def is_unsupported(self, image_path: str, size: int, mtime_ns: int) -> bool:
+        """Check whether converting an image failed recently.
+
+        A failure is only remembered for UNSUPPORTED_TTL seconds, and while the
+        image's size and mtime_ns are unchanged.
+        """
+        with self.unsupported_lock:
+            cache = self._load_cache(self.unsupported_file)
+        entry = cache.get(self._normalize_path(image_path))
+        return (
+            entry is not None
+            and entry.get("size") == size
+            and entry.get("mtime_ns") == mtime_ns
+            and time.time() - entry.get("timestamp", 0) < UNSUPPORTED_TTL
+        )
+
+    def mark_unsupported(self, image_path: str, size: int, mtime_ns: int) -> None:
+        """Record that an image with this size and mtime_ns could not be converted."""
+        with self.unsupported_lock:
+            cache = self._load_cache(self.unsupported_file)
+            cache[self._normalize_path(image_path)] = {
+                "size": size,
+                "mtime_ns": mtime_ns,
+                "timestamp": time.time(),
+            }
+            self._save_cache(self.unsupported_file, cache)
+
+    def _conversion_index(self) -> Dict[str, Any]:
+        """Get the conversion index, loading it on first use (conversions_lock held)."""
+        if self._conversions is None:
+            self._conversions = self._load_cache(self.conversions_file)
+        return self._conversions
+
+    def get_conversion_cache(self, file_path: str) -> Optional[dict]:
+        """Get cached document conversion info if it exists.
+
+        The entry's markdown is read from its own file, so the index that is
+        kept in memory only holds fingerprints however many documents are
+        cached.
+        """
+        with self.conversions_lock:
+            cache = self._conversion_index()
+            normalized_path = self._normalize_path(file_path)
+            result = cache.get(normalized_path)
+            if result is not None and "markdown" not in result:
+                try:
+                    markdown_file = self.conversions_dir / f"{result['hash']}.md"
+                    markdown = markdown_file.read_text(encoding="utf-8")
+                    result = {**result, "markdown": markdown}
+                except (KeyError, OSError):
+                    result = None
+            if result is None:
+                logger.debug(f"Cache miss for conversion: {normalized_path}")
+            else:
+                logger.debug(f"Cache hit for conversion: {normalized_path}")
+            return result
+
+    def update_conversion_cache(
+        self,
+        file_path: str,
+        content_hash: str,
+        size: int,
+        mtime: float,
+        markdown: str,
+    ) -> None:
+        """Cache the markdown converted from a document along with its fingerprint.
+
+        The markdown is stored in a file named by the document's content hash,
+        so identical documents share it, and only the fingerprint is added to
+        the index, which is kept in memory until flush() is called.
+        """
+        with self.conversions_lock:
+            normalized_path = self._normalize_path(file_path)
+            logger.debug(f"Updating conversion cache: {normalized_path}")
+            try:
+                self._write_atomic(
+                    self.conversions_dir / f"{content_hash}.md", markdown
+                )
+            except Exception as e:
+                logger.error(f"Failed to cache conversion of {normalized_path}: {e}")
+                return
+            cache = self._conversion_index()
+            cache[normalized_path] = {
+                "hash": content_hash,
+                "size": size,
+                "mtime": mtime,
+            }
+            self._conversions_dirty = True
+
     def clear_cache(self) -> None:
         """Clear all cache files (used by --force)."""
         logger.info("Clearing cache due to --force flag")
@@ -141,3 +427,19 @@ class CacheManager:
             self._save_cache(self.notes_file, {})
         with self.gpt_lock:
             self._save_cache(self.gpt_file, {})
+            self._save_cache(self.gpt_keys_file, {"hash": GPT_KEY_HASH})
+            self._gpt_key_migration = False
+        with self.gpt_similar_lock:
+            self._save_cache(self.gpt_similar_file, {})
+        with self.images_lock:
+            self._save_cache(self.images_file, {})
+            self._images = {}
+            self._images_dirty = False
+        with self.unsupported_lock:
+            self._save_cache(self.unsupported_file, {})
+        with self.conversions_lock:
+            self._save_cache(self.conversions_file, {})
+            self._conversions = {}
+            self._conversions_dirty = False
+            shutil.rmtree(self.conversions_dir, ignore_errors=True)
+            self.conversions_dir.mkdir(exist_ok=True)
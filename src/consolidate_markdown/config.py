@@ -105,6 +105,7 @@ class GlobalConfig:
     openai_base_url: str = DEFAULT_OPENAI_BASE_URL
     openrouter_base_url: str = DEFAULT_OPENROUTER_BASE_URL
     models: ModelsConfig = field(default_factory=ModelsConfig)
+    similar_image_distance: int = 0
 
     def __init__(
         self,
@@ -119,6 +120,7 @@ class GlobalConfig:
         openai_base_url: str = DEFAULT_OPENAI_BASE_URL,
         openrouter_base_url: str = DEFAULT_OPENROUTER_BASE_URL,
         models: Optional[ModelsConfig] = None,
+        similar_image_distance: int = 0,
     ):
         """Initialize global configuration."""
         self.cm_dir = cm_dir
@@ -132,6 +134,7 @@ class GlobalConfig:
         self.openai_base_url = openai_base_url
         self.openrouter_base_url = openrouter_base_url
         self.models = models or ModelsConfig()
+        self.similar_image_distance = similar_image_distance
 
 
 @dataclass
@@ -241,6 +244,9 @@ def load_config(config_path: Path) -> Config:
             ),
         ),
         models=models_config,
+        similar_image_distance=int(
+            data.get("global", {}).get("similar_image_distance", 0)
+        ),
     )
 
     # Create SourceConfigs
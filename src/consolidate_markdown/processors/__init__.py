@@ -1,17 +1,46 @@
 """Source processors package."""
 
-from .base import SourceProcessor
-from .bear import BearProcessor
-from .claude import ClaudeProcessor
-from .result import ProcessingResult
-from .xbookmarks import XBookmarksProcessor
-
-PROCESSOR_TYPES = {
-    "bear": BearProcessor,
-    "xbookmarks": XBookmarksProcessor,
-    "claude": ClaudeProcessor,
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from .base import SourceProcessor
+    from .bear import BearProcessor
+    from .claude import ClaudeProcessor
+    from .result import ProcessingResult
+    from .xbookmarks import XBookmarksProcessor
+
+# Public names imported on first access (PEP 562), so that importing one
+# submodule such as processors.result does not load every processor.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "BearProcessor": ".bear",
+    "ClaudeProcessor": ".claude",
+    "ProcessingResult": ".result",
+    "SourceProcessor": ".base",
+    "XBookmarksProcessor": ".xbookmarks",
 }
 
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported attributes on first access."""
+    value: Any
+    if name == "PROCESSOR_TYPES":
+        # The package-level registry itself, with every processor registered
+        # by import path resolved, so there is a single registry
+        import consolidate_markdown
+
+        for source_type in list(consolidate_markdown._PROCESSOR_PATHS):
+            consolidate_markdown.get_processor(source_type)
+        value = consolidate_markdown.PROCESSOR_TYPES
+    elif name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
 __all__ = [
     "BearProcessor",
     "ClaudeProcessor",
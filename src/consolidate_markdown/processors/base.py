@@ -2,7 +2,7 @@ import logging
 import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Callable, List, Optional, TypeVar
+from typing import Callable, Dict, List, Optional, TypeVar
 
 from rich.progress import Progress, TaskID
 
@@ -49,6 +49,9 @@ class AttachmentHandlerMixin:
     in the markdown for inline display, while still using comment-based metadata.
     """
 
+    # GPT descriptions fetched ahead of formatting by _describe_images()
+    _image_descriptions: Optional[Dict[Path, str]] = None
+
     @property
     @abstractmethod
     def _processor_type(self) -> str:
@@ -59,6 +62,41 @@ class AttachmentHandlerMixin:
         """
         pass
 
+    def _describe_images(
+        self,
+        image_paths: List[Path],
+        config: Config,
+        result: ProcessingResult,
+        cache_manager: Optional[CacheManager] = None,
+    ) -> None:
+        """Fetch GPT descriptions for a batch of images concurrently.
+
+        The descriptions are used by _format_image() when each image is
+        formatted. Images GPT cannot read directly (SVG, HEIC) are left to it.
+
+        Args:
+            image_paths: Paths to the image files
+            config: Configuration
+            result: Processing result
+            cache_manager: Optional cache manager
+        """
+        if config.global_config.no_image:
+            return
+        paths = [
+            path
+            for path in image_paths
+            if path.suffix.lower() in GPTProcessor.SUPPORTED_FORMATS
+        ]
+        if len(paths) < 2:
+            return
+        try:
+            gpt = GPTProcessor(config.global_config, cache_manager)
+            descriptions = gpt.describe_images(paths, result, self._processor_type)
+        except Exception as e:
+            logger.error(f"GPT batch processing failed: {str(e)}")
+            return
+        self._image_descriptions = dict(zip(paths, descriptions))
+
     def _format_image(
         self,
         image_path: Path,
@@ -100,11 +138,18 @@ class AttachmentHandlerMixin:
 
         # Get image description if enabled
         description = ""
-        if not config.global_config.no_image:
+        prepared = (
+            self._image_descriptions.pop(image_path, None)
+            if self._image_descriptions
+            else None
+        )
+        if prepared is not None:
+            description = prepared
+        elif not config.global_config.no_image:
             try:
                 gpt = GPTProcessor(config.global_config, cache_manager)
                 # For SVGs, use the PNG version for GPT analysis
-                if is_svg and hasattr(metadata, "png_path"):
+                if is_svg and metadata.png_path is not None:
                     description = gpt.describe_image(
                         Path(metadata.png_path), result, self._processor_type
                     )
@@ -123,7 +168,7 @@ class AttachmentHandlerMixin:
             description = gpt.get_placeholder(image_path, result, self._processor_type)
 
         # Handle SVG files - embed content directly
-        if is_svg and hasattr(metadata, "inlined_content"):
+        if is_svg and metadata.inlined_content is not None:
             return f"""<!-- ATTACHMENT: SVG: {image_path.name} ({dimensions[0]}x{dimensions[1]}, {size_kb:.0f}KB) -->
 <!-- GPT Description: {description.strip()} -->
 ![{description.strip()}]()"""
@@ -316,7 +361,7 @@ class SourceProcessor(AttachmentHandlerMixin, ABC):
         """Get the attachment processor instance."""
         if self._attachment_processor is None:
             self._attachment_processor = AttachmentProcessor(
-                self.source_config.dest_dir
+                self.source_config.dest_dir, self.cache_manager
             )
         assert self._attachment_processor is not None
         return self._attachment_processor
@@ -381,7 +426,8 @@ class SourceProcessor(AttachmentHandlerMixin, ABC):
 
     def _cleanup_temp_dir(self) -> None:
         """Clean up the temporary directory."""
-        if self._temp_dir and self._temp_dir.exists():
+        if self._temp_dir is not None:
+            # ignore_errors also covers a directory that is already gone
             shutil.rmtree(self._temp_dir, ignore_errors=True)
             self._temp_dir = None
 
@@ -402,7 +448,10 @@ class SourceProcessor(AttachmentHandlerMixin, ABC):
         self._ensure_dest_dir()
 
         # Process the source
-        return self._process_impl(config)
+        try:
+            return self._process_impl(config)
+        finally:
+            self.cache_manager.flush()
 
     @abstractmethod
     def _process_impl(self, config: Config) -> ProcessingResult:
@@ -3,6 +3,7 @@
 # mypy: disable-error-code="no-any-return"
 
 import logging
+import os
 import re
 import urllib.parse
 from pathlib import Path
@@ -18,6 +19,22 @@ from .result import ProcessingResult
 
 logger = logging.getLogger(__name__)
 
+# Markdown image references: ![alt](path)
+_RE_IMAGE = re.compile(r"!\[(.*?)\]\((.*?)\)")
+
+# Documents Bear embeds in a note: [name](path)<!-- {"embed":"true"} -->
+_RE_EMBED = re.compile(r'\[(.*?)\]\((.*?)\)<!-- *{"embed":"true".*?} *-->')
+
+# Embedded documents, in Bear's format or the EMBEDDED PDF comment format
+_RE_EMBEDDED_DOCUMENT = re.compile(
+    r'\[(.*?)\]\((.*?)\)(?:<!-- *(?:{"embed":"true".*?}|EMBEDDED PDF: .*?) *-->)'
+)
+
+# PDF links without an embed comment
+_RE_PDF_LINK = re.compile(
+    r'\[(.*?)\]\((.*?\.pdf)\)(?!<!-- *(?:{"embed":"true".*?}|EMBEDDED PDF: .*?) *-->)'
+)
+
 
 class BearProcessor(SourceProcessor):
     """Process Bear notes and their attachments."""
@@ -38,22 +55,29 @@ class BearProcessor(SourceProcessor):
         image_count = 0
         doc_count = 0
 
+        # List the attachment directory once instead of building and stat'ing a
+        # path for every reference
+        try:
+            with os.scandir(attachment_dir) as entries:
+                attachment_names = {entry.name for entry in entries}
+        except OSError:
+            attachment_names = set()
+        attachment_names.discard(".DS_Store")
+        if not attachment_names:
+            return image_count, doc_count
+
         # Count images
-        image_pattern = r"!\[(.*?)\]\((.*?)\)"
-        for match in re.finditer(image_pattern, content):
+        for match in _RE_IMAGE.finditer(content):
             _, path = match.groups()
             decoded_path = urllib.parse.unquote(path)
-            attachment_path = attachment_dir / Path(decoded_path).name
-            if attachment_path.exists() and attachment_path.name != ".DS_Store":
+            if Path(decoded_path).name in attachment_names:
                 image_count += 1
 
         # Count embedded documents
-        embed_pattern = r'\[(.*?)\]\((.*?)\)<!-- *{"embed":"true".*?} *-->'
-        for match in re.finditer(embed_pattern, content):
+        for match in _RE_EMBED.finditer(content):
             _, path = match.groups()
             decoded_path = urllib.parse.unquote(path)
-            attachment_path = attachment_dir / Path(decoded_path).name
-            if attachment_path.exists() and attachment_path.name != ".DS_Store":
+            if Path(decoded_path).name in attachment_names:
                 doc_count += 1
 
         return image_count, doc_count
@@ -213,6 +237,21 @@ class BearProcessor(SourceProcessor):
         """Process attachments in content."""
         # No longer creating output attachments directory
 
+        # Convert the note's HEIC images in one batch and request the GPT
+        # descriptions of its images concurrently up front
+        image_paths = [
+            path
+            for path in dict.fromkeys(
+                attachment_dir / Path(urllib.parse.unquote(match.group(2))).name
+                for match in _RE_IMAGE.finditer(content)
+            )
+            if path.exists()
+        ]
+        attachment_processor.prepare_images(
+            image_paths, force=config.global_config.force_generation
+        )
+        self._describe_images(image_paths, config, result, self.cache_manager)
+
         def replace_attachment(match: re.Match) -> str:  # type: ignore
             """Replace an attachment reference with processed content."""
             alt_text, path = match.groups()
@@ -262,22 +301,12 @@ class BearProcessor(SourceProcessor):
             return markdown_result
 
         # Replace image references
-        result_content: str = re.sub(
-            r"!\[(.*?)\]\((.*?)\)", replace_attachment, content
-        )
+        result_content: str = _RE_IMAGE.sub(replace_attachment, content)
 
         # First try to replace embedded document references with Bear's format or our PDF format
-        result_content = re.sub(
-            r'\[(.*?)\]\((.*?)\)(?:<!-- *(?:{"embed":"true".*?}|EMBEDDED PDF: .*?) *-->)',
-            replace_attachment,
-            result_content,
-        )
+        result_content = _RE_EMBEDDED_DOCUMENT.sub(replace_attachment, result_content)
 
         # Then replace any remaining PDF links that don't have comments and haven't been replaced
-        result_content = re.sub(
-            r'\[(.*?)\]\((.*?\.pdf)\)(?!<!-- *(?:{"embed":"true".*?}|EMBEDDED PDF: .*?) *-->)',
-            replace_attachment,
-            result_content,
-        )
+        result_content = _RE_PDF_LINK.sub(replace_attachment, result_content)
 
         return result_content
@@ -5,7 +5,6 @@ import json
 import logging
 import re
 import shutil
-import unicodedata
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -20,6 +19,10 @@ from .result import ProcessingResult
 
 logger = logging.getLogger(__name__)
 
+# Runs of characters that are not unicode letters, numbers or dashes. Underscores
+# are included so that existing and new underscores collapse into one.
+_RE_FILENAME_UNSAFE = re.compile(r"(?:_|[^\w-])+")
+
 
 class ClaudeProcessor(SourceProcessor):
     """Process Claude conversation exports into Markdown.
@@ -46,7 +49,7 @@ class ClaudeProcessor(SourceProcessor):
         """Get the attachment processor instance."""
         if self._attachment_processor is None:
             self._attachment_processor = AttachmentProcessor(
-                self.source_config.dest_dir
+                self.source_config.dest_dir, self.cache_manager
             )
         return self._attachment_processor
 
@@ -85,26 +88,10 @@ class ClaudeProcessor(SourceProcessor):
         if not filename:
             filename = "Untitled"
 
-        # Replace problematic characters and handle unicode
-        filename = re.sub(r'[<>:"/\\|?*#]', "_", filename)  # Replace special chars
-        filename = re.sub(r"[/\\]", "_", filename)  # Handle path separators
-        filename = re.sub(r"\s+", "_", filename)  # Replace whitespace with underscore
-
-        # Handle unicode characters - keep alphanumeric and common symbols
-        clean_filename = ""
-        for c in filename:
-            cat = unicodedata.category(c)
-            # Keep letters, numbers, dashes, underscores, and some punctuation
-            if cat.startswith(("L", "N")) or c in "_-":
-                clean_filename += c
-            # Replace other characters with underscore
-            else:
-                clean_filename += "_"
-
-        filename = clean_filename
-
-        # Remove consecutive underscores
-        filename = re.sub(r"_+", "_", filename)
+        # Replace every run of characters other than letters, numbers and dashes
+        # (special chars, path separators, whitespace, punctuation, underscores)
+        # with a single underscore in one pass
+        filename = _RE_FILENAME_UNSAFE.sub("_", filename)
         # Remove leading/trailing underscores
         filename = filename.strip("_")
 
@@ -143,7 +130,9 @@ class ClaudeProcessor(SourceProcessor):
         # Generate a stable identifier for the artifact based on its content
         # We want different content to get different IDs, but same content to get same ID
         # Use the raw content for hashing to preserve all differences
-        logger.debug(f"Raw artifact text: '{artifact_text}'")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"Raw artifact text: '{artifact_text}'")
         logger.debug(f"Message ID: {message_id}")
         logger.debug(f"Conversation ID: {conversation_id}")
 
@@ -158,11 +147,14 @@ class ClaudeProcessor(SourceProcessor):
             "\r", "\n"
         )  # Normalize line endings
         content_bytes = normalized_text.encode("utf-8")
-        logger.debug(f"Normalized text: '{normalized_text}'")
-        logger.debug(f"Content bytes: {content_bytes!r}")
-        content_hash = hashlib.sha256(content_bytes).hexdigest()[:12]
+        full_digest = hashlib.sha256(content_bytes).hexdigest()
+        content_hash = full_digest[:12]
+        if debug:
+            # Formatting whole artifacts is costly, so skip it unless shown
+            logger.debug(f"Normalized text: '{normalized_text}'")
+            logger.debug(f"Content bytes: {content_bytes!r}")
         logger.debug(f"Generated hash: {content_hash}")
-        logger.debug(f"Full hex digest: {hashlib.sha256(content_bytes).hexdigest()}")
+        logger.debug(f"Full hex digest: {full_digest}")
         artifact_id = content_hash
 
         # Track version
@@ -1,16 +1,34 @@
 """Process X bookmarks."""
 
 import logging
+import re
+import urllib.parse
 from pathlib import Path
-from typing import Optional
+from typing import Match, Optional
 
+from ..attachments.document import iter_convertible
 from ..attachments.processor import AttachmentProcessor
 from ..cache import CacheManager, quick_hash
 from ..config import Config, SourceConfig
+from ..utils import latest_file_mtime
 from .base import ProcessingResult, SourceProcessor
 
 logger = logging.getLogger(__name__)
 
+# Image formats embedded from a bookmark's media directory
+_IMAGE_EXTENSIONS = frozenset(
+    {".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".heic"}
+)
+
+# Files in a bookmark directory that are not processed as attachments
+_NON_ATTACHMENT_EXTENSIONS = _IMAGE_EXTENSIONS | {".md"}
+
+# Working directories that live alongside bookmarks and are not bookmarks
+_SPECIAL_DIRS = frozenset({"images", "markitdown", "temp"})
+
+# Markdown image references: ![alt](path)
+_RE_IMAGE = re.compile(r"!\[(.*?)\]\((.*?)\)")
+
 
 class XBookmarksProcessor(SourceProcessor):
     """Process X bookmarks and their attachments."""
@@ -60,8 +78,7 @@ class XBookmarksProcessor(SourceProcessor):
                 index_file = bookmark_dir / self.source_config.index_filename
                 if not index_file.exists():
                     # Special case: don't count special directories in skip count
-                    special_dirs = ["images", "markitdown", "temp"]
-                    if bookmark_dir.name not in special_dirs:
+                    if bookmark_dir.name not in _SPECIAL_DIRS:
                         logger.debug(f"No index file found in {bookmark_dir.name}")
                         result.add_skipped(self._processor_type)
                         skipped_count += 1
@@ -78,14 +95,10 @@ class XBookmarksProcessor(SourceProcessor):
                 if cached and not config.global_config.force_generation:
                     if cached["hash"] == content_hash:
                         # Check for any newer files in the bookmark directory
-                        latest_file = max(
-                            bookmark_dir.glob("*"),
-                            key=lambda p: p.stat().st_mtime if p.is_file() else 0,
-                            default=None,
-                        )
+                        latest_mtime = latest_file_mtime(bookmark_dir)
                         if (
-                            latest_file
-                            and latest_file.stat().st_mtime <= cached["timestamp"]
+                            latest_mtime is not None
+                            and latest_mtime <= cached["timestamp"]
                         ):
                             should_process = False
 
@@ -210,9 +223,6 @@ class XBookmarksProcessor(SourceProcessor):
         Returns:
             Updated content with processed media references
         """
-        import re
-        import urllib.parse
-        from typing import Match
 
         def replace_media(match: Match[str]) -> str:
             """Replace a media reference with processed content."""
@@ -255,7 +265,7 @@ class XBookmarksProcessor(SourceProcessor):
             return markdown_result
 
         # Replace image references
-        result_content = re.sub(r"!\[(.*?)\]\((.*?)\)", replace_media, content)
+        result_content = _RE_IMAGE.sub(replace_media, content)
         return result_content
 
     def _process_media(
@@ -282,11 +292,10 @@ class XBookmarksProcessor(SourceProcessor):
         # No longer creating output media directory
 
         # Get all image files
-        image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".heic"}
         media_files = [
             f
-            for f in media_dir.iterdir()
-            if f.is_file() and f.suffix.lower() in image_extensions
+            for f in iter_convertible(media_dir)
+            if f.suffix.lower() in _IMAGE_EXTENSIONS
         ]
 
         if not media_files:
@@ -295,6 +304,13 @@ class XBookmarksProcessor(SourceProcessor):
 
         logger.info(f"Processing {len(media_files)} media files from {media_dir}")
 
+        # Convert the HEIC images in one batch and request the GPT
+        # descriptions of the images concurrently up front
+        self.attachment_processor.prepare_images(
+            media_files, force=config.global_config.force_generation
+        )
+        self._describe_images(media_files, config, result, self.cache_manager)
+
         # Process all media files and collect their markdown representations
         return self._process_attachment_files(
             media_files, self.source_config.dest_dir, config, result, is_image=True
@@ -321,11 +337,10 @@ class XBookmarksProcessor(SourceProcessor):
             Formatted markdown content for all non-media attachments
         """
         # Skip media files and markdown files
-        skip_exts = {".md", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".heic"}
         attachments = [
             f
-            for f in bookmark_dir.iterdir()
-            if f.is_file() and f.suffix.lower() not in skip_exts
+            for f in iter_convertible(bookmark_dir)
+            if f.suffix.lower() not in _NON_ATTACHMENT_EXTENSIONS
         ]
 
         if not attachments:
@@ -336,6 +351,12 @@ class XBookmarksProcessor(SourceProcessor):
 
         # No longer creating output attachments directory
 
+        # Convert the documents in parallel up front; each one is then formatted
+        # from its prepared result below
+        self.attachment_processor.prepare_documents(
+            attachments, force=config.global_config.force_generation
+        )
+
         # Process all attachment files and collect their markdown representations
         return self._process_attachment_files(
             attachments, self.source_config.dest_dir, config, result, is_image=False
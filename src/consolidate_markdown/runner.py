@@ -1,7 +1,7 @@
 """Runner for processing markdown files."""
 
 import logging
-from typing import Dict, Optional, Type
+from typing import TYPE_CHECKING, Dict, Optional, Type
 
 from rich.console import Console
 from rich.progress import (
@@ -12,12 +12,15 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 
+from consolidate_markdown import PROCESSOR_TYPES, get_processor
 from consolidate_markdown.cache import CacheManager
 from consolidate_markdown.config import Config
 from consolidate_markdown.log_setup import set_progress
 from consolidate_markdown.output import format_count
-from consolidate_markdown.processors import PROCESSOR_TYPES
-from consolidate_markdown.processors.base import ProcessingResult, SourceProcessor
+from consolidate_markdown.processors.result import ProcessingResult
+
+if TYPE_CHECKING:
+    from consolidate_markdown.processors.base import SourceProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +28,7 @@ logger = logging.getLogger(__name__)
 class Runner:
     """Runner for processing markdown files."""
 
-    PROCESSORS: Dict[str, Type[SourceProcessor]] = PROCESSOR_TYPES
+    PROCESSORS: Dict[str, Type["SourceProcessor"]] = PROCESSOR_TYPES
 
     def __init__(self, config: Config):
         """Initialize the runner.
@@ -121,6 +124,12 @@ class Runner:
                     try:
                         # Get the processor class
                         processor_class = self.PROCESSORS.get(source.type)
+                        if (
+                            processor_class is None
+                            and self.PROCESSORS is PROCESSOR_TYPES
+                        ):
+                            # Import the registered processor module on first use
+                            processor_class = get_processor(source.type)
                         if not processor_class:
                             error_msg = f"No processor found for type: {source.type}"
                             logger.error(error_msg)
@@ -220,6 +229,17 @@ class Runner:
                 # Clear progress-aware logging
                 set_progress(None)
 
+        # Descriptions not found under their old keys are not looked up by
+        # those keys again, so only a complete run that describes images ends
+        # the migration
+        if (
+            not self.config.global_config.no_image
+            and self.selected_processor is None
+            and self.processing_limit is None
+            and not self.summary.errors
+        ):
+            self.cache_manager.finish_gpt_key_migration()
+
         logger.info(
             f"Consolidation complete: {self.summary.processed} processed, {self.summary.errors} errors"
         )
@@ -1,6 +1,7 @@
 """Common utility functions for consolidate_markdown."""
 
 import logging  # Standard library
+import os  # Standard library
 import re  # Standard library
 import shutil  # Standard library
 import urllib.parse  # Standard library
@@ -14,6 +15,9 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Markdown image or regular link: ![alt](url) or [alt](url)
+_RE_MARKDOWN_LINK = re.compile(r"!?\[(.*?)\]\((.*?)\)")
+
 
 def normalize_path(path: str) -> str:
     """Normalize a path by converting to forward slashes and handling newlines.
@@ -45,6 +49,47 @@ def normalize_path(path: str) -> str:
     return path
 
 
+def latest_file_mtime(directory: Path) -> Optional[float]:
+    """Get the most recent modification time of the files in a directory.
+
+    Uses a single os.scandir() pass: the file type comes from the directory
+    listing itself, so only regular files need a stat() call, and each file is
+    stat'ed once.
+
+    Args:
+        directory: The directory to scan (not recursive)
+
+    Returns:
+        The latest file mtime, or None if the directory contains no files
+    """
+    latest: Optional[float] = None
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file():
+                mtime = entry.stat().st_mtime
+                if latest is None or mtime > latest:
+                    latest = mtime
+    return latest
+
+
+def read_text_file(file_path: Path) -> str:
+    """Read a small UTF-8 text file in one read.
+
+    Decodes the raw bytes directly instead of going through a buffered text
+    wrapper. Line endings are normalized to "\\n" as in text mode.
+
+    Args:
+        file_path: The file to read
+
+    Returns:
+        The decoded file content
+    """
+    content = file_path.read_bytes().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
 def should_process_from_cache(
     file_path: Path,
     content: str,
@@ -72,12 +117,8 @@ def should_process_from_cache(
         if cached["hash"] == content_hash:
             # Check for any newer files in the attachment directory
             if attachment_dir and attachment_dir.exists():
-                latest_file = max(
-                    attachment_dir.glob("*"),
-                    key=lambda p: p.stat().st_mtime if p.is_file() else 0,
-                    default=None,
-                )
-                if latest_file and latest_file.stat().st_mtime <= cached["timestamp"]:
+                latest_mtime = latest_file_mtime(attachment_dir)
+                if latest_mtime is not None and latest_mtime <= cached["timestamp"]:
                     should_process = False
             else:
                 # No attachments directory = safe to use cache
@@ -111,7 +152,7 @@ def extract_url_from_markdown(markdown_link: str) -> Tuple[str, str]:
         Tuple of (alt_text, url)
     """
     # Match both image and regular links
-    match = re.match(r"!?\[(.*?)\]\((.*?)\)", markdown_link)
+    match = _RE_MARKDOWN_LINK.match(markdown_link)
     if match:
         alt_text, url = match.groups()
         # URL decode the path
@@ -129,6 +170,25 @@ def ensure_directory(directory: Path) -> None:
     directory.mkdir(parents=True, exist_ok=True)
 
 
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Make dst a hard link to src, or a copy when linking is not possible.
+
+    A hard link shares src's data and modification time instead of
+    duplicating its bytes. A copy is made when the paths are on different
+    filesystems or the filesystem does not support links. dst must never be
+    written to afterwards, since a write through a link changes src.
+
+    Args:
+        src: The file to link or copy
+        dst: The path to create, replacing any existing file
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
 def check_command_exists(command: str) -> bool:
     """Check if a command exists in the system PATH.
 
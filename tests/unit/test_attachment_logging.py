@@ -153,3 +153,20 @@ def test_log_wav_processing(mock_logger: MagicMock) -> None:
     mock_logger.error.assert_called_once_with(
         f"Failed to process WAV file {file_path}: {error_msg}", exc_info=True
     )
+
+
+def test_debug_logging_skipped_when_disabled(mock_logger: MagicMock) -> None:
+    """Test that debug messages are not built when DEBUG is disabled."""
+    mock_logger.isEnabledFor.return_value = False
+    search_dir = MagicMock(spec=Path)
+
+    log_file_search("test_file_id", search_dir, [Path("/test/dir/file1.jpg")])
+    log_dalle_processing("test_file_id", search_dir, [])
+    log_file_processing(Path("/test/dir/file.jpg"), "image", exists=False)
+    log_wav_processing(Path("/test/dir/file.wav"), True)
+
+    mock_logger.debug.assert_not_called()
+    search_dir.exists.assert_not_called()
+    mock_logger.warning.assert_called_once_with(
+        "Image file not found: /test/dir/file.jpg"
+    )
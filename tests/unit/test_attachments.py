@@ -2,6 +2,7 @@
 
 import logging
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -311,3 +312,97 @@ def test_attachment_handler_process_attachment_files(
     assert doc_formatted is not None
     assert "<!-- ATTACHMENT: IMAGE: image.jpg" in image_formatted
     assert "<!-- ATTACHMENT: PDF: document.pdf" in doc_formatted
+
+
+def test_attachment_metadata_uses_slots(tmp_path: Path) -> None:
+    """Test that attachment metadata does not carry a per-instance __dict__."""
+    metadata = AttachmentMetadata(path=tmp_path / "file.txt", is_image=False, size=0)
+
+    assert not hasattr(metadata, "__dict__")
+    with pytest.raises(AttributeError):
+        metadata.unknown_field = "value"  # type: ignore[attr-defined]
+
+
+def test_attachment_processor_cleanup(tmp_path: Path) -> None:
+    """Test that cleanup removes temp directories and tolerates missing ones."""
+    processor = AttachmentProcessor(tmp_path)
+    (processor.temp_dir / "file.txt").write_text("temp")
+
+    processor.cleanup()
+    assert not processor.temp_dir.exists()
+    assert not processor.markitdown.temp_dir.exists()
+
+    # A second cleanup finds nothing left to remove
+    processor.cleanup()
+
+
+def test_prepare_documents(tmp_path: Path) -> None:
+    """Test that prepared document conversions are used by process_file."""
+    processor = AttachmentProcessor(tmp_path / "output")
+    notes = tmp_path / "notes.txt"
+    notes.write_text("prepared notes")
+    data = tmp_path / "data.json"
+    data.write_text("{not json")
+    image = tmp_path / "photo.jpg"
+    image.write_bytes(b"not converted")
+
+    processor.prepare_documents([notes, data, image])
+
+    with patch.object(processor.markitdown, "convert_to_markdown") as mock_convert:
+        _, notes_metadata = processor.process_file(notes)
+        _, data_metadata = processor.process_file(data)
+        mock_convert.assert_not_called()
+
+    assert notes_metadata.markdown_content == "```\nprepared notes\n```"
+    assert data_metadata.error is not None
+    assert "Failed to parse JSON file" in data_metadata.error
+    # Each prepared result is used once
+    assert not processor._prepared
+
+
+def test_process_file_svg_png_path(tmp_path: Path) -> None:
+    """Test that an SVG's PNG rendering is passed on for GPT analysis."""
+    processor = AttachmentProcessor(tmp_path / "output")
+    svg = tmp_path / "diagram.svg"
+    svg.write_text('<svg width="10" height="20"></svg>')
+
+    with patch.object(processor.image_processor, "_convert_svg_to_png"):
+        _, metadata = processor.process_file(svg)
+
+    assert metadata.png_path == str(processor.image_processor.temp_dir / "diagram.png")
+    assert metadata.dimensions == (10, 20)
+
+
+def test_process_file_fallback_copies(tmp_path: Path) -> None:
+    """Test that a failed image is copied, so converting into it leaves it intact."""
+    processor = AttachmentProcessor(tmp_path / "output")
+    image = tmp_path / "pic.jpg"
+    image.write_bytes(b"original")
+
+    with patch.object(
+        processor.image_processor, "process_image", side_effect=OSError("bad image")
+    ):
+        temp_path, _ = processor.process_file(image)
+
+    assert temp_path == processor.temp_dir / "pic.jpg"
+    assert not temp_path.samefile(image)
+    # Writing a later pic.heic's JPEG to the same temp path
+    temp_path.write_bytes(b"converted")
+    assert image.read_bytes() == b"original"
+
+
+def test_process_file_after_cleanup(tmp_path: Path) -> None:
+    """Test that the temp directory is created again after cleanup()."""
+    processor = AttachmentProcessor(tmp_path / "output")
+    audio = tmp_path / "notes.wav"
+    audio.write_bytes(b"RIFF")
+    svg = tmp_path / "diagram.svg"
+    svg.write_text('<svg width="10" height="20"></svg>')
+
+    processor.cleanup()
+    temp_path, _ = processor.process_file(audio)
+    with patch.object(processor.image_processor, "_convert_svg_to_png"):
+        svg_temp_path, _ = processor.process_file(svg)
+
+    assert temp_path.read_bytes() == b"RIFF"
+    assert svg_temp_path.read_text() == svg.read_text()
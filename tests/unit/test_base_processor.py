@@ -148,6 +148,46 @@ def test_format_image_with_gpt(attachment_handler, tmp_path, global_config) -> N
         assert "<!-- GPT Description: This is a test image. -->" in formatted
 
 
+def test_format_image_uses_prepared_description(
+    attachment_handler, tmp_path, global_config
+) -> None:
+    """Test that images described in a batch are not described again."""
+    image_paths = []
+    for name in ["first.jpg", "second.png", "drawing.svg"]:
+        image_path = tmp_path / name
+        image_path.write_bytes(b"fake image data")
+        image_paths.append(image_path)
+
+    config = Config(global_config=global_config, sources=[])
+    result = ProcessingResult()
+
+    with patch("consolidate_markdown.processors.base.GPTProcessor") as mock_gpt_cls:
+        mock_gpt_cls.SUPPORTED_FORMATS = {".jpg", ".png"}
+        mock_gpt = MagicMock()
+        mock_gpt.describe_images.return_value = ["First.", "Second."]
+        mock_gpt_cls.return_value = mock_gpt
+
+        attachment_handler._describe_images(image_paths, config, result)
+        mock_gpt.describe_images.assert_called_once_with(
+            image_paths[:2], result, "test"
+        )
+
+        metadata = AttachmentMetadata(
+            path=image_paths[1],
+            is_image=True,
+            size=1024,
+            dimensions=(100, 100),
+            mime_type="image/png",
+        )
+        formatted = attachment_handler._format_image(
+            image_paths[1], metadata, config, result
+        )
+
+        mock_gpt.describe_image.assert_not_called()
+        assert "<!-- GPT Description: Second. -->" in formatted
+        assert attachment_handler._image_descriptions == {image_paths[0]: "First."}
+
+
 def test_format_image_svg_with_png(attachment_handler, tmp_path, global_config) -> None:
     """Test formatting an SVG image with PNG conversion."""
     # Create a test SVG image
@@ -606,6 +646,23 @@ def test_source_processor_process(source_processor, global_config) -> None:
         mock_process_impl.assert_called_once_with(config)
 
 
+def test_source_processor_process_flushes_cache(
+    source_processor, global_config
+) -> None:
+    """Test that the cache is flushed once processing ends, even on error."""
+    config = Config(global_config=global_config, sources=[])
+
+    with (
+        patch.object(
+            source_processor, "_process_impl", side_effect=RuntimeError("boom")
+        ),
+        patch.object(source_processor.cache_manager, "flush") as mock_flush,
+    ):
+        with pytest.raises(RuntimeError):
+            source_processor.process(config)
+        mock_flush.assert_called_once_with()
+
+
 def test_source_processor_process_with_progress(
     source_processor, global_config
 ) -> None:
@@ -14,7 +14,7 @@ from typing import Set
 
 import pytest
 
-from consolidate_markdown.cache import CacheManager, quick_hash
+from consolidate_markdown.cache import CacheManager, bytes_hash, file_hash, quick_hash
 
 _temp_dirs: Set[str] = set()
 
@@ -41,6 +41,37 @@ def _cleanup_temp_dirs():
 atexit.register(_cleanup_temp_dirs)
 
 
+def test_file_hash(tmp_path):
+    """Test hashing file content."""
+    first = tmp_path / "first.bin"
+    second = tmp_path / "second.bin"
+    first.write_bytes(b"same content")
+    second.write_bytes(b"same content")
+
+    assert file_hash(first) == file_hash(second)
+    assert len(file_hash(first)) == 32
+
+    second.write_bytes(b"other content")
+    assert file_hash(first) != file_hash(second)
+
+
+def test_bytes_hash_matches_file_hash(tmp_path):
+    """Test that hashing content in memory gives the file's hash."""
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"content" * 1000)
+
+    assert bytes_hash(path.read_bytes()) == file_hash(path)
+
+
+def test_file_hash_blake3(tmp_path):
+    """Test that files are hashed with BLAKE3 when it is installed."""
+    blake3 = pytest.importorskip("blake3")
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"content")
+
+    assert file_hash(path) == blake3.blake3(b"content").hexdigest(length=16)
+
+
 def test_quick_hash():
     """Test the quick hash function."""
     content = "test content"
@@ -209,11 +240,119 @@ class TestCacheManager:
         cache_manager.update_gpt_cache(image_hash, analysis)
         assert cache_manager.get_gpt_cache(image_hash) == analysis
 
+    def test_image_hash_cache_operations(self, cache_manager):
+        """Test recording the content hash of an image."""
+        image_path = "images/photo.png"
+
+        assert cache_manager.get_image_hash_cache(image_path) is None
+
+        cache_manager.update_image_hash_cache(image_path, "abc123", 2048, 1234)
+        assert cache_manager.get_image_hash_cache(image_path) == {
+            "hash": "abc123",
+            "size": 2048,
+            "mtime_ns": 1234,
+        }
+
+        # Entries are written to disk once, when flushed
+        images_file = cache_manager.images_file
+        assert json.loads(images_file.read_text()) == {}
+        cache_manager.flush()
+        assert json.loads(images_file.read_text())[image_path]["hash"] == "abc123"
+        assert not list(images_file.parent.glob("*.tmp"))
+
+        cache_manager.clear_cache()
+        assert cache_manager.get_image_hash_cache(image_path) is None
+        cache_manager.flush()
+        assert json.loads(images_file.read_text()) == {}
+
+    def test_gpt_semantic_cache_operations(self, cache_manager):
+        """Test looking up analyses by a nearby perceptual hash."""
+        cache_manager.update_gpt_cache("abc123", "A red square")
+        cache_manager.update_gpt_semantic_cache(0b1010, "abc123")
+
+        assert cache_manager.get_gpt_semantic_cache(0b1011, 1) == "A red square"
+        assert cache_manager.get_gpt_semantic_cache(0b0101, 1) is None
+        assert cache_manager.get_gpt_semantic_cache(0b0101, 4) == "A red square"
+
+        cache_manager.clear_cache()
+        assert cache_manager.get_gpt_semantic_cache(0b1010, 4) is None
+
+    def test_unsupported_cache_operations(self, cache_manager, monkeypatch):
+        """Test remembering images that could not be converted."""
+        image_path = "images/broken.heic"
+
+        assert not cache_manager.is_unsupported(image_path, 10, 1234)
+
+        cache_manager.mark_unsupported(image_path, 10, 1234)
+        assert cache_manager.is_unsupported(image_path, 10, 1234)
+        assert not cache_manager.is_unsupported(image_path, 10, 5678)
+
+        monkeypatch.setattr("consolidate_markdown.cache.UNSUPPORTED_TTL", 0)
+        assert not cache_manager.is_unsupported(image_path, 10, 1234)
+
+    def test_conversion_cache_operations(self, cache_manager):
+        """Test basic document conversion cache operations."""
+        doc_path = "docs/report.pdf"
+
+        # Initially should be None
+        assert cache_manager.get_conversion_cache(doc_path) is None
+
+        # Update and verify
+        cache_manager.update_conversion_cache(doc_path, "hash1", 42, 1.5, "# Report")
+        cached = cache_manager.get_conversion_cache(doc_path)
+        assert cached == {
+            "hash": "hash1",
+            "size": 42,
+            "mtime": 1.5,
+            "markdown": "# Report",
+        }
+
+    def test_conversion_markdown_stored_outside_index(self, cache_manager):
+        """Test that converted markdown is kept out of the conversions index."""
+        cache_manager.update_conversion_cache("a.pdf", "hash1", 42, 1.5, "# Report")
+        assert (cache_manager.conversions_dir / "hash1.md").read_text() == "# Report"
+
+        # The index is written to disk once, when flushed
+        conversions_file = cache_manager.conversions_file
+        assert json.loads(conversions_file.read_text()) == {}
+        assert cache_manager.get_conversion_cache("a.pdf")["markdown"] == "# Report"
+        cache_manager.flush()
+        index = json.loads(conversions_file.read_text())
+        assert index == {"a.pdf": {"hash": "hash1", "size": 42, "mtime": 1.5}}
+
+        # An entry whose markdown file is gone is a miss
+        (cache_manager.conversions_dir / "hash1.md").unlink()
+        assert cache_manager.get_conversion_cache("a.pdf") is None
+
+    def test_conversion_cache_reads_inline_entries(self, cache_manager):
+        """Test that entries written with inline markdown are still used."""
+        entry = {"hash": "hash1", "size": 42, "mtime": 1.5, "markdown": "# Old"}
+        cache_manager.conversions_file.write_text(json.dumps({"a.pdf": entry}))
+
+        assert cache_manager.get_conversion_cache("a.pdf") == entry
+
+    def test_save_cache_is_atomic(self, cache_manager, cache_dir, monkeypatch):
+        """Test that a failed save keeps the previous cache file intact."""
+        cache_manager.update_gpt_cache("image1", "analysis1")
+
+        def fail_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("consolidate_markdown.cache.os.replace", fail_replace)
+        cache_manager.update_gpt_cache("image2", "analysis2")
+        monkeypatch.undo()
+
+        assert cache_manager.get_gpt_cache("image1") == "analysis1"
+        assert cache_manager.get_gpt_cache("image2") is None
+        # No temporary files are left behind
+        assert not list((cache_dir / "cache").glob("*.tmp"))
+
     def test_clear_cache(self, cache_manager):
         """Test cache clearing."""
         # Add some data
         cache_manager.update_note_cache("test.md", "hash1", time.time())
         cache_manager.update_gpt_cache("image1", "analysis1")
+        cache_manager.update_conversion_cache("doc.pdf", "hash2", 1, 1.0, "text")
 
         # Clear cache
         cache_manager.clear_cache()
@@ -221,6 +360,26 @@ class TestCacheManager:
         # Verify empty
         assert cache_manager.get_note_cache("test.md") is None
         assert cache_manager.get_gpt_cache("image1") is None
+        assert cache_manager.get_conversion_cache("doc.pdf") is None
+
+    def test_gpt_key_migration(self, cache_dir):
+        """Test that a cache keyed by an older hash is migrated once."""
+        # A new cache holds no analyses under older keys
+        assert not CacheManager(cache_dir).gpt_key_migration_pending()
+
+        (cache_dir / "cache" / "gpt_keys.json").unlink()
+        cache_manager = CacheManager(cache_dir)
+        assert cache_manager.gpt_key_migration_pending()
+
+        cache_manager.finish_gpt_key_migration()
+        assert not cache_manager.gpt_key_migration_pending()
+        assert not CacheManager(cache_dir).gpt_key_migration_pending()
+
+        # Clearing the cache also drops the analyses under older keys
+        (cache_dir / "cache" / "gpt_keys.json").write_text('{"hash": "md5"}')
+        cache_manager = CacheManager(cache_dir)
+        cache_manager.clear_cache()
+        assert not CacheManager(cache_dir).gpt_key_migration_pending()
 
     def test_path_normalization(self, cache_manager):
         """Test path normalization in cache operations."""
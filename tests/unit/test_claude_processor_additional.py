@@ -664,3 +664,15 @@ def test_process_text_block_multiline(source_config: SourceConfig):
 
     # Should split into lines
     assert lines == ["Line 1", "Line 2", "Line 3"]
+
+
+def test_get_output_path_sanitizes_title(source_config: SourceConfig):
+    """Test that unsafe title characters collapse to single underscores."""
+    processor = ClaudeProcessor(source_config)
+
+    output_file = processor._get_output_path(
+        ' Q&A: "café" / 日本_語  notes?! -- v2 ', "2024-01-15T10:00:00Z"
+    )
+
+    assert output_file.name == "20240115-Q_A_café_日本_語_notes_--_v2.md"
+    assert processor._get_output_path("?!/", None).name == "Untitled.md"
@@ -73,6 +73,7 @@ def test_full_config_loading(tmp_path):
             "no_image": True,
             "api_provider": "openrouter",
             "openrouter_key": "test-key",
+            "similar_image_distance": 4,
         },
         "models": {
             "default_model": "gpt-4o",
@@ -101,6 +102,7 @@ def test_full_config_loading(tmp_path):
         assert config.global_config.no_image is True
         assert config.global_config.openrouter_key == "test-key"
         assert config.global_config.api_provider == "openrouter"
+        assert config.global_config.similar_image_distance == 4
         assert config.global_config.models.default_model == "gpt-4o"
         assert config.global_config.models.alternate_models == {
             "gpt4": "gpt-4o",
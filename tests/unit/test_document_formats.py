@@ -1,12 +1,25 @@
 """Test document format conversions."""
 
+import csv
 import json
+import os
+import subprocess
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-import pandas as pd
 import pytest
 
-from consolidate_markdown.attachments.document import ConversionError, MarkItDown
+from consolidate_markdown.attachments.document import (
+    ConversionError,
+    MarkItDown,
+    _csv_encodings,
+    _shutdown_process_pool,
+    iter_convertible,
+)
+from consolidate_markdown.cache import CacheManager
 
 
 @pytest.fixture
@@ -31,12 +44,108 @@ def test_csv_conversion(markdown_converter, fixtures_dir):
     assert "-|-" in result
 
     # Verify content matches original
-    df = pd.read_csv(
-        csv_file, encoding="cp1252", engine="python"
-    )  # Use same params as converter
-    expected_headers = list(df.columns)
+    with open(csv_file, encoding="cp1252", newline="") as f:
+        expected_headers = next(csv.reader(f))
+    header_row = result.splitlines()[0]
     for header in expected_headers:
-        assert header in result
+        assert header in header_row
+
+    # One table row per CSV line
+    with open(csv_file, encoding="cp1252", newline="") as f:
+        row_count = sum(1 for row in csv.reader(f) if row)
+    assert len(result.splitlines()) == row_count + 1  # plus the separator row
+
+
+def test_csv_conversion_detects_windows_encoding(markdown_converter, tmp_path):
+    """Test that a cp1252 CSV is decoded as cp1252 rather than latin1."""
+    pytest.importorskip("charset_normalizer")
+    csv_file = tmp_path / "quotes.csv"
+    csv_file.write_bytes(
+        "name,quote\nRené,\u201cGrüße\u201d \u2013 ok\n".encode("cp1252")
+    )
+
+    result = markdown_converter.convert_to_markdown(csv_file)
+
+    assert "| René | \u201cGrüße\u201d \u2013 ok |" in result
+
+
+def test_csv_encodings_sample(tmp_path, monkeypatch):
+    """Test that the CSV encoding order comes from a sample of the file."""
+    utf8_file = tmp_path / "utf8.csv"
+    # The sample ends in the middle of a two-byte character
+    utf8_file.write_bytes(("a," + "é" * 10).encode("utf-8"))
+    latin1_file = tmp_path / "latin1.csv"
+    latin1_file.write_bytes("a,\x85\n".encode("latin1"))
+    monkeypatch.setattr("consolidate_markdown.attachments.document._CSV_SNIFF_BYTES", 5)
+
+    assert _csv_encodings(utf8_file)[0] == "utf-8"
+    assert "utf-8" not in _csv_encodings(latin1_file)
+
+
+def test_csv_encodings_without_detection(markdown_converter, tmp_path, monkeypatch):
+    """Test the fallback order when charset-normalizer is not installed."""
+    monkeypatch.setitem(sys.modules, "charset_normalizer", None)
+    cp1252_file = tmp_path / "cp1252.csv"
+    cp1252_file.write_bytes("name\n\u201cquoted\u201d\n".encode("cp1252"))
+    # 0x81 is undefined in cp1252, so only latin1 can decode this file
+    latin1_file = tmp_path / "latin1.csv"
+    latin1_file.write_bytes(b"name\nx\x81y\n")
+
+    assert _csv_encodings(cp1252_file) == ["cp1252", "latin1"]
+    assert "| \u201cquoted\u201d |" in markdown_converter.convert_to_markdown(
+        cp1252_file
+    )
+    assert "| x\x81y |" in markdown_converter.convert_to_markdown(latin1_file)
+
+
+def test_csv_conversion_escapes_cells(markdown_converter, tmp_path):
+    """Test that CSV cells cannot break the markdown table."""
+    csv_file = tmp_path / "table.csv"
+    csv_file.write_text('name,notes\nwidget,"a|b"\n\ngadget,"two\nlines"\n')
+
+    result = markdown_converter.convert_to_markdown(csv_file)
+
+    assert result.splitlines() == [
+        "| name | notes |",
+        "|---|---|",
+        "| widget | a\\|b |",
+        "| gadget | two lines |",
+    ]
+
+
+def test_csv_arrow_rows_match_csv_module(tmp_path):
+    """Test that the optional pyarrow reader yields the same rows as csv."""
+    pytest.importorskip("pyarrow")
+    from consolidate_markdown.attachments.document import _read_csv_rows_arrow
+
+    csv_file = tmp_path / "table.csv"
+    csv_file.write_text('a,b,c\n1,x y,\n\n2.5,"q|r\nz",007\n')
+
+    with open(csv_file, newline="") as f:
+        expected = [row for row in csv.reader(f) if row]
+    rows = _read_csv_rows_arrow(csv_file)
+    assert rows is not None
+    assert [list(row) for row in rows] == expected
+
+    # Ragged rows are left to the csv module, which reports the error
+    csv_file.write_text("a,b\n1,2\n3\n")
+    assert _read_csv_rows_arrow(csv_file) is None
+
+
+def test_csv_arrow_rows_transcode(tmp_path):
+    """Test that the optional pyarrow reader handles non-UTF-8 files."""
+    pytest.importorskip("pyarrow")
+    from consolidate_markdown.attachments.document import _read_csv_rows_arrow
+
+    csv_file = tmp_path / "table.csv"
+    csv_file.write_bytes("name,quote\ncafé,\u201chi\u201d\n".encode("cp1252"))
+
+    rows = _read_csv_rows_arrow(csv_file, "cp1252")
+    assert rows is not None
+    assert [list(row) for row in rows] == [
+        ["name", "quote"],
+        ["café", "\u201chi\u201d"],
+    ]
 
 
 def test_text_conversion(markdown_converter, fixtures_dir):
@@ -54,6 +163,20 @@ def test_text_conversion(markdown_converter, fixtures_dir):
     assert original in result
 
 
+def test_text_conversion_line_endings_and_size_changes(tmp_path):
+    """Test reading fenced text when the file changed size after stat()."""
+    from consolidate_markdown.attachments.document import _read_fenced_text
+
+    txt_file = tmp_path / "notes.txt"
+    txt_file.write_bytes("caf\u00e9\r\nline two\rend".encode("utf-8"))
+    expected = "```\ncaf\u00e9\nline two\nend\n```"
+
+    size = txt_file.stat().st_size
+    assert _read_fenced_text(txt_file, size) == expected
+    assert _read_fenced_text(txt_file, size - 5) == expected
+    assert _read_fenced_text(txt_file, size + 5) == expected
+
+
 def test_json_conversion(markdown_converter, fixtures_dir):
     """Test converting JSON files to markdown code blocks."""
     json_file = fixtures_dir / "json.json"
@@ -70,6 +193,38 @@ def test_json_conversion(markdown_converter, fixtures_dir):
     assert result_json == original
 
 
+def test_json_conversion_edge_values(markdown_converter, tmp_path):
+    """Test JSON values outside orjson's range are still converted."""
+    json_file = tmp_path / "values.json"
+    json_file.write_text('{"big": 123456789012345678901234567890, "nan": NaN}')
+
+    result = markdown_converter.convert_to_markdown(json_file)
+
+    assert "123456789012345678901234567890" in result
+    assert "NaN" in result
+
+
+def test_json_conversion_memory_mapped(markdown_converter, tmp_path, monkeypatch):
+    """Test that large JSON files are parsed from a memory map."""
+    pytest.importorskip("orjson")
+    monkeypatch.setattr(
+        "consolidate_markdown.attachments.document._MMAP_JSON_MIN_BYTES", 1
+    )
+    json_file = tmp_path / "data.json"
+    json_file.write_text('{"items": [1, 2], "name": "caf\u00e9"}')
+    edge_file = tmp_path / "values.json"
+    edge_file.write_text('{"nan": NaN}')
+
+    result = markdown_converter.convert_to_markdown(json_file)
+    edge_result = markdown_converter.convert_to_markdown(edge_file)
+
+    assert json.loads(result.removeprefix("```json\n").removesuffix("\n```")) == {
+        "items": [1, 2],
+        "name": "caf\u00e9",
+    }
+    assert "NaN" in edge_result
+
+
 def test_pdf_conversion(markdown_converter, fixtures_dir):
     """Test converting PDF files to markdown."""
     pdf_file = fixtures_dir / "pdf_test.pdf"
@@ -84,6 +239,90 @@ def test_pdf_conversion(markdown_converter, fixtures_dir):
     assert len(text_content.strip()) > 0
 
 
+def test_pdf_conversion_parallel_pages(markdown_converter, tmp_path):
+    """Test that large PDFs split across workers keep their page order."""
+    import fitz
+
+    pdf_file = tmp_path / "pages.pdf"
+    with fitz.open() as doc:
+        for page_num in range(5):
+            doc.new_page().insert_text((72, 72), f"Page {page_num}")
+        doc.save(pdf_file)
+
+    serial = markdown_converter.convert_to_markdown(pdf_file)
+    _shutdown_process_pool()
+    try:
+        with (
+            patch(
+                "consolidate_markdown.attachments.document._PARALLEL_PDF_MIN_PAGES", 2
+            ),
+            patch("os.cpu_count", return_value=2),
+            patch(
+                "consolidate_markdown.attachments.document.ProcessPoolExecutor",
+                wraps=ProcessPoolExecutor,
+            ) as mock_executor,
+        ):
+            parallel = markdown_converter._convert_pdf(pdf_file)
+            markdown_converter._convert_pdf(pdf_file)
+    finally:
+        _shutdown_process_pool()
+
+    # One pool, reused, whose workers are not forked from this process
+    mock_executor.assert_called_once()
+    assert mock_executor.call_args.kwargs["max_workers"] == 2
+    assert mock_executor.call_args.kwargs["mp_context"].get_start_method() != "fork"
+
+    assert parallel == serial
+    assert serial == "```pdf\n" + "\n".join(f"Page {i}" for i in range(5)) + "\n```"
+
+
+def test_pdf_conversion_skips_blank_pages(markdown_converter, tmp_path):
+    """Test that blank and image-only PDF pages add no text."""
+    import fitz
+
+    pdf_file = tmp_path / "scanned.pdf"
+    with fitz.open() as doc:
+        doc.new_page().insert_text((72, 72), "First")
+        doc.new_page()
+        image_page = doc.new_page()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 4, 4), False)
+        image_page.insert_image(fitz.Rect(72, 72, 144, 144), pixmap=pixmap)
+        doc.new_page().insert_text((72, 72), "Last")
+        doc.save(pdf_file)
+
+    result = markdown_converter.convert_to_markdown(pdf_file)
+
+    assert result == "```pdf\nFirst\nLast\n```"
+
+
+def test_pdf_conversion_releases_mupdf_state(markdown_converter, tmp_path):
+    """Test that MuPDF warnings and errors do not accumulate across PDFs."""
+    import fitz
+
+    broken_pdf = tmp_path / "broken.pdf"
+    broken_pdf.write_bytes(b"%PDF-1.4\nnot really a pdf")
+
+    with pytest.raises(ConversionError, match="Failed to convert PDF"):
+        markdown_converter.convert_to_markdown(broken_pdf)
+
+    assert fitz.TOOLS.mupdf_display_errors() is False
+    assert fitz.TOOLS.mupdf_warnings() == ""
+
+
+def test_custom_handler_dispatch(markdown_converter, tmp_path):
+    """Test that custom handlers are looked up by suffix."""
+    text_file = tmp_path / "notes.txt"
+    text_file.write_text("hello")
+
+    assert set(markdown_converter._handlers) == {".csv", ".txt", ".json", ".pdf"}
+    assert (
+        markdown_converter._convert_with_custom_handler(text_file, ".txt")
+        == "```\nhello\n```"
+    )
+    with pytest.raises(ConversionError, match="No custom handler for: .xyz"):
+        markdown_converter._convert_with_custom_handler(text_file, ".xyz")
+
+
 def test_unsupported_format(markdown_converter, tmp_path):
     """Test handling of unsupported file formats."""
     unsupported_file = tmp_path / "test.xyz"
@@ -92,6 +331,26 @@ def test_unsupported_format(markdown_converter, tmp_path):
     with pytest.raises(ConversionError) as exc_info:
         markdown_converter.convert_to_markdown(unsupported_file)
     assert "Format not supported" in str(exc_info.value)
+    # The original MarkItDown exception is kept as the cause
+    assert exc_info.value.__cause__ is not None
+
+
+def test_unsupported_format_remembered(markdown_converter, tmp_path, monkeypatch):
+    """Test that an extension MarkItDown rejected is not sniffed again."""
+    monkeypatch.setattr(
+        "consolidate_markdown.attachments.document._unsupported_suffixes", set()
+    )
+    first = tmp_path / "first.qqq"
+    second = tmp_path / "second.qqq"
+    first.write_text("test content")
+    second.write_text("test content")
+
+    with pytest.raises(ConversionError, match="Format not supported"):
+        markdown_converter.convert_to_markdown(first)
+    with patch.object(markdown_converter.converter, "convert") as mock_convert:
+        with pytest.raises(ConversionError, match="Format not supported: .qqq"):
+            markdown_converter.convert_to_markdown(second)
+    mock_convert.assert_not_called()
 
 
 def test_missing_file(markdown_converter, tmp_path):
@@ -120,6 +379,16 @@ def test_malformed_csv(markdown_converter, tmp_path):
     with pytest.raises(ConversionError) as exc_info:
         markdown_converter.convert_to_markdown(bad_csv)
     assert "CSV file is malformed" in str(exc_info.value)  # Match exact error message
+    assert "Line 3 has 1 columns, expected 2" in str(exc_info.value)
+
+
+def test_empty_csv(markdown_converter, tmp_path):
+    """Test handling of CSV files without a header row."""
+    empty_csv = tmp_path / "empty.csv"
+    empty_csv.write_text("\n\n")
+
+    with pytest.raises(ConversionError, match="CSV file is empty"):
+        markdown_converter.convert_to_markdown(empty_csv)
 
 
 def test_ds_store_handling(markdown_converter, tmp_path):
@@ -129,3 +398,296 @@ def test_ds_store_handling(markdown_converter, tmp_path):
 
     result = markdown_converter.convert_to_markdown(ds_store)
     assert result == ""  # Should return empty string for .DS_Store files
+
+
+def test_system_files_skipped_without_stat(markdown_converter, tmp_path):
+    """Test that system files are skipped by name without touching the disk."""
+    with patch.object(Path, "stat", side_effect=AssertionError("stat called")):
+        for name in [".DS_Store", "desktop.ini", "._report.pdf", "video.part"]:
+            assert markdown_converter.convert_to_markdown(tmp_path / name) == ""
+
+
+def test_iter_convertible(tmp_path):
+    """Test that directory scans skip system and partial files."""
+    for name in [
+        "notes.txt",
+        "report.pdf",
+        ".DS_Store",
+        "Thumbs.db",
+        "._report.pdf",
+        "video.part",
+    ]:
+        (tmp_path / name).write_text("content")
+    (tmp_path / "subdir").mkdir()
+
+    names = sorted(path.name for path in iter_convertible(tmp_path))
+    assert names == ["notes.txt", "report.pdf"]
+
+
+def test_markitdown_imported_lazily():
+    """Test that importing the document module does not import heavy libraries."""
+    code = (
+        "import sys\n"
+        "import consolidate_markdown.attachments.document\n"
+        "print([m for m in ('markitdown', 'fitz', 'openai', 'PIL') if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_pdf_conversion_does_not_import_markitdown(fixtures_dir, tmp_path):
+    """Test that PDFs are converted with PyMuPDF alone, without pdfminer."""
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from consolidate_markdown.attachments.document import MarkItDown\n"
+        f"converter = MarkItDown(Path({str(tmp_path)!r}))\n"
+        f"converter.convert_to_markdown(Path({str(fixtures_dir / 'pdf_test.pdf')!r}))\n"
+        "print([m for m in ('markitdown', 'pdfminer') if m in sys.modules])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_converter_shared_between_instances(tmp_path):
+    """Test that MarkItDown instances reuse one Microsoft converter."""
+    first = MarkItDown(tmp_path / "first")
+    second = MarkItDown(tmp_path / "second")
+    assert first.converter is second.converter
+
+
+def test_converter_created_once_across_threads(tmp_path, monkeypatch):
+    """Test that concurrent first uses build a single Microsoft converter."""
+    import threading
+    import time
+
+    from consolidate_markdown.attachments import document
+
+    monkeypatch.setattr(document, "_converter", None)
+    monkeypatch.setattr(document, "_direct_converters", None)
+    created = []
+
+    def slow_markitdown():
+        time.sleep(0.05)
+        created.append(object())
+        return created[-1]
+
+    converters = []
+    with patch("markitdown.MarkItDown", side_effect=slow_markitdown):
+        threads = [
+            threading.Thread(
+                target=lambda: converters.append(MarkItDown(tmp_path).converter)
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(created) == 1
+    assert all(converter is created[0] for converter in converters)
+
+
+def test_batch_worker_reuses_markitdown(tmp_path):
+    """Test that batch workers build one MarkItDown per process, not per file."""
+    from consolidate_markdown.attachments.document import _worker_markitdown
+
+    cm_dir = str(tmp_path / ".cm")
+    assert _worker_markitdown(cm_dir) is _worker_markitdown(cm_dir)
+
+
+def test_known_extension_skips_full_dispatch(markdown_converter, tmp_path):
+    """Test that extension-specific formats go straight to their converter."""
+    html_file = tmp_path / "page.html"
+    html_file.write_text("<html><body><h1>Heading</h1><p>Body</p></body></html>")
+
+    with patch.object(markdown_converter.converter, "convert") as mock_convert:
+        result = markdown_converter.convert_to_markdown(html_file)
+
+    mock_convert.assert_not_called()
+    assert "# Heading" in result
+    assert "Body" in result
+
+
+def test_known_extension_error_reported_once(markdown_converter, tmp_path):
+    """Test that a corrupt file is not converted again by the full dispatch."""
+    corrupt = tmp_path / "corrupt.docx"
+    corrupt.write_bytes(b"PK\x03\x04")
+
+    with patch.object(markdown_converter.converter, "convert") as mock_convert:
+        with pytest.raises(ConversionError) as exc_info:
+            markdown_converter.convert_to_markdown(corrupt)
+
+    mock_convert.assert_not_called()
+    assert exc_info.value.__cause__ is not None
+
+
+def test_direct_converters_need_page_converters(tmp_path, monkeypatch):
+    """Test that markitdown releases without _page_converters use full dispatch."""
+    from consolidate_markdown.attachments import document
+
+    monkeypatch.setattr(document, "_converter", None)
+    monkeypatch.setattr(document, "_direct_converters", None)
+    html_file = tmp_path / "page.html"
+    html_file.write_text("<html><body><h1>Heading</h1></body></html>")
+
+    with patch("markitdown.MarkItDown", return_value=MagicMock(spec=["convert"])):
+        converter = MarkItDown(tmp_path)
+        assert document._get_direct_converter(".html") is None
+        converter.convert_to_markdown(html_file)
+
+    converter.converter.convert.assert_called_once_with(os.fspath(html_file))
+
+
+def test_convert_many(markdown_converter, fixtures_dir, tmp_path):
+    """Test batch conversion keeps input order and reports per-file errors."""
+    ds_store = tmp_path / ".DS_Store"
+    ds_store.write_text("fake ds_store content")
+    bad_json = tmp_path / "bad.json"
+    bad_json.write_text("{not valid json}")
+    paths = [
+        fixtures_dir / "env.txt",
+        ds_store,
+        bad_json,
+        fixtures_dir / "json.json",
+    ]
+
+    results = list(markdown_converter.convert_many(paths, max_workers=2))
+
+    assert [path for path, _, _ in results] == paths
+    assert results[0][1].startswith("```\n") and results[0][2] is None
+    assert results[1][1:] == ("", None)
+    assert results[2][1] == "" and "Failed to parse JSON" in results[2][2]
+    assert results[3][1].startswith("```json\n") and results[3][2] is None
+
+
+def test_convert_many_unexpected_error(markdown_converter, fixtures_dir, tmp_path):
+    """Test that an error outside MarkItDown's own is reported for its file only."""
+    corrupt = tmp_path / "corrupt.docx"
+    corrupt.write_bytes(b"PK\x03\x04")
+    paths = [corrupt, fixtures_dir / "env.txt"]
+    converter = MagicMock()
+    converter.convert.side_effect = zipfile.BadZipFile("File is not a zip file")
+
+    with (
+        patch(
+            "consolidate_markdown.attachments.document._get_direct_converter",
+            return_value=None,
+        ),
+        patch(
+            "consolidate_markdown.attachments.document._get_converter",
+            return_value=converter,
+        ),
+    ):
+        results = list(markdown_converter.convert_many(paths, max_workers=1))
+        with pytest.raises(ConversionError) as exc_info:
+            markdown_converter.convert_to_markdown(corrupt)
+
+    assert results[0][1] == "" and "File is not a zip file" in results[0][2]
+    assert results[1][1].startswith("```\n") and results[1][2] is None
+    assert isinstance(exc_info.value.__cause__, zipfile.BadZipFile)
+
+
+def test_iter_convert_many(markdown_converter, fixtures_dir, tmp_path):
+    """Test streaming batch conversion yields every file once."""
+    bad_json = tmp_path / "bad.json"
+    bad_json.write_text("{not valid json}")
+    paths = [fixtures_dir / "env.txt", bad_json, fixtures_dir / "json.json"]
+
+    results = {
+        path: (markdown, error)
+        for path, markdown, error in markdown_converter.iter_convert_many(
+            paths, max_workers=2
+        )
+    }
+
+    assert set(results) == set(paths)
+    assert results[fixtures_dir / "env.txt"][1] is None
+    assert "Failed to parse JSON" in results[bad_json][1]
+    assert results[fixtures_dir / "json.json"][0].startswith("```json\n")
+
+
+def test_convert_many_single_file(markdown_converter, fixtures_dir):
+    """Test that a single-file batch is converted in-process."""
+    results = list(markdown_converter.convert_many([fixtures_dir / "env.txt"]))
+    assert len(results) == 1
+    assert results[0][2] is None
+
+
+def test_conversion_cache(tmp_path):
+    """Test that unchanged documents are served from the conversion cache."""
+    converter = MarkItDown(tmp_path / ".cm", CacheManager(tmp_path / ".cm"))
+    doc = tmp_path / "notes.txt"
+    doc.write_text("first version")
+
+    first = converter.convert_to_markdown(doc)
+    with patch.object(converter, "_convert") as mock_convert:
+        assert converter.convert_to_markdown(doc) == first
+        mock_convert.assert_not_called()
+
+        # force bypasses the cache
+        mock_convert.return_value = "forced"
+        assert converter.convert_to_markdown(doc, force=True) == "forced"
+
+    # Changed content is reconverted
+    doc.write_text("second version")
+    assert "second version" in converter.convert_to_markdown(doc)
+
+
+def test_conversion_cache_skips_hash_for_unchanged_stat(tmp_path):
+    """Test that a file with unchanged size and mtime is not re-read."""
+    converter = MarkItDown(tmp_path / ".cm", CacheManager(tmp_path / ".cm"))
+    doc = tmp_path / "notes.txt"
+    doc.write_text("content")
+    first = converter.convert_to_markdown(doc)
+
+    with patch("consolidate_markdown.attachments.document.file_hash") as mock_hash:
+        assert converter.convert_to_markdown(doc) == first
+        mock_hash.assert_not_called()
+
+    # A touched but unchanged file is verified by hash and still served from cache
+    os.utime(doc, (1_000_000, 1_000_000))
+    with patch.object(converter, "_convert") as mock_convert:
+        assert converter.convert_to_markdown(doc) == first
+        mock_convert.assert_not_called()
+
+
+def test_convert_to_markdown_stats_file_once(tmp_path):
+    """Test that one stat() serves the existence check, cache and handler."""
+    converter = MarkItDown(tmp_path / ".cm", CacheManager(tmp_path / ".cm"))
+    doc = tmp_path / "table.csv"
+    doc.write_text("a,b\n1,2\n")
+    stat_calls = []
+    real_stat = Path.stat
+
+    def counting_stat(self, *args, **kwargs):
+        if self == doc:
+            stat_calls.append(self)
+        return real_stat(self, *args, **kwargs)
+
+    with patch.object(Path, "stat", counting_stat):
+        converter.convert_to_markdown(doc)
+
+    assert len(stat_calls) == 1
+
+
+def test_convert_many_uses_cache(tmp_path, fixtures_dir):
+    """Test that batch conversion skips cached documents and caches new ones."""
+    cache_manager = CacheManager(tmp_path / ".cm")
+    converter = MarkItDown(tmp_path / ".cm", cache_manager)
+    txt_file = fixtures_dir / "env.txt"
+
+    list(converter.convert_many([txt_file]))
+    assert cache_manager.get_conversion_cache(str(txt_file)) is not None
+
+    with patch(
+        "consolidate_markdown.attachments.document._convert_one_path"
+    ) as mock_convert:
+        results = list(converter.convert_many([txt_file]))
+        mock_convert.assert_not_called()
+    assert results[0][1].startswith("```\n")
@@ -1,10 +1,19 @@
+import base64
+import hashlib
+import io
+import os
+import subprocess
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from consolidate_markdown.attachments.gpt import GPTError, GPTProcessor
-from consolidate_markdown.cache import CacheManager
+from consolidate_markdown.attachments.gpt import (
+    GPTError,
+    GPTProcessor,
+    _get_http_client,
+)
+from consolidate_markdown.cache import CacheManager, file_hash, quick_hash
 from consolidate_markdown.config import GlobalConfig, ModelsConfig
 from consolidate_markdown.processors.result import ProcessingResult
 
@@ -84,6 +93,56 @@ def cache_manager(tmp_path):
     return CacheManager(cm_dir)
 
 
+def test_image_data_url(tmp_path, monkeypatch):
+    """Test that data URLs carry the image's content type and full base64 data."""
+    from consolidate_markdown.attachments.gpt import _image_data_url
+
+    monkeypatch.setattr(
+        "consolidate_markdown.attachments.gpt._BASE64_CHUNK_BYTES", 3 * 4
+    )
+    data = bytes(range(256)) * 3 + b"tail"
+    encoded = base64.b64encode(data).decode()
+
+    assert _image_data_url(Path("a.png"), data) == f"data:image/png;base64,{encoded}"
+    assert _image_data_url(Path("a.WEBP"), data).startswith("data:image/webp;base64,")
+    assert _image_data_url(Path("a.jpg"), b"") == "data:image/jpeg;base64,"
+
+
+def test_vision_data_url_shrinks_large_images(monkeypatch):
+    """Test that images over the size limit are sent as smaller JPEGs."""
+    from PIL import Image
+
+    from consolidate_markdown.attachments.gpt import _vision_data_url
+
+    monkeypatch.setattr("consolidate_markdown.attachments.gpt._MAX_IMAGE_SIDE", 64)
+    buffer = io.BytesIO()
+    Image.new("RGB", (256, 128), (0, 128, 255)).save(buffer, "PNG")
+    data = buffer.getvalue()
+
+    url = _vision_data_url(Path("a.png"), data)
+    assert url.startswith("data:image/jpeg;base64,")
+    with Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1]))) as img:
+        assert img.size == (64, 32)
+
+    monkeypatch.setattr("consolidate_markdown.attachments.gpt._MAX_IMAGE_SIDE", 256)
+    encoded = base64.b64encode(data).decode()
+    assert _vision_data_url(Path("a.png"), data) == f"data:image/png;base64,{encoded}"
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_fadvise"), reason="needs posix_fadvise")
+def test_prefetch_images(tmp_path):
+    """Test that a readahead hint is given for each readable image."""
+    from consolidate_markdown.attachments.gpt import _prefetch_images
+
+    image = tmp_path / "image.png"
+    image.write_bytes(b"image")
+    with patch("os.posix_fadvise") as mock_fadvise:
+        _prefetch_images([image, tmp_path / "missing.png"])
+
+    mock_fadvise.assert_called_once()
+    assert mock_fadvise.call_args.args[1:] == (0, 0, os.POSIX_FADV_WILLNEED)
+
+
 class TestGPTProcessor:
     """Tests for the GPTProcessor class."""
 
@@ -96,6 +155,7 @@ class TestGPTProcessor:
             mock_openai.assert_called_once_with(
                 api_key="test-openai-key",
                 base_url="https://api.openai.com/v1",
+                http_client=_get_http_client(),
             )
 
             # Check that the provider and model were set correctly
@@ -111,12 +171,40 @@ class TestGPTProcessor:
             mock_openai.assert_called_once_with(
                 api_key="test-openrouter-key",
                 base_url="https://openrouter.ai/api/v1",
+                http_client=_get_http_client(),
             )
 
             # Check that the provider and model were set correctly
             assert processor.provider == "openrouter"
             assert processor.current_model == "gpt-4-vision-preview"
 
+    def test_processors_share_http_client(self, openai_config, openrouter_config):
+        """Test that every processor's client uses the same connection pool."""
+        with patch("consolidate_markdown.attachments.gpt.OpenAI") as mock_openai:
+            GPTProcessor(openai_config)
+            GPTProcessor(openai_config)
+            GPTProcessor(openrouter_config)
+
+        clients = {
+            id(call.kwargs["http_client"]) for call in mock_openai.call_args_list
+        }
+        assert clients == {id(_get_http_client())}
+
+    def test_processors_share_client(self, openai_config):
+        """Test that processors with the same settings share one client."""
+        with patch("consolidate_markdown.attachments.gpt.OpenAI") as mock_openai:
+            GPTProcessor(openai_config)
+            GPTProcessor(openai_config)
+            assert mock_openai.call_count == 1
+
+            openai_config.openai_base_url = "https://proxy.example.com/v1"
+            GPTProcessor(openai_config)
+
+        assert mock_openai.call_count == 2
+        assert (
+            mock_openai.call_args.kwargs["base_url"] == "https://proxy.example.com/v1"
+        )
+
     def test_initialization_invalid_provider(self, global_config):
         """Test initialization with an invalid provider."""
         global_config.api_provider = "invalid"
@@ -439,6 +527,147 @@ class TestGPTProcessor:
         assert result.gpt_cache_hits == 1
         assert mock_client.chat.completions.create.call_count == 1  # Only one API call
 
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_unchanged_file_not_read(
+        self, mock_openai, openai_config, mock_image_path, cache_manager
+    ):
+        """Test that a cache hit for an unchanged image skips reading it."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "This is an image description"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        processor = GPTProcessor(openai_config, cache_manager)
+        processor.describe_image(mock_image_path, ProcessingResult(), "test")
+
+        result = ProcessingResult()
+        with patch("consolidate_markdown.attachments.gpt.bytes_hash") as mock_hash:
+            description = processor.describe_image(mock_image_path, result, "test")
+        assert description == "This is an image description"
+        assert result.gpt_cache_hits == 1
+        mock_hash.assert_not_called()
+
+        # Once the image changes it is read and hashed again
+        mock_image_path.write_bytes(b"changed image")
+        processor.describe_image(mock_image_path, ProcessingResult(), "test")
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_similar_image(
+        self, mock_openai, openai_config, tmp_path, cache_manager
+    ):
+        """Test that a resized copy of a described image reuses its description."""
+        from PIL import Image
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "A gradient"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        gradient = Image.linear_gradient("L")
+        gradient.save(tmp_path / "original.png")
+        gradient.resize((100, 100)).save(tmp_path / "copy.png")
+
+        openai_config.similar_image_distance = 4
+        processor = GPTProcessor(openai_config, cache_manager)
+        processor.describe_image(tmp_path / "original.png", ProcessingResult(), "t")
+
+        result = ProcessingResult()
+        description = processor.describe_image(tmp_path / "copy.png", result, "t")
+        assert description == "A gradient"
+        assert result.gpt_cache_hits == 1
+        assert mock_client.chat.completions.create.call_count == 1
+
+        # Without a distance configured, the copy is described on its own
+        openai_config.similar_image_distance = 0
+        gradient.resize((50, 50)).save(tmp_path / "small.png")
+        processor.describe_image(tmp_path / "small.png", ProcessingResult(), "t")
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_legacy_cache_key(
+        self, mock_openai, openai_config, mock_image_path, cache_manager
+    ):
+        """Test that descriptions cached under the old key are reused and moved."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        # A cache from before its keys were recorded
+        cache_manager.gpt_keys_file.unlink()
+        cache_manager = CacheManager(cache_manager.cache_dir.parent)
+        legacy_key = quick_hash(str(mock_image_path.read_bytes()))
+        cache_manager.update_gpt_cache(legacy_key, "Cached description")
+
+        processor = GPTProcessor(openai_config, cache_manager)
+        result = ProcessingResult()
+        description = processor.describe_image(
+            mock_image_path, result, "test_processor"
+        )
+
+        assert description == "Cached description"
+        assert result.gpt_cache_hits == 1
+        mock_client.chat.completions.create.assert_not_called()
+        assert (
+            cache_manager.get_gpt_cache(file_hash(mock_image_path))
+            == "Cached description"
+        )
+
+    @patch("consolidate_markdown.attachments.gpt.bytes_hash", return_value="new-key")
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_blake2b_cache_key(
+        self, mock_openai, _mock_hash, openai_config, mock_image_path, cache_manager
+    ):
+        """Test that descriptions cached under a BLAKE2b key survive a new hash."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        cache_manager.gpt_keys_file.unlink()
+        cache_manager = CacheManager(cache_manager.cache_dir.parent)
+        blake2b_key = hashlib.blake2b(
+            mock_image_path.read_bytes(), digest_size=16
+        ).hexdigest()
+        cache_manager.update_gpt_cache(blake2b_key, "Cached description")
+
+        processor = GPTProcessor(openai_config, cache_manager)
+        result = ProcessingResult()
+        description = processor.describe_image(
+            mock_image_path, result, "test_processor"
+        )
+
+        assert description == "Cached description"
+        mock_client.chat.completions.create.assert_not_called()
+        assert cache_manager.get_gpt_cache("new-key") == "Cached description"
+
+    @patch("consolidate_markdown.attachments.gpt.quick_hash")
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_legacy_keys_after_migration(
+        self, mock_openai, mock_quick_hash, openai_config, mock_image_path, tmp_path
+    ):
+        """Test that old keys are not computed once the cache is migrated."""
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(message=MagicMock(content="New"))]
+        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.return_value = mock_client
+
+        cm_dir = tmp_path / ".cm"
+        cache_manager = CacheManager(cm_dir)
+        cache_manager.gpt_keys_file.unlink()
+        cache_manager = CacheManager(cm_dir)
+        assert cache_manager.gpt_key_migration_pending()
+        cache_manager.finish_gpt_key_migration()
+
+        processor = GPTProcessor(openai_config, cache_manager)
+        description = processor.describe_image(
+            mock_image_path, ProcessingResult(), "test_processor"
+        )
+
+        assert description == "New"
+        mock_quick_hash.assert_not_called()
+        assert not CacheManager(cm_dir).gpt_key_migration_pending()
+
     @patch("consolidate_markdown.attachments.gpt.OpenAI")
     def test_describe_image_api_error(
         self, mock_openai, openai_config, mock_image_path
@@ -466,6 +695,70 @@ class TestGPTProcessor:
         assert result.gpt_new_analyses == 0
         assert result.gpt_cache_hits == 0
 
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_images(self, mock_openai, openai_config, tmp_path):
+        """Test describing several images concurrently."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        def create(**kwargs):
+            url = kwargs["messages"][0]["content"][1]["image_url"]["url"]
+            response = MagicMock()
+            response.choices[0].message.content = f"Description of {url[-8:]}"
+            return response
+
+        mock_client.chat.completions.create.side_effect = create
+
+        paths = []
+        for i in range(3):
+            path = tmp_path / f"image{i}.png"
+            path.write_bytes(f"image {i}".encode())
+            paths.append(path)
+        unsupported = tmp_path / "image.xyz"
+        unsupported.write_bytes(b"unsupported")
+
+        processor = GPTProcessor(openai_config)
+        result = ProcessingResult()
+        descriptions = processor.describe_images(
+            paths + [unsupported], result, "test_processor"
+        )
+
+        expected = [
+            f"Description of {base64.b64encode(path.read_bytes()).decode()[-8:]}"
+            for path in paths
+        ]
+        assert descriptions == expected + ["[Error: Unsupported image format]"]
+        assert result.gpt_new_analyses == 3
+        assert result.gpt_skipped == 1
+        assert result.get_processor_stats("test_processor").gpt_new_analyses == 3
+
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_images_duplicates(
+        self, mock_openai, openai_config, tmp_path, cache_manager
+    ):
+        """Test that identical images in one batch are described once."""
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "A screenshot"
+        mock_client.chat.completions.create.return_value = mock_response
+
+        paths = []
+        for i in range(4):
+            path = tmp_path / f"copy{i}.png"
+            path.write_bytes(b"same screenshot")
+            paths.append(path)
+
+        processor = GPTProcessor(openai_config, cache_manager)
+        result = ProcessingResult()
+        descriptions = processor.describe_images(paths, result, "test_processor")
+
+        assert descriptions == ["A screenshot"] * 4
+        assert mock_client.chat.completions.create.call_count == 1
+        assert result.gpt_new_analyses == 1
+        assert result.gpt_cache_hits == 3
+        assert processor._in_flight == {}
+
     @patch("consolidate_markdown.attachments.gpt.OpenAI")
     def test_describe_image_unsupported_format(
         self, mock_openai, openai_config, tmp_path
@@ -496,6 +789,44 @@ class TestGPTProcessor:
             assert result.gpt_new_analyses == 0
             assert result.gpt_cache_hits == 0
 
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_failed_conversion_remembered(
+        self, mock_openai, openai_config, mock_svg_path, cache_manager
+    ):
+        """Test that an image that failed to convert is not converted again."""
+        processor = GPTProcessor(openai_config, cache_manager)
+
+        with patch.object(
+            processor, "_convert_to_supported_format", return_value=(None, False)
+        ) as mock_convert:
+            processor.describe_image(mock_svg_path, ProcessingResult(), "test")
+            result = ProcessingResult()
+            description = processor.describe_image(mock_svg_path, result, "test")
+
+            assert description == "[Error: Unsupported image format]"
+            assert result.gpt_skipped == 1
+            assert mock_convert.call_count == 1
+
+            # A changed image is tried again
+            mock_svg_path.write_text("<svg/>")
+            processor.describe_image(mock_svg_path, ProcessingResult(), "test")
+            assert mock_convert.call_count == 2
+
+    @patch("consolidate_markdown.attachments.gpt.OpenAI")
+    def test_describe_image_missing_unsupported_format(
+        self, mock_openai, openai_config, tmp_path, cache_manager
+    ):
+        """Test that a missing image is left to the conversion to report."""
+        processor = GPTProcessor(openai_config, cache_manager)
+        result = ProcessingResult()
+
+        description = processor.describe_image(
+            tmp_path / "missing.svg", result, "test"
+        )
+
+        assert description == "[Error: Unsupported image format]"
+        assert result.gpt_skipped == 1
+
     def test_get_placeholder(self, openai_config, mock_image_path):
         """Test getting a placeholder for an image."""
         with patch("consolidate_markdown.attachments.gpt.OpenAI"):
@@ -597,9 +928,10 @@ class TestGPTProcessor:
             assert path is None
             assert needs_cleanup is False
 
+    @patch("consolidate_markdown.attachments.image.heif_supported", return_value=False)
     @patch("consolidate_markdown.attachments.gpt.subprocess.run")
     def test_convert_to_supported_format_heic(
-        self, mock_run, openai_config, mock_heic_path
+        self, mock_run, mock_heif_supported, openai_config, mock_heic_path
     ):
         """Test converting a HEIC file."""
         with patch("consolidate_markdown.attachments.gpt.OpenAI"):
@@ -614,14 +946,18 @@ class TestGPTProcessor:
             # Check that sips was called
             mock_run.assert_called_once()
             assert mock_run.call_args[0][0][0] == "sips"
+            # sips' output is not used, so it is discarded rather than captured
+            assert mock_run.call_args.kwargs["stdout"] == subprocess.DEVNULL
+            assert mock_run.call_args.kwargs["stderr"] == subprocess.DEVNULL
 
             # Check the result
             assert path == mock_heic_path.with_suffix(".jpg")
             assert needs_cleanup is True
 
+    @patch("consolidate_markdown.attachments.image.heif_supported", return_value=False)
     @patch("consolidate_markdown.attachments.gpt.subprocess.run")
     def test_convert_to_supported_format_heic_error(
-        self, mock_run, openai_config, mock_heic_path
+        self, mock_run, mock_heif_supported, openai_config, mock_heic_path
     ):
         """Test handling errors during HEIC conversion."""
         with patch("consolidate_markdown.attachments.gpt.OpenAI"):
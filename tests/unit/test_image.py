@@ -1,16 +1,42 @@
+import io
 import subprocess
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 from PIL import Image
 
 from consolidate_markdown.attachments.image import (
+    _IN_PLACE_FORMATS,
     ImageProcessingError,
     ImageProcessor,
     _get_heic_converter,
+    _get_svg_converter,
+    _header_dimensions,
+    difference_hash,
+    shrink_image,
 )
 
 
+@pytest.fixture(autouse=True)
+def clear_converter_probes():
+    """Probe for external converters afresh in every test."""
+    _get_heic_converter.cache_clear()
+    _get_svg_converter.cache_clear()
+    yield
+    _get_heic_converter.cache_clear()
+    _get_svg_converter.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def no_pyvips():
+    """Render SVGs with the external converters unless a test opts in."""
+    with patch(
+        "consolidate_markdown.attachments.image._get_pyvips", return_value=None
+    ) as mock_get_pyvips:
+        yield mock_get_pyvips
+
+
 @pytest.fixture
 def temp_dir(tmp_path):
     """Create a temporary directory for testing."""
@@ -109,11 +135,13 @@ class TestImageProcessor:
         assert processor.temp_dir.is_dir()
 
     @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     def test_convert_svg_to_png_with_rsvg(
-        self, mock_run, image_processor, svg_image, temp_dir
+        self, mock_which, mock_run, image_processor, svg_image, temp_dir
     ):
         """Test converting SVG to PNG using rsvg-convert."""
-        # Set up mock subprocess.run to succeed with rsvg-convert
+        # Set up rsvg-convert to be found and to succeed
+        mock_which.return_value = "/usr/bin/rsvg-convert"
         mock_run.return_value = MagicMock(returncode=0)
 
         # Create output path
@@ -122,27 +150,23 @@ class TestImageProcessor:
         # Convert SVG to PNG
         image_processor._convert_svg_to_png(svg_image, png_path)
 
-        # Check that rsvg-convert was called with the correct arguments
-        assert mock_run.call_count == 2
-        # First call should check if rsvg-convert is available
-        assert mock_run.call_args_list[0][0][0][0] == "rsvg-convert"
-        # Second call should convert the SVG
-        assert mock_run.call_args_list[1][0][0][0] == "rsvg-convert"
-        assert mock_run.call_args_list[1][0][0][2] == "png"
+        # Check that rsvg-convert was looked up, then run to convert the SVG
+        mock_which.assert_called_once_with("rsvg-convert")
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][0] == "rsvg-convert"
+        assert mock_run.call_args[0][0][2] == "png"
 
     @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     def test_convert_svg_to_png_with_inkscape(
-        self, mock_run, image_processor, svg_image, temp_dir
+        self, mock_which, mock_run, image_processor, svg_image, temp_dir
     ):
         """Test converting SVG to PNG using Inkscape as fallback."""
-
-        # Set up mock subprocess.run to fail for rsvg-convert but succeed for inkscape
-        def side_effect(*args, **kwargs):
-            if args[0][0] == "rsvg-convert":
-                raise subprocess.SubprocessError("rsvg-convert not found")
-            return MagicMock(returncode=0)
-
-        mock_run.side_effect = side_effect
+        # Set up only inkscape to be found
+        mock_which.side_effect = lambda name: (
+            None if name == "rsvg-convert" else f"/usr/bin/{name}"
+        )
+        mock_run.return_value = MagicMock(returncode=0)
 
         # Create output path
         png_path = temp_dir / "output.png"
@@ -150,20 +174,73 @@ class TestImageProcessor:
         # Convert SVG to PNG
         image_processor._convert_svg_to_png(svg_image, png_path)
 
-        # Check that inkscape was called after rsvg-convert failed
-        assert (
-            mock_run.call_count == 3
-        )  # Version check, rsvg-convert failure, inkscape success
-        assert mock_run.call_args_list[0][0][0][0] == "rsvg-convert"  # Version check
-        assert mock_run.call_args_list[2][0][0][0] == "inkscape"  # Inkscape call
+        # Check that inkscape was used after rsvg-convert was not found
+        assert [call.args[0] for call in mock_which.call_args_list] == [
+            "rsvg-convert",
+            "inkscape",
+        ]
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][0] == "inkscape"
+
+    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
+    def test_convert_svg_to_png_probes_converter_once(
+        self, mock_which, mock_run, image_processor, svg_image, temp_dir
+    ):
+        """Test that the SVG converter is only looked up for the first image."""
+        mock_which.return_value = "/usr/bin/rsvg-convert"
+        mock_run.return_value = MagicMock(returncode=0)
+
+        image_processor._convert_svg_to_png(svg_image, temp_dir / "first.png")
+        image_processor._convert_svg_to_png(svg_image, temp_dir / "second.png")
+
+        # One lookup, then one conversion per image
+        mock_which.assert_called_once()
+        assert mock_run.call_count == 2
+        assert mock_run.call_args_list[1][0][0][-1] == str(temp_dir / "second.png")
 
     @patch("consolidate_markdown.attachments.image.subprocess.run")
+    def test_convert_svg_to_png_with_pyvips(
+        self, mock_run, no_pyvips, image_processor, svg_image, temp_dir
+    ):
+        """Test rendering SVG to PNG in-process with pyvips."""
+        pyvips = MagicMock()
+        no_pyvips.return_value = pyvips
+        png_path = temp_dir / "output.png"
+
+        image_processor._convert_svg_to_png(svg_image, png_path)
+
+        pyvips.Image.new_from_file.assert_called_once_with(str(svg_image))
+        pyvips.Image.new_from_file.return_value.write_to_file.assert_called_once_with(
+            str(png_path)
+        )
+        mock_run.assert_not_called()
+
+    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
+    def test_convert_svg_to_png_pyvips_fallback(
+        self, mock_which, mock_run, no_pyvips, image_processor, svg_image, temp_dir
+    ):
+        """Test falling back to rsvg-convert when libvips cannot load SVGs."""
+        pyvips = MagicMock()
+        pyvips.Error = RuntimeError
+        pyvips.Image.new_from_file.side_effect = RuntimeError("no svgload")
+        no_pyvips.return_value = pyvips
+        mock_which.return_value = "/usr/bin/rsvg-convert"
+        mock_run.return_value = MagicMock(returncode=0)
+
+        image_processor._convert_svg_to_png(svg_image, temp_dir / "output.png")
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][0] == "rsvg-convert"
+
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     def test_convert_svg_to_png_no_converter(
-        self, mock_run, image_processor, svg_image, temp_dir
+        self, mock_which, image_processor, svg_image, temp_dir
     ):
         """Test error handling when no SVG converter is available."""
-        # Set up mock subprocess.run to fail for both converters
-        mock_run.side_effect = subprocess.SubprocessError("No converter found")
+        # Set up neither converter to be found
+        mock_which.return_value = None
 
         # Create output path
         png_path = temp_dir / "output.png"
@@ -173,25 +250,98 @@ class TestImageProcessor:
             image_processor._convert_svg_to_png(svg_image, png_path)
 
     @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     def test_convert_svg_to_png_conversion_error(
-        self, mock_run, image_processor, svg_image, temp_dir
+        self, mock_which, mock_run, image_processor, svg_image, temp_dir
     ):
         """Test error handling when SVG conversion fails."""
-        # Set up mock subprocess.run to succeed for rsvg-convert check but fail for conversion
-        mock_run.side_effect = [
-            MagicMock(returncode=0),  # rsvg-convert --version
-            subprocess.CalledProcessError(
-                1, "rsvg-convert", stderr=b"Conversion error"
-            ),
-        ]
+        # Set up rsvg-convert to be found but fail to convert
+        mock_which.return_value = "/usr/bin/rsvg-convert"
+        mock_run.side_effect = subprocess.CalledProcessError(
+            1, "rsvg-convert", stderr="Conversion error"
+        )
 
         # Create output path
         png_path = temp_dir / "output.png"
 
         # Try to convert SVG to PNG
-        with pytest.raises(ImageProcessingError, match="SVG conversion failed"):
+        with pytest.raises(
+            ImageProcessingError, match="SVG conversion failed: Conversion error"
+        ):
             image_processor._convert_svg_to_png(svg_image, png_path)
 
+    @patch("consolidate_markdown.attachments.image.heif_supported", return_value=False)
+    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
+    def test_prepare_images_batches_heic(
+        self, mock_which, mock_run, mock_heif_supported, image_processor, temp_dir
+    ):
+        """Test that HEIC images are converted by a single ImageMagick run."""
+        mock_which.return_value = "/usr/bin/magick"
+
+        def mogrify(cmd, **kwargs):
+            for path in cmd[6:]:
+                Image.new("RGB", (10, 10)).save(
+                    image_processor.temp_dir / f"{Path(path).stem}.jpg"
+                )
+
+        mock_run.side_effect = mogrify
+        heic_paths = []
+        for name in ("a.heic", "b.HEIC"):
+            path = temp_dir / name
+            path.write_bytes(b"fake heic data")
+            heic_paths.append(path)
+
+        image_processor.prepare_images(heic_paths + [temp_dir / "c.png"])
+
+        mock_run.assert_called_once()
+        cmd = mock_run.call_args[0][0]
+        assert cmd[:6] == [
+            "magick",
+            "mogrify",
+            "-format",
+            "jpg",
+            "-path",
+            str(image_processor.temp_dir),
+        ]
+        assert cmd[6:] == [str(path) for path in heic_paths]
+        temp_path, metadata = image_processor.process_image(heic_paths[0])
+        assert temp_path == image_processor.temp_dir / "a.jpg"
+        assert metadata["dimensions"] == (10, 10)
+
+        # Converted copies that are up to date are not converted again
+        image_processor.prepare_images(heic_paths)
+        mock_run.assert_called_once()
+
+    def test_prepare_images_skips_colliding_temp_paths(
+        self, image_processor, temp_dir
+    ):
+        """Test that images sharing a converted copy are not prepared together."""
+        paths = []
+        for directory in ("one", "two"):
+            (temp_dir / directory).mkdir()
+            path = temp_dir / directory / "pic.webp"
+            Image.new("RGB", (10, 10)).save(path, format="WEBP")
+            paths.append(path)
+        other_path = temp_dir / "other.webp"
+        Image.new("RGB", (20, 20)).save(other_path, format="WEBP")
+
+        image_processor.prepare_images(paths + [other_path])
+
+        assert list(image_processor._prepared) == [paths[0], other_path]
+        temp_path, metadata = image_processor.process_image(paths[1])
+        assert temp_path == image_processor.temp_dir / "pic.jpg"
+        assert metadata["dimensions"] == (10, 10)
+
+    def test_process_images(self, image_processor, jpg_image, temp_dir):
+        """Test processing several images concurrently, keeping their errors."""
+        missing = temp_dir / "missing.svg"
+
+        results = image_processor.process_images([jpg_image, missing], max_workers=2)
+
+        assert results[0] == (jpg_image, image_processor._extract_metadata(jpg_image))
+        assert isinstance(results[1], FileNotFoundError)
+
     def test_process_image_jpg(self, image_processor, jpg_image):
         """Test processing a JPG image."""
         # Process the image
@@ -208,6 +358,14 @@ class TestImageProcessor:
         assert "dimensions" in metadata
         assert metadata["dimensions"] == (100, 100)
 
+    def test_process_image_used_in_place(self, image_processor, png_image):
+        """Test that images needing no conversion are not copied."""
+        temp_path, metadata = image_processor.process_image(png_image)
+
+        assert temp_path == png_image
+        assert metadata["dimensions"] == (100, 100)
+        assert not (image_processor.temp_dir / png_image.name).exists()
+
     def test_process_image_png(self, image_processor, png_image):
         """Test processing a PNG image."""
         # Process the image
@@ -256,10 +414,16 @@ class TestImageProcessor:
         # Check that the conversion was called
         mock_convert.assert_called_once()
 
+    @patch("consolidate_markdown.attachments.image.heif_supported", return_value=False)
     @patch("consolidate_markdown.attachments.image._get_heic_converter")
     @patch("consolidate_markdown.attachments.image.subprocess.run")
     def test_process_image_heic(
-        self, mock_run, mock_get_converter, image_processor, heic_image
+        self,
+        mock_run,
+        mock_get_converter,
+        mock_heif_supported,
+        image_processor,
+        heic_image,
     ):
         """Test processing a HEIC image."""
         # Set up mocks
@@ -285,22 +449,43 @@ class TestImageProcessor:
             # Check that the converter was called with the correct arguments
             mock_run.assert_called_once()
 
+    @patch("consolidate_markdown.attachments.image.heif_supported", return_value=False)
     @patch("consolidate_markdown.attachments.image._get_heic_converter")
     @patch("consolidate_markdown.attachments.image.subprocess.run")
     def test_process_image_heic_error(
-        self, mock_run, mock_get_converter, image_processor, heic_image
+        self,
+        mock_run,
+        mock_get_converter,
+        mock_heif_supported,
+        image_processor,
+        heic_image,
     ):
         """Test error handling when HEIC conversion fails."""
         # Set up mocks
         mock_get_converter.return_value = (["sips", "-s", "format", "jpeg"], "sips")
         mock_run.side_effect = subprocess.CalledProcessError(
-            1, "sips", stderr=b"Conversion error"
+            1, "sips", stderr="Conversion error"
         )
 
         # Try to process the image
-        with pytest.raises(ImageProcessingError, match="HEIC conversion failed"):
+        with pytest.raises(
+            ImageProcessingError, match="HEIC conversion failed: Conversion error"
+        ):
             image_processor.process_image(heic_image)
 
+    def test_process_image_heic_in_process(self, image_processor, temp_dir):
+        """Test that HEIC images are converted with pillow-heif when installed."""
+        pillow_heif = pytest.importorskip("pillow_heif")
+        heic_path = temp_dir / "photo.heic"
+        pillow_heif.from_pillow(Image.new("RGB", (12, 8), "red")).save(heic_path)
+
+        with patch("consolidate_markdown.attachments.image.subprocess.run") as mock_run:
+            temp_path, metadata = image_processor.process_image(heic_path)
+
+        mock_run.assert_not_called()
+        assert temp_path.suffix == ".jpg"
+        assert metadata["dimensions"] == (12, 8)
+
     def test_process_image_webp(self, image_processor, webp_image):
         """Test processing a WebP image."""
         # Process the image
@@ -316,6 +501,21 @@ class TestImageProcessor:
         assert "dimensions" in metadata
         assert metadata["dimensions"] == (100, 100)
 
+    def test_process_image_webp_reuses_conversion(self, image_processor, webp_image):
+        """Test that an unchanged WebP image is not converted again."""
+        first_path, _ = image_processor.process_image(webp_image)
+
+        with patch("consolidate_markdown.attachments.image.save_as_jpeg") as mock_save:
+            temp_path, metadata = image_processor.process_image(webp_image)
+        mock_save.assert_not_called()
+        assert temp_path == first_path
+        assert metadata["dimensions"] == (100, 100)
+
+        # Forced processing converts it again
+        with patch("consolidate_markdown.attachments.image.save_as_jpeg") as mock_save:
+            image_processor.process_image(webp_image, force=True)
+        mock_save.assert_called_once()
+
     def test_process_image_webp_with_alpha(self, temp_dir, image_processor):
         """Test processing a WebP image with alpha channel."""
         # Create a WebP image with alpha channel
@@ -359,6 +559,14 @@ class TestImageProcessor:
         with pytest.raises(ImageProcessingError, match="Unsupported image format"):
             image_processor.process_image(unsupported_path)
 
+    def test_converter_dispatch(self, image_processor):
+        """Test that every supported format is used in place or has a converter."""
+        assert set(image_processor._handlers) == {".svg", ".heic", ".webp"}
+        assert (
+            set(image_processor._handlers) | _IN_PLACE_FORMATS
+            == ImageProcessor.SUPPORTED_FORMATS
+        )
+
     def test_process_image_caching(self, image_processor, jpg_image):
         """Test that processed images are cached."""
         # Mock the _extract_metadata method to return consistent results
@@ -437,6 +645,20 @@ class TestImageProcessor:
 
         assert dimensions == (200, 300)  # Should be converted to integers
 
+    def test_extract_svg_dimensions_root_only(self, image_processor):
+        """Test that only the root tag's own size attributes are read."""
+        svg_content = (
+            '<?xml version="1.0"?>\n'
+            '<svg stroke-width="7" viewBox="-10,-10 640 480"'
+            ' xmlns="http://www.w3.org/2000/svg">'
+            + '<rect width="1" height="1" />' * 5000
+            + "<broken"
+        )
+
+        dimensions = image_processor._extract_svg_dimensions(svg_content)
+
+        assert dimensions == (640, 480)
+
     def test_extract_svg_dimensions_missing(self, image_processor):
         """Test extracting dimensions from SVG with missing dimensions."""
         svg_content = """<svg xmlns="http://www.w3.org/2000/svg">
@@ -465,6 +687,17 @@ class TestImageProcessor:
         assert "dimensions" in metadata
         assert metadata["dimensions"] == (100, 100)
 
+    def test_extract_metadata_cached(self, image_processor, png_image):
+        """Test that an unchanged image's metadata is extracted only once."""
+        first = image_processor._extract_metadata(png_image)
+        with patch("consolidate_markdown.attachments.image.Image.open") as mock_open:
+            assert image_processor._extract_metadata(png_image) == first
+        mock_open.assert_not_called()
+
+        # A changed image is opened again
+        Image.new("RGB", (20, 10)).save(png_image)
+        assert image_processor._extract_metadata(png_image)["dimensions"] == (20, 10)
+
     def test_extract_metadata_svg(self, image_processor, svg_image):
         """Test extracting metadata from an SVG image."""
         metadata = image_processor._extract_metadata(svg_image)
@@ -509,13 +742,13 @@ class TestImageProcessor:
 class TestHelperFunctions:
     """Tests for helper functions in the image module."""
 
-    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     @patch("consolidate_markdown.attachments.image.platform.system")
-    def test_get_heic_converter_imagemagick(self, mock_system, mock_run):
+    def test_get_heic_converter_imagemagick(self, mock_system, mock_which):
         """Test getting HEIC converter with ImageMagick available."""
         # Set up mocks
         mock_system.return_value = "Linux"
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_which.return_value = "/usr/bin/magick"
 
         # Get the converter
         converter, converter_type = _get_heic_converter()
@@ -524,17 +757,16 @@ class TestHelperFunctions:
         assert converter == ["magick", "convert"]
         assert converter_type == "imagemagick"
 
-        # Check that subprocess.run was called to check for ImageMagick
-        mock_run.assert_called_once()
-        assert mock_run.call_args[0][0][0] == "magick"
+        # Check that ImageMagick was looked up
+        mock_which.assert_called_once_with("magick")
 
-    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     @patch("consolidate_markdown.attachments.image.platform.system")
-    def test_get_heic_converter_macos(self, mock_system, mock_run):
+    def test_get_heic_converter_macos(self, mock_system, mock_which):
         """Test getting HEIC converter on macOS."""
         # Set up mocks
         mock_system.return_value = "Darwin"
-        mock_run.side_effect = FileNotFoundError("magick not found")
+        mock_which.return_value = None
 
         # Get the converter
         converter, converter_type = _get_heic_converter()
@@ -543,16 +775,13 @@ class TestHelperFunctions:
         assert converter == ["sips", "-s", "format", "jpeg"]
         assert converter_type == "sips"
 
-    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     @patch("consolidate_markdown.attachments.image.platform.system")
-    def test_get_heic_converter_linux_libheif(self, mock_system, mock_run):
+    def test_get_heic_converter_linux_libheif(self, mock_system, mock_which):
         """Test getting HEIC converter on Linux with libheif."""
         # Set up mocks
         mock_system.return_value = "Linux"
-        mock_run.side_effect = [
-            FileNotFoundError("magick not found"),
-            MagicMock(returncode=0),
-        ]
+        mock_which.side_effect = [None, "/usr/bin/heif-convert"]
 
         # Get the converter
         converter, converter_type = _get_heic_converter()
@@ -561,19 +790,96 @@ class TestHelperFunctions:
         assert converter == ["heif-convert"]
         assert converter_type == "libheif"
 
-        # Check that subprocess.run was called to check for both converters
-        assert mock_run.call_count == 2
-        assert mock_run.call_args_list[0][0][0][0] == "magick"
-        assert mock_run.call_args_list[1][0][0][0] == "heif-convert"
+        # Check that both converters were looked up
+        assert [call.args[0] for call in mock_which.call_args_list] == [
+            "magick",
+            "heif-convert",
+        ]
 
-    @patch("consolidate_markdown.attachments.image.subprocess.run")
+    @patch("consolidate_markdown.attachments.image.shutil.which")
     @patch("consolidate_markdown.attachments.image.platform.system")
-    def test_get_heic_converter_no_converter(self, mock_system, mock_run):
+    def test_get_heic_converter_probed_once(self, mock_system, mock_which):
+        """Test that the HEIC converter is looked up once per process."""
+        mock_system.return_value = "Linux"
+        mock_which.return_value = "/usr/bin/magick"
+
+        assert _get_heic_converter() == _get_heic_converter()
+        mock_which.assert_called_once()
+
+    @patch("consolidate_markdown.attachments.image.shutil.which")
+    @patch("consolidate_markdown.attachments.image.platform.system")
+    def test_get_heic_converter_no_converter(self, mock_system, mock_which):
         """Test error handling when no HEIC converter is available."""
         # Set up mocks
         mock_system.return_value = "Linux"
-        mock_run.side_effect = FileNotFoundError("No converter found")
+        mock_which.return_value = None
 
         # Try to get the converter
         with pytest.raises(ImageProcessingError, match="No HEIC converter found"):
             _get_heic_converter()
+
+
+def test_shrink_image():
+    """Test that only images larger than the limit are downscaled to JPEG."""
+    buffer = io.BytesIO()
+    Image.new("RGBA", (400, 100), (255, 0, 0, 128)).save(buffer, "PNG")
+    large = buffer.getvalue()
+
+    shrunk = shrink_image(large, 200)
+
+    assert shrunk is not None
+    with Image.open(io.BytesIO(shrunk)) as img:
+        assert img.format == "JPEG"
+        assert img.size == (200, 50)
+    assert shrink_image(large, 400) is None
+    assert shrink_image(b"not an image", 200) is None
+
+
+def test_difference_hash():
+    """Test that resized copies of an image hash alike and others do not."""
+
+    def png(img):
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG")
+        return buffer.getvalue()
+
+    gradient = Image.linear_gradient("L").rotate(90)
+    original = difference_hash(png(gradient))
+    resized = difference_hash(png(gradient.resize((64, 64)).convert("RGB")))
+    flipped = difference_hash(png(gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+
+    assert original is not None and resized is not None and flipped is not None
+    assert (original ^ resized).bit_count() <= 4
+    assert (original ^ flipped).bit_count() > 4
+    assert difference_hash(b"not an image") is None
+
+
+def test_header_dimensions(tmp_path):
+    """Test reading PNG and JPEG sizes from their headers."""
+    png_path = tmp_path / "image.png"
+    Image.new("RGBA", (300, 200)).save(png_path)
+    jpg_path = tmp_path / "image.jpg"
+    # EXIF data puts an APP1 segment before the start-of-frame marker
+    exif = Image.Exif()
+    exif[0x0112] = 1
+    Image.new("RGB", (120, 80)).save(jpg_path, exif=exif)
+    progressive_path = tmp_path / "progressive.jpeg"
+    Image.new("L", (64, 48)).save(progressive_path, progressive=True)
+    corrupt_path = tmp_path / "corrupt.jpg"
+    corrupt_path.write_bytes(b"\xff\xd8\xff\xe0\x00")
+
+    assert _header_dimensions(png_path, ".png") == (300, 200)
+    assert _header_dimensions(jpg_path, ".jpg") == (120, 80)
+    assert _header_dimensions(progressive_path, ".jpeg") == (64, 48)
+    assert _header_dimensions(corrupt_path, ".jpg") is None
+    assert _header_dimensions(png_path, ".jpg") is None
+    assert _header_dimensions(tmp_path / "missing.png", ".png") is None
+
+
+def test_extract_metadata_reads_headers(image_processor, jpg_image):
+    """Test that JPEG dimensions are read without opening the image in Pillow."""
+    with patch("consolidate_markdown.attachments.image.Image.open") as mock_open:
+        metadata = image_processor._extract_metadata(jpg_image)
+
+    assert metadata["dimensions"] == (100, 100)
+    mock_open.assert_not_called()
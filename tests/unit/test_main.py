@@ -2,6 +2,7 @@
 
 import logging
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -95,10 +96,10 @@ class TestMain:
 
     @patch("consolidate_markdown.__main__.parse_args")
     @patch("consolidate_markdown.__main__.load_config")
-    @patch("consolidate_markdown.__main__.setup_logging")
-    @patch("consolidate_markdown.__main__.Runner")
-    @patch("consolidate_markdown.__main__.print_summary")
-    @patch("consolidate_markdown.__main__.print_compact_summary")
+    @patch("consolidate_markdown.log_setup.setup_logging")
+    @patch("consolidate_markdown.runner.Runner")
+    @patch("consolidate_markdown.output.print_summary")
+    @patch("consolidate_markdown.output.print_compact_summary")
     @patch("pathlib.Path.mkdir")
     def test_main_normal_execution(
         self,
@@ -143,10 +144,10 @@ class TestMain:
 
     @patch("consolidate_markdown.__main__.parse_args")
     @patch("consolidate_markdown.__main__.load_config")
-    @patch("consolidate_markdown.__main__.setup_logging")
-    @patch("consolidate_markdown.__main__.Runner")
-    @patch("consolidate_markdown.__main__.print_summary")
-    @patch("consolidate_markdown.__main__.print_compact_summary")
+    @patch("consolidate_markdown.log_setup.setup_logging")
+    @patch("consolidate_markdown.runner.Runner")
+    @patch("consolidate_markdown.output.print_summary")
+    @patch("consolidate_markdown.output.print_compact_summary")
     @patch("pathlib.Path.mkdir")
     def test_main_with_processor_and_limit(
         self,
@@ -185,10 +186,10 @@ class TestMain:
 
     @patch("consolidate_markdown.__main__.parse_args")
     @patch("consolidate_markdown.__main__.load_config")
-    @patch("consolidate_markdown.__main__.setup_logging")
-    @patch("consolidate_markdown.__main__.Runner")
-    @patch("consolidate_markdown.__main__.print_summary")
-    @patch("consolidate_markdown.__main__.print_compact_summary")
+    @patch("consolidate_markdown.log_setup.setup_logging")
+    @patch("consolidate_markdown.runner.Runner")
+    @patch("consolidate_markdown.output.print_summary")
+    @patch("consolidate_markdown.output.print_compact_summary")
     @patch("pathlib.Path.mkdir")
     def test_main_with_errors(
         self,
@@ -221,8 +222,8 @@ class TestMain:
 
     @patch("consolidate_markdown.__main__.parse_args")
     @patch("consolidate_markdown.__main__.load_config")
-    @patch("consolidate_markdown.__main__.setup_logging")
-    @patch("consolidate_markdown.__main__.Runner")
+    @patch("consolidate_markdown.log_setup.setup_logging")
+    @patch("consolidate_markdown.runner.Runner")
     @patch("pathlib.Path.mkdir")
     def test_main_with_exception(
         self,
@@ -277,16 +278,18 @@ class TestMain:
 
     @patch("consolidate_markdown.__main__.parse_args")
     @patch("consolidate_markdown.__main__.load_config")
-    @patch("consolidate_markdown.__main__.setup_logging")
-    @patch("consolidate_markdown.__main__.Runner")
-    @patch("consolidate_markdown.__main__.print_summary")
-    @patch("consolidate_markdown.__main__.print_compact_summary")
-    @patch("consolidate_markdown.__main__.print_deletion_message")
+    @patch("consolidate_markdown.log_setup.setup_logging")
+    @patch("consolidate_markdown.runner.Runner")
+    @patch("consolidate_markdown.output.print_summary")
+    @patch("consolidate_markdown.output.print_compact_summary")
+    @patch("consolidate_markdown.output.print_deletion_message")
     @patch("consolidate_markdown.__main__.shutil.rmtree")
     @patch("pathlib.Path.mkdir")
     @patch("pathlib.Path.exists")
+    @patch("pathlib.Path.rename")
     def test_main_with_delete_flag(
         self,
+        mock_rename,
         mock_exists,
         mock_mkdir,
         mock_rmtree,
@@ -319,6 +322,14 @@ class TestMain:
             main()
             mock_exit.assert_not_called()
 
+        # Wait for the background deletion to finish
+        for thread in threading.enumerate():
+            if thread.name == "delete-old-output":
+                thread.join()
+
         # Verify the calls
-        assert mock_rmtree.call_count == 3  # cm_dir and 2 dest_dirs
+        assert mock_rename.call_count == 3  # cm_dir and 2 dest_dirs
+        assert mock_rmtree.call_count == 3
+        removed = {call.args[0] for call in mock_rmtree.call_args_list}
+        assert removed == {call.args[0] for call in mock_rename.call_args_list}
         assert mock_print_deletion.call_count == 3
@@ -0,0 +1,90 @@
+"""Unit tests for the package-level processor registry."""
+
+import subprocess
+import sys
+
+import consolidate_markdown
+from consolidate_markdown import PROCESSOR_TYPES, get_processor, register_processor
+
+
+def test_registered_processors_resolve_lazily():
+    """Test that processors registered by import path resolve to their classes."""
+    from consolidate_markdown.processors.bear import BearProcessor
+    from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor
+
+    assert get_processor("bear") is BearProcessor
+    assert get_processor("xbookmarks") is XBookmarksProcessor
+    assert PROCESSOR_TYPES["bear"] is BearProcessor
+
+
+def test_register_processor_with_class():
+    """Test registering a processor class directly."""
+    from consolidate_markdown.processors.claude import ClaudeProcessor
+
+    register_processor("test_claude", ClaudeProcessor)
+    try:
+        assert get_processor("test_claude") is ClaudeProcessor
+    finally:
+        PROCESSOR_TYPES.pop("test_claude", None)
+
+
+def test_get_processor_unknown():
+    """Test looking up a processor that was never registered."""
+    assert get_processor("unknown") is None
+
+
+def test_lazy_attributes():
+    """Test that lazily exported names are importable from the package."""
+    from consolidate_markdown.runner import Runner
+
+    assert consolidate_markdown.Runner is Runner
+    assert "SourceProcessor" in consolidate_markdown.__all__
+
+
+def test_cli_parsing_does_not_import_processors():
+    """Test that importing the CLI and parsing arguments stays lightweight."""
+    code = (
+        "import sys\n"
+        "from consolidate_markdown.__main__ import parse_args\n"
+        "sys.argv = ['consolidate-markdown', '--processor', 'claude']\n"
+        "assert parse_args().processor == 'claude'\n"
+        "assert 'consolidate_markdown.processors.base' not in sys.modules\n"
+        "assert 'rich' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_claude_processor_registered():
+    """Test that every configurable source type has a registered processor."""
+    from consolidate_markdown.config import VALID_SOURCE_TYPES
+
+    for source_type in VALID_SOURCE_TYPES:
+        assert get_processor(source_type) is not None
+
+
+def test_processors_do_not_import_openai():
+    """Test that loading the processors defers the openai client import."""
+    code = (
+        "import sys\n"
+        "from consolidate_markdown.attachments import gpt\n"
+        "from consolidate_markdown.processors.bear import BearProcessor\n"
+        "from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor\n"
+        "assert 'openai' not in sys.modules\n"
+        "from openai import OpenAI\n"
+        "assert gpt.OpenAI is OpenAI\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_processors_package_shares_registry():
+    """Test that processors.PROCESSOR_TYPES is the package-level registry."""
+    from consolidate_markdown import processors
+    from consolidate_markdown.processors.bear import BearProcessor
+
+    register_processor("test_bear", BearProcessor)
+    try:
+        assert processors.PROCESSOR_TYPES is PROCESSOR_TYPES
+        assert PROCESSOR_TYPES["xbookmarks"] is get_processor("xbookmarks")
+        assert processors.PROCESSOR_TYPES["test_bear"] is BearProcessor
+    finally:
+        PROCESSOR_TYPES.pop("test_bear", None)
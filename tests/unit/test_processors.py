@@ -7,6 +7,7 @@ import pytest
 
 from consolidate_markdown.config import Config, GlobalConfig, SourceConfig
 from consolidate_markdown.processors.bear import BearProcessor
+from consolidate_markdown.processors.result import ProcessingResult
 from consolidate_markdown.processors.xbookmarks import XBookmarksProcessor
 
 # Constants
@@ -146,6 +147,64 @@ startxref
     assert not attachments_dir.exists()
 
 
+def test_bear_count_attachments(tmp_path):
+    """Test counting attachment references that exist on disk"""
+    source_dir = tmp_path / "bear"
+    attachment_dir = source_dir / "note"
+    attachment_dir.mkdir(parents=True)
+    (attachment_dir / "image one.png").write_bytes(b"png")
+    (attachment_dir / "doc.pdf").write_bytes(b"pdf")
+    (attachment_dir / ".DS_Store").write_bytes(b"junk")
+
+    content = (
+        "![](note/image%20one.png)\n"
+        "![](note/missing.png)\n"
+        "![](note/.DS_Store)\n"
+        '[doc.pdf](note/doc.pdf)<!-- {"embed":"true"} -->\n'
+    )
+    source_config = SourceConfig(
+        type="bear", src_dir=source_dir, dest_dir=tmp_path / "output"
+    )
+    processor = BearProcessor(source_config)
+
+    assert processor._count_attachments(content, attachment_dir) == (1, 1)
+    assert processor._count_attachments(content, source_dir / "missing") == (0, 0)
+
+
+def test_bear_note_describes_images_in_one_batch(tmp_path):
+    """Test that a note's images are described together, before formatting"""
+    source_dir = tmp_path / "bear"
+    attachment_dir = source_dir / "note"
+    attachment_dir.mkdir(parents=True)
+    for name in ("one.png", "two.jpg"):
+        (attachment_dir / name).write_bytes(b"image")
+    (source_dir / "note.md").write_text(
+        "![](note/one.png)\n![](note/two.jpg)\n![](note/one.png)\n![](note/gone.png)"
+    )
+
+    source_config = SourceConfig(
+        type="bear", src_dir=source_dir, dest_dir=tmp_path / "output"
+    )
+    global_config = GlobalConfig(cm_dir=tmp_path / ".cm", openai_key="test-key")
+    config = Config(global_config=global_config, sources=[source_config])
+    processor = BearProcessor(source_config)
+
+    with patch.object(processor, "_describe_images") as mock_describe:
+        processor._process_attachments(
+            (source_dir / "note.md").read_text(),
+            attachment_dir,
+            processor.attachment_processor,
+            config,
+            ProcessingResult(),
+        )
+
+    mock_describe.assert_called_once()
+    assert mock_describe.call_args.args[0] == [
+        attachment_dir / "one.png",
+        attachment_dir / "two.jpg",
+    ]
+
+
 def test_bear_note_caching(tmp_path):
     """Test Bear note processing with caching"""
     source_dir = tmp_path / "bear"
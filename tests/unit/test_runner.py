@@ -215,3 +215,40 @@ def test_processor_error_handling(runner: Runner):
     summary = runner.run(parallel=False)
     assert len(summary.errors) > 0
     assert "Test error" in str(summary.errors[0])
+
+
+@pytest.mark.parametrize(
+    "setup",
+    [
+        lambda runner: setattr(runner.config.global_config, "no_image", True),
+        lambda runner: setattr(runner, "selected_processor", "mock"),
+        lambda runner: setattr(runner, "processing_limit", 5),
+    ],
+    ids=["no_image", "processor", "limit"],
+)
+def test_partial_run_keeps_gpt_key_migration(runner: Runner, setup):
+    """Test that a run that may skip images does not end the key migration."""
+    setup(runner)
+    with patch.object(runner.cache_manager, "finish_gpt_key_migration") as mock_finish:
+        runner.run(parallel=False)
+    mock_finish.assert_not_called()
+
+
+def test_failed_run_keeps_gpt_key_migration(runner: Runner):
+    """Test that a run with errors does not end the key migration."""
+
+    class FailingProcessor(MockProcessor):
+        def validate(self):
+            raise ValueError("Test error")
+
+    Runner.PROCESSORS = {"mock": FailingProcessor}
+    with patch.object(runner.cache_manager, "finish_gpt_key_migration") as mock_finish:
+        runner.run(parallel=False)
+    mock_finish.assert_not_called()
+
+
+def test_complete_run_ends_gpt_key_migration(runner: Runner):
+    """Test that a complete run ends the key migration."""
+    with patch.object(runner.cache_manager, "finish_gpt_key_migration") as mock_finish:
+        runner.run(parallel=False)
+    mock_finish.assert_called_once_with()
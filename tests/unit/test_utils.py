@@ -0,0 +1,112 @@
+"""Unit tests for common utility functions."""
+
+import os
+import time
+from unittest.mock import patch
+
+from consolidate_markdown.cache import CacheManager, quick_hash
+from consolidate_markdown.utils import (
+    latest_file_mtime,
+    link_or_copy,
+    read_text_file,
+    should_process_from_cache,
+)
+
+
+def test_latest_file_mtime(tmp_path):
+    """Test finding the newest file modification time in a directory."""
+    old_file = tmp_path / "old.txt"
+    new_file = tmp_path / "new.txt"
+    old_file.write_text("old")
+    new_file.write_text("new")
+    os.utime(old_file, (1000, 1000))
+    os.utime(new_file, (2000, 2000))
+
+    # Subdirectories are ignored
+    subdir = tmp_path / "subdir"
+    subdir.mkdir()
+    os.utime(subdir, (3000, 3000))
+
+    assert latest_file_mtime(tmp_path) == 2000
+
+
+def test_latest_file_mtime_no_files(tmp_path):
+    """Test that a directory without files has no latest mtime."""
+    (tmp_path / "subdir").mkdir()
+    assert latest_file_mtime(tmp_path) is None
+
+
+def test_read_text_file(tmp_path):
+    """Test that text files are decoded with text-mode line endings."""
+    text_file = tmp_path / "notes.txt"
+    text_file.write_bytes("caf\u00e9\r\nwindows\rold mac\nunix".encode("utf-8"))
+
+    content = read_text_file(text_file)
+
+    assert content == "caf\u00e9\nwindows\nold mac\nunix"
+    assert content == text_file.read_text(encoding="utf-8")
+
+
+def test_should_process_from_cache(tmp_path):
+    """Test cache decisions based on content hash and attachment mtimes."""
+    cache_manager = CacheManager(tmp_path / ".cm")
+    note = tmp_path / "note.md"
+    attachment_dir = tmp_path / "note"
+    attachment_dir.mkdir()
+    attachment = attachment_dir / "image.png"
+    attachment.write_bytes(b"image")
+    os.utime(attachment, (1000, 1000))
+
+    # Not cached yet
+    should_process, cached = should_process_from_cache(
+        note, "content", cache_manager, False, attachment_dir
+    )
+    assert should_process and cached is None
+
+    cache_manager.update_note_cache(str(note), quick_hash("content"), time.time())
+
+    # Unchanged content and no newer attachments
+    should_process, _ = should_process_from_cache(
+        note, "content", cache_manager, False, attachment_dir
+    )
+    assert not should_process
+
+    # Changed content
+    should_process, _ = should_process_from_cache(
+        note, "changed", cache_manager, False, attachment_dir
+    )
+    assert should_process
+
+    # Newer attachment
+    future = time.time() + 60
+    os.utime(attachment, (future, future))
+    should_process, _ = should_process_from_cache(
+        note, "content", cache_manager, False, attachment_dir
+    )
+    assert should_process
+
+
+def test_link_or_copy(tmp_path):
+    """Test that a file is hard-linked, replacing an existing destination."""
+    src = tmp_path / "src.txt"
+    dst = tmp_path / "dst.txt"
+    src.write_text("data")
+    dst.write_text("stale")
+
+    link_or_copy(src, dst)
+
+    assert dst.read_text() == "data"
+    assert os.path.samefile(src, dst)
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path):
+    """Test that a file is copied when it cannot be hard-linked."""
+    src = tmp_path / "src.txt"
+    dst = tmp_path / "dst.txt"
+    src.write_text("data")
+
+    with patch("os.link", side_effect=OSError("Invalid cross-device link")):
+        link_or_copy(src, dst)
+
+    assert dst.read_text() == "data"
+    assert not os.path.samefile(src, dst)